@@ -1,25 +1,85 @@
 # app.py
-from flask import Flask
-from routes import update_blueprint, milestone_blueprint  # Flask 라우트 모듈
-from dashboard import init_dashboard   # Dash 대시보드 초기화 함수
-from expense import expense_dashboard
+import os
+from flask import Flask, request
+from routes import update_blueprint, milestone_blueprint, status_blueprint, bulk_blueprint, api_blueprint  # Flask 라우트 모듈
+from dashboard import PAGES, init_dashboard   # Dash 대시보드 초기화 함수
+from assets import init_assets
+from fonts import init_fonts
+from events import start_event_hub
+from metrics import init_metrics
+from migrations import migrate
+from backupdb import start_backup_scheduler
+from snapshot import init_snapshots
 
 app = Flask(__name__)
 
+# 키오스크 실시간 갱신 간격(초). 0이면 기존처럼 페이지 새로고침 시에만 갱신
+LIVE_REFRESH_SECONDS = int(os.environ.get("DASHBOARD_LIVE_REFRESH", "0"))
+# SSE 변경 알림 허브 포트. 0이면 사용하지 않음
+SSE_PORT = int(os.environ.get("DASHBOARD_SSE_PORT", "0"))
+# 정량 성과지표 렌더링 방식: per_project(기본) 또는 subplots(단일 Figure)
+RESEARCH_MODE = os.environ.get("DASHBOARD_RESEARCH_MODE", "per_project")
+# 예산 패널 렌더링 방식: auto(기본, 많으면 페이지 회전/bullet), gauge, bullet
+BUDGET_MODE = os.environ.get("DASHBOARD_BUDGET_MODE", "auto")
+# 0이면 시작 시 서브셋 폰트를 생성하지 않음 (벤치마크처럼 다른 DB를 쓰는 경우)
+FONT_BUILD = os.environ.get("DASHBOARD_FONT_BUILD", "1") != "0"
+# 요청/DB/패널 계측과 /metrics. 꺼도 훅 비용은 플래그 확인 정도
+METRICS_ENABLED = os.environ.get("DASHBOARD_METRICS", "1") != "0"
+# 매일 DB 백업 시각(HH:MM). 비어 있으면 앱에서는 백업하지 않음 (python backupdb.py schedule 로 따로 실행 가능)
+# 여러 워커로 실행할 때는 한 워커에만 지정하거나 따로 실행할 것
+BACKUP_AT = os.environ.get("DASHBOARD_BACKUP_AT", "")
+# 키오스크용 정적 스냅샷 페이지 /snapshot/dashboard, /snapshot/expense (0이면 등록하지 않음)
+SNAPSHOT_ENABLED = os.environ.get("DASHBOARD_SNAPSHOT", "1") != "0"
+
 @app.after_request
 def add_header(response):
+    # 해시된 정적 파일(/dist/)처럼 스스로 장기 캐시를 지정한 응답과
+    # ETag 로 재검증하는 /api/, /snapshot/ 응답은 그대로 둔다
+    if response.cache_control.immutable or request.blueprint in ("api", "snapshot"):
+        return response
     response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, public, max-age=0"
     response.headers["Pragma"] = "no-cache"
     response.headers["Expires"] = "0"
     return response
 
+# 라우트별 응답 시간, 요청 구간(db/layout/render/serialize) 계측
+init_metrics(app, enable=METRICS_ENABLED)
+
+# 스키마 마이그레이션 (schema_version 기준으로 적용되지 않은 것만 실행)
+migrate()
+
+# 온라인 백업 API 로 일관된 압축 백업 + 보관 정책 (쓰기를 멈추지 않음)
+if BACKUP_AT:
+    start_backup_scheduler(BACKUP_AT)
+
+# 해시된 정적 파일 빌드 및 /dist/ 라우트 등록 (Dash 초기화 전에 manifest 필요)
+init_assets(app)
+# 화면에 쓰이는 글자만 담은 Pretendard 서브셋 준비 (새 글자가 있을 때만 백그라운드 생성)
+init_fonts(app, build=FONT_BUILD)
+
 # Flask 라우트 등록
 app.register_blueprint(update_blueprint)
 app.register_blueprint(milestone_blueprint)
+app.register_blueprint(status_blueprint)
+app.register_blueprint(bulk_blueprint)
+app.register_blueprint(api_blueprint)
+
+# 쓰기 알림을 열려 있는 대시보드로 보내는 SSE 허브 (별도 포트, 이벤트 루프 스레드 1개)
+if SSE_PORT > 0:
+    try:
+        start_event_hub(SSE_PORT)
+    except OSError as e:
+        # debug 리로더의 부모 프로세스처럼 이미 포트가 사용 중인 경우
+        print(f"SSE hub not started on port {SSE_PORT}: {e}")
+
+# Dash 대시보드 초기화 (Flask 서버와 통합, /dashboard/ 와 /expense/ 를 한 앱의 페이지로)
+dash_app = init_dashboard(app, live_refresh=LIVE_REFRESH_SECONDS, events_port=SSE_PORT,
+                          research_mode=RESEARCH_MODE, budget_mode=BUDGET_MODE)
 
-# Dash 대시보드 초기화 (Flask 서버와 통합)
-init_dashboard(app)
-expense_dashboard(app)
+# 미리 렌더링한 정적 HTML (Dash 렌더러 없이 표시, 데이터가 바뀔 때만 백그라운드에서 재생성)
+if SNAPSHOT_ENABLED:
+    init_snapshots(app, dash_app, PAGES)
 
+# 개발용 서버. 키오스크가 많은 운영 환경에서는 ASGI 모드(asgi.py: uvicorn asgi:application)로 실행
 if __name__ == '__main__':
     app.run(host="0.0.0.0", port=5001, debug=True)
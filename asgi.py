@@ -0,0 +1,218 @@
+# asgi.py
+"""
+ASGI 서빙 모드.
+
+app.run() (연결마다 스레드) 대신 ASGI 서버(uvicorn 등)에서 실행한다.
+- 연결 수락, 요청 본문 수신, 응답 전송은 이벤트 루프가 처리하므로 느린 키오스크 클라이언트나
+  유휴 keep-alive 연결이 스레드를 잡고 있지 않는다.
+- routes.py 의 블루프린트와 Dash 레이아웃/콜백은 모두 동기 sqlite3 를 쓰므로, 본문을 다 받은 요청만
+  database.db_executor() (최대 DB_EXECUTOR_WORKERS 스레드)에서 실행한다. 동시에 DB 를 쓰는 요청 수는
+  연결 풀 크기를 넘지 않고, 나머지는 스레드 없이 이벤트 루프에서 차례를 기다린다.
+- 스트리밍 응답(/export/...)의 나머지 청크는 별도 스레드에서 클라이언트가 받는 속도에 맞춰 만든다
+  (느린 다운로드가 요청 처리 스레드를 잡지 않음).
+- 기존 동기 함수와 app.run() 으로 실행하는 방식은 그대로 동작한다.
+
+    uvicorn asgi:application --host 0.0.0.0 --port 5001 [--workers 4]
+    python asgi.py [--host 0.0.0.0] [--port 5001]
+"""
+import argparse
+import asyncio
+import contextvars
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from database import db_executor
+from app import app as flask_app
+
+REQUEST_BODY_MEMORY = 1024 * 1024   # 이보다 큰 요청 본문(/import 업로드 등)은 임시 파일에 받음
+STREAM_EXECUTOR_WORKERS = 4         # 스트리밍 응답(/export/...)의 나머지 청크를 만드는 스레드 수
+
+
+def wsgi_environ(scope, body):
+    """ASGI http scope 와 받은 본문(파일 객체) -> WSGI environ (PEP 3333)."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        # WSGI 의 경로는 원래 바이트를 latin-1 로 디코딩한 문자열
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        "wsgi.input_terminated": True,  # 본문을 끝까지 받아 두었으므로 Content-Length 없이도 읽을 수 있음
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope["headers"]:
+        key = name.decode("latin-1").upper().replace("-", "_")
+        if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            key = "HTTP_" + key
+        value = value.decode("latin-1")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def _read_body(receive):
+    """요청 본문을 끝까지 받아 파일 객체로 반환. 그 전에 연결이 끊기면 None."""
+    body = tempfile.SpooledTemporaryFile(max_size=REQUEST_BODY_MEMORY)
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            body.close()
+            return None
+        body.write(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    body.seek(0)
+    return body
+
+
+def _next_chunk(iterator):
+    """비어 있지 않은 다음 응답 청크, 끝이면 None."""
+    for chunk in iterator:
+        if chunk:
+            return chunk
+    return None
+
+
+def _close(iterable):
+    if hasattr(iterable, "close"):
+        iterable.close()
+
+
+class WsgiToAsgi:
+    """
+    WSGI 앱(Flask)을 ASGI 앱으로 감싼다. 소켓 입출력은 이벤트 루프에서 한다.
+    - 앱 실행과 응답의 처음 두 청크는 executor(기본 database.db_executor()) 스레드에서 만든다.
+      일반 응답은 여기서 끝나므로 요청당 스레드 전환은 한 번이다.
+    - 스트리밍 응답의 나머지 청크는 별도 executor(STREAM_EXECUTOR_WORKERS)에서 한 번에 하나씩 만들고,
+      이벤트 루프가 보낸 뒤에 다음 청크를 요청한다. 느린 다운로드가 요청 처리 스레드를 잡지 않고,
+      받는 속도보다 빨리 만들지 않으므로 메모리에 쌓이지도 않는다.
+    - 한 요청의 모든 단계는 같은 contextvars 컨텍스트에서 실행한다 (stream_with_context 의 요청 컨텍스트).
+    """
+
+    def __init__(self, wsgi_app, executor=None, stream_executor=None):
+        self.wsgi_app = wsgi_app
+        self.executor = executor
+        self.stream_executor = stream_executor
+
+    def _stream_executor(self):
+        # 워커 프로세스에서 첫 스트리밍 응답 때 생성
+        if self.stream_executor is None:
+            self.stream_executor = ThreadPoolExecutor(max_workers=STREAM_EXECUTOR_WORKERS,
+                                                      thread_name_prefix="stream")
+        return self.stream_executor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return  # websocket 은 사용하지 않음
+        body = await _read_body(receive)
+        if body is None:
+            return
+        try:
+            await self._respond(wsgi_environ(scope, body), receive, send)
+        finally:
+            body.close()
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _respond(self, environ, receive, send):
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        response = {"sent": False}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info is not None and response["sent"]:
+                raise exc_info[1].with_traceback(exc_info[2])
+            response["status"] = int(status.split(" ", 1)[0])
+            response["headers"] = [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                                   for name, value in headers]
+
+        def run_app():
+            # (iterable, iterator, 처음 청크들). 응답이 끝났으면 여기서 닫고 iterable 은 None
+            iterable = self.wsgi_app(environ, start_response)
+            chunks = []
+            try:
+                iterator = iter(iterable)
+                for _ in range(2):
+                    chunk = _next_chunk(iterator)
+                    if chunk is None:
+                        break
+                    chunks.append(chunk)
+                else:
+                    return iterable, iterator, chunks  # 스트리밍 응답: 나머지는 _stream_executor 에서
+            except BaseException:
+                _close(iterable)
+                raise
+            _close(iterable)
+            return None, None, chunks
+
+        try:
+            iterable, iterator, chunks = await loop.run_in_executor(
+                self.executor or db_executor(), context.run, run_app)
+        except Exception:
+            await send({"type": "http.response.start", "status": 500,
+                        "headers": [(b"content-type", b"text/plain; charset=utf-8")]})
+            await send({"type": "http.response.body", "body": b"Internal Server Error"})
+            raise
+
+        response["sent"] = True
+        await send({"type": "http.response.start", "status": response["status"], "headers": response["headers"]})
+        if iterable is None:
+            await send({"type": "http.response.body", "body": b"".join(chunks), "more_body": False})
+            return
+
+        # 스트리밍 응답: 클라이언트가 끊으면 다음 청크를 만들지 않음
+        disconnected = asyncio.ensure_future(receive())
+        try:
+            for chunk in chunks:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            while not disconnected.done():
+                chunk = await loop.run_in_executor(self._stream_executor(), context.run, _next_chunk, iterator)
+                if chunk is None:
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+                    break
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        finally:
+            disconnected.cancel()
+            await loop.run_in_executor(self._stream_executor(), context.run, _close, iterable)
+
+
+application = WsgiToAsgi(flask_app)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the dashboard with an ASGI server (uvicorn)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5001)
+    args = parser.parse_args()
+    try:
+        import uvicorn  # 서빙할 때만 필요
+    except ImportError:
+        raise SystemExit("uvicorn is required: pip install uvicorn")
+    # 이미 불러온 앱을 그대로 넘김 (여러 워커 프로세스는 uvicorn 명령의 --workers 로)
+    uvicorn.run(application, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+# assets.py
+"""
+static/ 아래 파일에 내용 해시를 붙여 dist/ 로 복사하고, 오래 캐시할 수 있는 URL로 제공한다.
+
+- font/pretendard.css -> /dist/font/pretendard.<hash>.css
+- plotly 패키지의 plotly.min.js -> /dist/vendor/plotly.min.<hash>.js (스냅샷 페이지용)
+- CSS 안의 url(...) 참조도 해시된 파일명으로 바꿔서 저장
+- 텍스트 계열 파일은 .gz (brotli 설치 시 .br 도) 로 미리 압축해 두고
+  클라이언트의 Accept-Encoding 에 맞춰 압축본을 그대로 보낸다.
+
+앱 시작 시 init_assets(app) 에서 자동으로 빌드되며, 단독 실행도 가능하다.
+
+    python assets.py
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+import time
+
+from flask import abort, request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # brotli 가 없으면 gzip 압축본만 만든다
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+BUILD_DIR = os.path.join(BASE_DIR, "dist")
+MANIFEST_NAME = "manifest.json"
+STALE_NAME = "stale.json"       # manifest 에서 빠진 파일 -> 빠진 것을 처음 확인한 시각
+# 교체된 파일을 지우기까지 기다리는 시간: 캐시된 레이아웃, 스냅샷, 다른 워커, 이미 열린 페이지가 아직 참조할 수 있음
+STALE_GRACE_SECONDS = 24 * 60 * 60
+ASSET_URL_PREFIX = "/dist/"
+
+HASH_LENGTH = 10
+# woff/woff2 는 이미 압축된 포맷이라 미리 압축하지 않음
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".svg", ".json", ".html", ".txt", ".map", ".ttf", ".otf"}
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# 최고 압축(brotli 11)은 MB 단위 파일(plotly.min.js, ttf 폰트)에서 파일당 수 초~수십 초가 걸려
+# 빈 dist/ 로 시작하는 워커의 기동을 막으므로, 이보다 큰 파일은 빠른 단계로 압축 (크기는 5% 정도만 커짐)
+PRECOMPRESS_LARGE_BYTES = 256 * 1024
+BROTLI_QUALITY = (11, 5)    # (작은 파일, 큰 파일)
+GZIP_LEVEL = (9, 6)
+
+_CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+# 원본 경로(static 기준) -> 해시된 경로(dist 기준)
+# 요청 처리 중에 비어 보이지 않도록 고치지 않고 새 객체로 통째로 바꾼다
+_manifest = {}
+_hashed_files = frozenset()
+_manifest_mtime = None      # 마지막으로 읽은(쓴) manifest 파일의 수정 시각
+
+
+def _set_manifest(manifest, mtime=None):
+    global _manifest, _hashed_files, _manifest_mtime
+    hashed_files = frozenset(manifest.values())
+    _manifest, _hashed_files, _manifest_mtime = dict(manifest), hashed_files, mtime
+
+
+def _hashed_name(path, content):
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    root, ext = posixpath.splitext(path)
+    return f"{root}.{digest}{ext}"
+
+
+def _rewrite_css_urls(css_path, text, manifest):
+    """CSS 내부의 상대 url() 을 해시된 파일 경로로 바꾼다."""
+    css_dir = posixpath.dirname(css_path)
+
+    def replace(match):
+        quote, url = match.group(1), match.group(2).strip()
+        if url.startswith(("data:", "http:", "https:", "//", "/", "#")):
+            return match.group(0)
+        path, suffix = re.match(r"([^?#]*)(.*)", url).groups()
+        target = posixpath.normpath(posixpath.join(css_dir, path))
+        if target not in manifest:
+            return match.group(0)
+        relative = posixpath.relpath(manifest[target], css_dir)
+        if not relative.startswith("."):
+            relative = "./" + relative
+        return f"url({quote}{relative}{suffix}{quote})"
+
+    return _CSS_URL_RE.sub(replace, text)
+
+
+def _write_if_missing(path, content):
+    # 파일명에 내용 해시가 들어 있으므로 이미 있으면 같은 내용이다
+    if os.path.exists(path):
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _precompress(path, content):
+    if os.path.splitext(path)[1] not in COMPRESSIBLE_EXTENSIONS:
+        return
+    large = len(content) > PRECOMPRESS_LARGE_BYTES
+    if not os.path.exists(path + ".gz"):
+        _write_if_missing(path + ".gz", gzip.compress(content, compresslevel=GZIP_LEVEL[large], mtime=0))
+    if brotli is not None and not os.path.exists(path + ".br"):
+        _write_if_missing(path + ".br", brotli.compress(content, quality=BROTLI_QUALITY[large]))
+
+
+def _static_files(static_dir):
+    for root, _, files in os.walk(static_dir):
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            yield os.path.relpath(full, static_dir).replace(os.sep, "/"), full
+
+
+def _vendor_files():
+    """
+    static/ 밖에서 가져와 함께 제공하는 파일 (manifest 경로, 실제 경로).
+    plotly.js 는 설치된 plotly 패키지에 들어 있는 것을 사용 (스냅샷 페이지용, CDN 불필요).
+    """
+    try:
+        import plotly
+    except ImportError:
+        return []
+    path = os.path.join(os.path.dirname(plotly.__file__), "package_data", "plotly.min.js")
+    return [("vendor/plotly.min.js", path)] if os.path.exists(path) else []
+
+
+def build_assets(static_dir=STATIC_DIR, build_dir=None, clean=True, paths=None):
+    """
+    static_dir 의 모든 파일(과 _vendor_files)을 해시된 이름으로 build_dir 에 생성하고 manifest 를 반환.
+    CSS 는 참조하는 파일의 해시가 먼저 정해져야 하므로 나머지 파일 다음에 처리한다.
+    paths(static 기준 경로 목록)를 주면 그 파일만 다시 만들어 현재 manifest 에 반영한다 (폰트 재생성 등).
+    clean 이면 manifest 에서 빠진 이전 결과물을 유예 시간이 지난 뒤 지운다 (prune_stale).
+    build_dir 를 주지 않으면 호출 시점의 BUILD_DIR (벤치마크 등에서 바꿀 수 있음).
+    """
+    build_dir = build_dir or BUILD_DIR
+    manifest = {}
+    if paths is not None:
+        manifest = dict(_manifest) or load_manifest(build_dir)
+    if manifest:
+        files = [(rel, os.path.join(static_dir, rel)) for rel in paths]
+    else:
+        # 아직 전체 빌드를 한 적이 없으면 전체 빌드
+        files = list(_static_files(static_dir)) + _vendor_files()
+    css_files = [(rel, full) for rel, full in files if rel.endswith(".css")]
+    other_files = [(rel, full) for rel, full in files if not rel.endswith(".css")]
+
+    for rel, full in other_files:
+        with open(full, "rb") as f:
+            content = f.read()
+        manifest[rel] = _hashed_name(rel, content)
+        out_path = os.path.join(build_dir, manifest[rel])
+        if not os.path.exists(out_path):
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            shutil.copyfile(full, out_path)
+        _precompress(out_path, content)
+
+    for rel, full in css_files:
+        with open(full, "r", encoding="utf-8") as f:
+            text = f.read()
+        content = _rewrite_css_urls(rel, text, manifest).encode("utf-8")
+        manifest[rel] = _hashed_name(rel, content)
+        out_path = os.path.join(build_dir, manifest[rel])
+        _write_if_missing(out_path, content)
+        _precompress(out_path, content)
+
+    if clean:
+        prune_stale(build_dir, manifest)
+
+    os.makedirs(build_dir, exist_ok=True)
+    manifest_path = os.path.join(build_dir, MANIFEST_NAME)
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+    _set_manifest(manifest, os.path.getmtime(manifest_path))
+    return manifest
+
+
+def prune_stale(build_dir=None, manifest=None, grace=STALE_GRACE_SECONDS, now=None):
+    """
+    manifest(기본: 현재 manifest)에 없는 이전 빌드 결과물을 정리한다.
+    빠진 것을 처음 확인한 시각을 stale.json 에 적어 두고, grace 초가 지난 파일만 지운다.
+    지운 파일 목록을 반환.
+    """
+    build_dir = build_dir or BUILD_DIR
+    manifest = _manifest if manifest is None else manifest
+    now = time.time() if now is None else now
+    keep = set(manifest.values()) | {MANIFEST_NAME, STALE_NAME}
+    stale_path = os.path.join(build_dir, STALE_NAME)
+    try:
+        with open(stale_path, encoding="utf-8") as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+
+    stale = {}
+    removed = []
+    for rel, full in list(_static_files(build_dir)):
+        base = rel[:-3] if rel.endswith((".gz", ".br")) else rel
+        if base in keep or rel.endswith(".tmp"):
+            continue
+        since = previous.get(base, now)
+        if now - since < grace:
+            stale[base] = since
+            continue
+        try:
+            os.remove(full)
+            removed.append(rel)
+        except FileNotFoundError:  # 다른 워커가 먼저 지움
+            pass
+
+    os.makedirs(build_dir, exist_ok=True)
+    with open(stale_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(stale, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(stale_path + ".tmp", stale_path)
+    return removed
+
+
+def load_manifest(build_dir=None):
+    path = os.path.join(build_dir or BUILD_DIR, MANIFEST_NAME)
+    if os.path.exists(path):
+        mtime = os.path.getmtime(path)
+        with open(path, encoding="utf-8") as f:
+            _set_manifest(json.load(f), mtime)
+    return dict(_manifest)
+
+
+def _is_served(filename):
+    """
+    /dist/ 로 제공할 파일인지: 현재 manifest 의 파일, 또는 교체됐지만 유예 시간 동안 남겨 둔 파일(stale.json).
+    다른 워커가 다시 빌드했을 수 있으므로 manifest 에 없으면 디스크의 manifest 가 바뀌었을 때 다시 읽는다.
+    """
+    if filename in _hashed_files:
+        return True
+    try:
+        mtime = os.path.getmtime(os.path.join(BUILD_DIR, MANIFEST_NAME))
+    except OSError:
+        mtime = None
+    if mtime is not None and mtime != _manifest_mtime:
+        load_manifest()
+        if filename in _hashed_files:
+            return True
+    try:
+        with open(os.path.join(BUILD_DIR, STALE_NAME), encoding="utf-8") as f:
+            return filename in json.load(f)
+    except (OSError, ValueError):
+        return False
+
+
+def asset_url(path):
+    """static 기준 경로를 해시된 URL로 변환 (빌드 전이면 일반 /static URL)."""
+    hashed = _manifest.get(path)
+    if hashed is None:
+        return "/static/" + path
+    return ASSET_URL_PREFIX + hashed
+
+
+def _accepted_encodings():
+    accepted = set()
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def serve_asset(filename):
+    if not _is_served(filename):
+        abort(404)
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    accepted = _accepted_encodings()
+    variant, encoding = filename, None
+    for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if candidate in accepted and os.path.exists(os.path.join(BUILD_DIR, filename + suffix)):
+            variant, encoding = filename + suffix, candidate
+            break
+
+    response = send_from_directory(BUILD_DIR, variant, mimetype=mimetype)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+def init_assets(flask_app, build=True):
+    """해시된 정적 파일을 빌드하고 /dist/ 라우트와 템플릿 함수 asset_url 을 등록."""
+    if build:
+        build_assets()
+    else:
+        load_manifest()
+    flask_app.add_url_rule(ASSET_URL_PREFIX + "<path:filename>", "dist_asset", serve_asset)
+    flask_app.jinja_env.globals["asset_url"] = asset_url
+
+
+if __name__ == "__main__":
+    result = build_assets()
+    print(f"Built {len(result)} assets into {BUILD_DIR}")
@@ -1,30 +1,246 @@
+# backupdb.py
+"""
+projects.db 백업 / 복구.
+
+- SQLite 온라인 백업 API 로 BACKUP_STEP_PAGES 페이지씩 나누어 복사하므로, 복사 중에도 앱의 쓰기가
+  멈추지 않고 (WAL) 결과는 한 시점의 일관된 DB 이다 (파일 복사처럼 쓰는 도중의 상태가 담기지 않음).
+- 복사본은 PRAGMA integrity_check 로 검사한 뒤 gzip 으로 압축해 저장한다.
+- 보관 정책: 최근 BACKUP_KEEP_DAILY 일은 하루 1개, BACKUP_KEEP_WEEKLY 주는 주 1개,
+  BACKUP_KEEP_MONTHLY 개월은 달 1개 (각각 그 기간의 가장 최근 백업)만 남기고 지운다.
+- 예약 실행 때는 백업 후 changelog.compact() 로 변경 이력도 정리한다.
+- 앱 안에서 start_backup_scheduler() 로 매일 정해진 시각에 실행하거나, 단독으로 실행할 수 있다.
+
+    python backupdb.py backup                      # 지금 백업 1회 + 보관 정책 적용
+    python backupdb.py schedule --at 09:34         # 매일 09:34 에 백업 (종료할 때까지)
+    python backupdb.py list
+    python backupdb.py restore db_backup/project_20250301-093400.db.gz [--db projects.db]
+"""
+import argparse
+import datetime
+import gzip
 import os
+import re
 import shutil
-from datetime import datetime
-import schedule
+import sqlite3
+import tempfile
+import threading
 import time
 
-def backup_db():
-    source = "projects.db"  # 백업할 데이터베이스 파일 경로
-    backup_dir = "db_backup"  # 백업 파일이 저장될 디렉토리
-    
-    # backup_dir 디렉토리가 없으면 생성
-    if not os.path.exists(backup_dir):
-        os.makedirs(backup_dir)
-    
-    # 오늘 날짜를 YYYYMMDD 형식으로 생성
-    today = datetime.now().strftime("%Y%m%d")
-    backup_filename = f"project_{today}.db"
-    backup_path = os.path.join(backup_dir, backup_filename)
-    
-    # project.db 파일을 backup_path 로 복사
-    shutil.copy(source, backup_path)
-    print(f"Backup created: {backup_path}")
-
-# 매일 자정(00:00)에 백업 작업 예약
-schedule.every().day.at("09:34").do(backup_db)
-
-# 스케줄러 루프 (무한 반복하여 예약된 작업 실행)
-while True:
-    schedule.run_pending()
-    time.sleep(60)  # 60초마다 확인
+import changelog
+import database
+
+BACKUP_DIR = "db_backup"
+BACKUP_STEP_PAGES = 1024        # 한 번에 복사할 페이지 수 (4KB 페이지 기준 4MB)
+BACKUP_STEP_SLEEP = 0.005       # 단계 사이 쉬는 시간(초): 그 사이 다른 연결이 잠금을 잡을 수 있음
+BACKUP_KEEP_DAILY = 7
+BACKUP_KEEP_WEEKLY = 4
+BACKUP_KEEP_MONTHLY = 12
+
+# project_20250301-093400.db.gz (이전 방식의 project_20250301.db 도 목록/보관 정책에 포함)
+BACKUP_PATTERN = re.compile(r"project_(\d{8})(?:-(\d{6}))?\.db(\.gz)?$")
+
+
+class BackupError(Exception):
+    pass
+
+
+def _integrity_check(path):
+    conn = sqlite3.connect(path)
+    try:
+        result = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+    finally:
+        conn.close()
+    if result != ["ok"]:
+        raise BackupError(f"integrity check failed for {path}: {'; '.join(result[:5])}")
+
+
+def _copy_database(source_path, target_path, pages=BACKUP_STEP_PAGES, sleep=BACKUP_STEP_SLEEP):
+    """온라인 백업 API 로 source_path -> target_path 복사 (target 내용은 덮어씀)."""
+    source = sqlite3.connect(source_path, isolation_level=None)
+    target = sqlite3.connect(target_path)
+    try:
+        source.execute("PRAGMA busy_timeout=5000")
+        # 읽기 트랜잭션을 먼저 열어 두면 단계 사이에 다른 연결이 커밋해도 같은 시점을 계속 복사한다
+        # (열지 않으면 쓰기가 있을 때마다 백업이 처음부터 다시 시작됨). WAL 이면 쓰기는 막지 않음
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        source.backup(target, pages=pages, sleep=sleep)
+        source.execute("COMMIT")
+    finally:
+        target.close()
+        source.close()
+
+
+def backup_db(db_path=None, backup_dir=BACKUP_DIR, now=None):
+    """
+    일관된 복사본을 만들어 검사 후 압축 저장하고 보관 정책을 적용한다. 저장한 파일 경로를 반환.
+    실패하면 임시 파일을 지우고 예외 (기존 백업은 건드리지 않음).
+    """
+    db_path = db_path or database.DB_NAME
+    now = now or datetime.datetime.now()
+    os.makedirs(backup_dir, exist_ok=True)
+    backup_path = os.path.join(backup_dir, f"project_{now:%Y%m%d-%H%M%S}.db.gz")
+
+    handle, snapshot = tempfile.mkstemp(suffix=".db", dir=backup_dir)
+    os.close(handle)
+    partial = backup_path + ".tmp"
+    try:
+        started = time.perf_counter()
+        _copy_database(db_path, snapshot)
+        # 복사본만 검사하므로 운영 DB 에는 잠금을 걸지 않음
+        _integrity_check(snapshot)
+        with open(snapshot, "rb") as src, gzip.open(partial, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.replace(partial, backup_path)  # 완성된 파일만 백업 이름으로 보임
+        elapsed = time.perf_counter() - started
+    finally:
+        for path in (snapshot, partial):
+            if os.path.exists(path):
+                os.remove(path)
+
+    removed = prune_backups(backup_dir, now=now)
+    print(f"Backup created: {backup_path} ({os.path.getsize(backup_path)} bytes, {elapsed:.2f}s, "
+          f"removed {len(removed)} old backups)")
+    return backup_path
+
+
+def list_backups(backup_dir=BACKUP_DIR):
+    """(백업 시각, 경로) 목록, 최신순."""
+    if not os.path.isdir(backup_dir):
+        return []
+    backups = []
+    for name in os.listdir(backup_dir):
+        match = BACKUP_PATTERN.match(name)
+        if match:
+            taken = datetime.datetime.strptime(match.group(1) + (match.group(2) or "000000"), "%Y%m%d%H%M%S")
+            backups.append((taken, os.path.join(backup_dir, name)))
+    return sorted(backups, reverse=True)
+
+
+def select_retained(backups, now, daily=BACKUP_KEEP_DAILY, weekly=BACKUP_KEEP_WEEKLY,
+                    monthly=BACKUP_KEEP_MONTHLY):
+    """backups(최신순 (시각, 경로)) 중 보관 정책에 따라 남길 경로 집합."""
+    today = now.date()
+    keep = set()
+    # (기간 구분 함수, 남길 기간 수) - 각 기간에서 가장 최근 백업 1개
+    rules = [
+        (lambda d: d, daily),
+        (lambda d: d - datetime.timedelta(days=d.weekday()), weekly),   # 그 주의 월요일
+        (lambda d: d.replace(day=1), monthly),
+    ]
+    for bucket, count in rules:
+        current = bucket(today)
+        periods = set()
+        for taken, path in backups:
+            period = bucket(taken.date())
+            if period in periods:
+                continue
+            # 오늘이 속한 기간부터 count 개 기간까지
+            if len(periods) >= count or period > current:
+                continue
+            periods.add(period)
+            keep.add(path)
+    if backups:
+        keep.add(backups[0][1])  # 가장 최근 백업은 항상 남김
+    return keep
+
+
+def prune_backups(backup_dir=BACKUP_DIR, now=None, **rules):
+    """보관 정책에서 벗어난 백업을 지우고 지운 경로 목록을 반환."""
+    backups = list_backups(backup_dir)
+    keep = select_retained(backups, now or datetime.datetime.now(), **rules)
+    removed = [path for _, path in backups if path not in keep]
+    for path in removed:
+        os.remove(path)
+    return removed
+
+
+def restore_db(backup_path, db_path=None):
+    """
+    백업(.db.gz 또는 .db)을 검사한 뒤 db_path 에 덮어쓴다.
+    파일을 바꾸지 않고 백업 API 로 내용을 옮기므로 실행 중인 앱의 연결도 복구된 내용을 읽는다.
+    """
+    db_path = db_path or database.DB_NAME
+    handle, snapshot = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(os.path.abspath(db_path)))
+    os.close(handle)
+    try:
+        opener = gzip.open if backup_path.endswith(".gz") else open
+        with opener(backup_path, "rb") as src, open(snapshot, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        _integrity_check(snapshot)
+        # 복구는 한 번에 복사 (중간에 다른 쓰기가 섞이지 않도록)
+        _copy_database(snapshot, db_path, pages=-1, sleep=0)
+    finally:
+        os.remove(snapshot)
+    database.close_pool()
+    print(f"Restored {db_path} from {backup_path}")
+
+
+def _seconds_until(at, now=None):
+    now = now or datetime.datetime.now()
+    hour, minute = map(int, at.split(":"))
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += datetime.timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+def run_schedule(at, db_path=None, backup_dir=BACKUP_DIR, stop_event=None):
+    """매일 at(HH:MM)에 백업. stop_event 가 설정되면 종료."""
+    stop_event = stop_event or threading.Event()
+    while not stop_event.wait(_seconds_until(at)):
+        try:
+            backup_db(db_path, backup_dir)
+            # 백업이 생겼으니 오래된 변경 이력은 정리 (그 이전 시점은 백업 파일로 복구)
+            print(f"Change log compacted: {changelog.compact()}")
+        except (OSError, sqlite3.Error, BackupError) as e:
+            # 한 번 실패해도 다음 날 백업은 계속
+            print(f"Backup failed: {e}")
+
+
+def start_backup_scheduler(at, db_path=None, backup_dir=BACKUP_DIR):
+    """앱 프로세스 안에서 매일 at(HH:MM)에 백업하는 데몬 스레드를 시작하고 중지용 Event 를 반환."""
+    stop_event = threading.Event()
+    thread = threading.Thread(target=run_schedule, args=(at, db_path, backup_dir, stop_event),
+                              name="db-backup", daemon=True)
+    thread.start()
+    return stop_event
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Back up and restore projects.db")
+    parser.add_argument("--db", default=database.DB_NAME)
+    parser.add_argument("--dir", default=BACKUP_DIR, help="backup directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("backup")
+    schedule = sub.add_parser("schedule")
+    schedule.add_argument("--at", default="09:34", help="daily backup time (HH:MM)")
+    sub.add_parser("list")
+    sub.add_parser("prune")
+    restore = sub.add_parser("restore")
+    restore.add_argument("backup", help="backup file (.db.gz or .db), or 'latest'")
+    args = parser.parse_args()
+    database.DB_NAME = args.db
+
+    if args.command == "backup":
+        backup_db(args.db, args.dir)
+    elif args.command == "schedule":
+        run_schedule(args.at, args.db, args.dir)
+    elif args.command == "list":
+        for taken, path in list_backups(args.dir):
+            print(f"{taken:%Y-%m-%d %H:%M:%S}  {os.path.getsize(path):>12}  {path}")
+    elif args.command == "prune":
+        for path in prune_backups(args.dir):
+            print(f"Removed {path}")
+    else:
+        path = args.backup
+        if path == "latest":
+            backups = list_backups(args.dir)
+            if not backups:
+                raise SystemExit(f"No backups in {args.dir}")
+            path = backups[0][1]
+        restore_db(path, args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# benchmarks: 성능 측정 스크립트 모음 (python -m benchmarks.<이름> 으로 실행)
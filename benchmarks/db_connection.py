@@ -0,0 +1,134 @@
+# benchmarks/db_connection.py
+"""
+연결 풀(database.pooled_connection) 과 기존 방식(호출마다 sqlite3.connect)을 비교하는 마이크로 벤치마크.
+
+    python -m benchmarks.db_connection [--db projects.db] [--repeat 2000]
+
+원본 DB를 임시 디렉터리에 복사해서 측정하므로 실제 데이터는 바뀌지 않는다.
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+import database
+
+
+def _legacy_get_projects(db_path):
+    # 기존 database.get_projects 와 같은 방식: 호출마다 연결을 열고 닫음
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM projects")
+    rows = cursor.fetchall()
+    conn.close()
+    return rows
+
+
+def _legacy_touch_project(db_path, project_id):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("UPDATE projects SET current_expenditure = current_expenditure WHERE id=?", (project_id,))
+    conn.commit()
+    conn.close()
+
+
+def _pooled_get_projects():
+    with database.pooled_connection() as conn:
+        return conn.execute("SELECT * FROM projects").fetchall()
+
+
+def _pooled_touch_project(project_id):
+    with database.transaction() as conn:
+        conn.execute("UPDATE projects SET current_expenditure = current_expenditure WHERE id=?", (project_id,))
+
+
+def _time_calls(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return {
+        "mean_us": round(statistics.fmean(samples) * 1e6, 1),
+        "p50_us": round(samples[len(samples) // 2] * 1e6, 1),
+        "p99_us": round(samples[int(len(samples) * 0.99) - 1] * 1e6, 1),
+    }
+
+
+def _reads_during_writes(read_fn, write_fn, duration=1.0, readers=4):
+    """쓰기가 계속 일어나는 동안 읽기 스레드들이 처리한 횟수와 최대 지연."""
+    stop = threading.Event()
+    counts = [0] * readers
+    worst = [0.0] * readers
+
+    def reader(i):
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            read_fn()
+            worst[i] = max(worst[i], time.perf_counter() - t0)
+            counts[i] += 1
+
+    def writer():
+        while not stop.is_set():
+            write_fn()
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    return {"reads_per_sec": round(sum(counts) / duration), "worst_read_ms": round(max(worst) * 1e3, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=database.DB_NAME)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, "legacy.db")
+        pooled_db = os.path.join(tmp, "pooled.db")
+        shutil.copy(args.db, legacy_db)
+        shutil.copy(args.db, pooled_db)
+        project_id = sqlite3.connect(legacy_db).execute("SELECT MIN(id) FROM projects").fetchone()[0]
+
+        original_db = database.DB_NAME
+        database.DB_NAME = pooled_db
+        try:
+            results = {
+                "read": {
+                    "connect_per_call": _time_calls(lambda: _legacy_get_projects(legacy_db), args.repeat),
+                    "pooled": _time_calls(_pooled_get_projects, args.repeat),
+                },
+                "write": {
+                    "connect_per_call": _time_calls(lambda: _legacy_touch_project(legacy_db, project_id), args.repeat // 10),
+                    "pooled": _time_calls(lambda: _pooled_touch_project(project_id), args.repeat // 10),
+                },
+                "reads_during_writes": {
+                    "connect_per_call": _reads_during_writes(lambda: _legacy_get_projects(legacy_db),
+                                                             lambda: _legacy_touch_project(legacy_db, project_id)),
+                    "pooled": _reads_during_writes(_pooled_get_projects,
+                                                   lambda: _pooled_touch_project(project_id)),
+                },
+            }
+        finally:
+            database.close_pool()
+            database.DB_NAME = original_db
+
+    for section, rows in results.items():
+        print(f"[{section}]")
+        for mode, stats in rows.items():
+            print(f"  {mode:<18} " + "  ".join(f"{k}={v}" for k, v in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
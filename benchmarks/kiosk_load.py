@@ -0,0 +1,283 @@
+# benchmarks/kiosk_load.py
+"""
+키오스크 동시 접속 부하 테스트: 서버를 임시 DB 복사본으로 띄우고 keep-alive 연결 N개가
+주기적으로 요청을 보내는 동안 응답 지연(p50/p99)을 구간별로 측정한다.
+
+--slow 개의 연결은 느린 무선망 클라이언트처럼 요청을 한 바이트씩 보내고 응답도 천천히 읽는다.
+연결마다 스레드를 쓰는 서버에서는 이런 연결이 스레드를 잡고 있으므로, 구간별 p99 가
+시간이 지나도 일정한지(p99_spread) 와 서버 스레드 수를 함께 비교한다.
+
+    python -m benchmarks.kiosk_load --server asgi [--clients 500] [--slow 20] [--duration 30]
+    python -m benchmarks.kiosk_load --server threaded      # app.run(threaded=True), 비교용
+    python -m benchmarks.kiosk_load --server gthread       # gunicorn 고정 스레드 풀, 비교용
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import database
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# DB 경로만 바꾼 뒤 각 방식으로 서버 실행
+SERVE_SCRIPTS = {
+    "asgi": ("import database; database.DB_NAME = {db!r}; import uvicorn, asgi; "
+             "uvicorn.run(asgi.application, host='127.0.0.1', port={port}, log_level='warning')"),
+    "threaded": ("import database; database.DB_NAME = {db!r}; import app; "
+                 "app.app.run(host='127.0.0.1', port={port}, threaded=True)"),
+    # 고정 크기 스레드 풀 WSGI 서버 (워커 1개, 스레드 DB_EXECUTOR_WORKERS 개: ASGI 모드와 같은 동시 실행 수)
+    "gthread": ("import sys, database; database.DB_NAME = {db!r}; from gunicorn.app.wsgiapp import run; "
+                "sys.argv = ['gunicorn', '--worker-class', 'gthread', '--threads', str(database.DB_EXECUTOR_WORKERS), "
+                "'--bind', '127.0.0.1:{port}', '--log-level', 'warning', 'app:app']; run()"),
+}
+
+# 키오스크가 반복해서 보내는 요청 (스냅샷 변경 확인, 읽기 API, 상태 확인)
+KIOSK_REQUESTS = [
+    "/snapshot/dashboard/version",
+    "/api/projects?limit=20",
+    "/snapshot/expense/version",
+    "/healthz",
+    "/api/milestones?limit=20",
+]
+
+
+def _request_bytes(path):
+    return (f"GET {path} HTTP/1.1\r\nHost: localhost\r\nAccept-Encoding: gzip\r\n"
+            f"Connection: keep-alive\r\n\r\n").encode("latin-1")
+
+
+async def _read_response(reader, delay=0.0):
+    """응답 하나를 읽고 (상태 코드, 연결 유지 여부). delay 가 있으면 본문을 1KB 씩 천천히 읽음."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip().lower()
+
+    async def read(size):
+        data = b""
+        while len(data) < size:
+            data += await reader.readexactly(min(1024, size - len(data)) if delay else size - len(data))
+            if delay:
+                await asyncio.sleep(delay)
+        return data
+
+    if "content-length" in headers:
+        await read(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await read(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.read()
+        return status, False
+    return status, headers.get("connection") != "close"
+
+
+async def _kiosk(port, deadline, interval, offset, results):
+    """interval 초마다 KIOSK_REQUESTS 를 차례로 요청 (keep-alive, 끊기면 다시 연결)."""
+    await asyncio.sleep(random.uniform(0, interval))
+    connection = None
+    i = offset
+    while time.perf_counter() < deadline:
+        path = KIOSK_REQUESTS[i % len(KIOSK_REQUESTS)]
+        i += 1
+        started = time.perf_counter()
+        for attempt in range(2):
+            reused = connection is not None
+            try:
+                if connection is None:
+                    connection = await asyncio.open_connection("127.0.0.1", port)
+                reader, writer = connection
+                writer.write(_request_bytes(path))
+                await writer.drain()
+                status, keep_alive = await _read_response(reader)
+                results.append((started, time.perf_counter() - started, status))
+                if not keep_alive:
+                    writer.close()
+                    connection = None
+                break
+            except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+                connection = None
+                # 서버가 유휴 keep-alive 연결을 닫은 경우 브라우저처럼 새 연결로 한 번 재시도
+                if not reused or attempt:
+                    results.append((started, time.perf_counter() - started, 0))
+                    break
+        await asyncio.sleep(interval * random.uniform(0.8, 1.2))
+    if connection is not None:
+        connection[1].close()
+
+
+async def _slow_client(port, deadline, delay):
+    """요청을 한 바이트씩 delay 간격으로 보내고, 응답도 1KB 마다 delay 씩 쉬며 읽는다."""
+    while time.perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            for byte in _request_bytes("/snapshot/dashboard"):
+                writer.write(bytes([byte]))
+                await writer.drain()
+                await asyncio.sleep(delay)
+                if time.perf_counter() >= deadline:
+                    break
+            else:
+                await _read_response(reader, delay)
+            writer.close()
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            await asyncio.sleep(delay)
+
+
+def _process_tree(pid):
+    pids = [pid]
+    for child_pid in pids:
+        try:
+            with open(f"/proc/{child_pid}/task/{child_pid}/children") as f:
+                pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+def _process_stats(pid):
+    """서버 프로세스와 자식 프로세스(gunicorn 워커)의 (스레드 수, RSS MB) 합계 - /proc 기준."""
+    threads = rss = 0
+    for process_pid in _process_tree(pid):
+        try:
+            with open(f"/proc/{process_pid}/status") as f:
+                for line in f:
+                    if line.startswith("Threads:"):
+                        threads += int(line.split()[1])
+                    elif line.startswith("VmRSS:"):
+                        rss += int(line.split()[1]) / 1024
+        except OSError:
+            pass
+    return threads, rss
+
+
+async def _sample_server(pid, deadline, samples):
+    while time.perf_counter() < deadline:
+        samples.append(_process_stats(pid))
+        await asyncio.sleep(1)
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def _load(port, pid, clients, slow, duration, interval, slow_delay):
+    results = []
+    samples = []
+    deadline = time.perf_counter() + duration
+    tasks = [_kiosk(port, deadline, interval, i, results) for i in range(clients)]
+    tasks += [_slow_client(port, deadline, slow_delay) for _ in range(slow)]
+    tasks.append(_sample_server(pid, deadline, samples))
+    start = time.perf_counter()
+    await asyncio.gather(*tasks)
+    return start, results, samples
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get_status(port, path, timeout=60):
+    with socket.create_connection(("127.0.0.1", port), timeout=timeout) as s:
+        s.sendall(_request_bytes(path))
+        return s.recv(12)
+
+
+def _wait_ready(port, process, timeout=60):
+    """서버가 응답할 때까지 기다린 뒤 각 요청을 한 번씩 보내 둔다 (첫 스냅샷 생성은 측정에서 제외)."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with {process.returncode}")
+        try:
+            if _get_status(port, "/healthz", 1).startswith(b"HTTP/1.1 200"):
+                for path in KIOSK_REQUESTS + ["/snapshot/dashboard"]:
+                    _get_status(port, path)
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def run(server, clients, slow, duration, interval, slow_delay, window):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "projects.db")
+        shutil.copy(database.DB_NAME, db_path)
+        port = _free_port()
+        env = dict(os.environ, DASHBOARD_FONT_BUILD="0", PYTHONPATH=ROOT_DIR)
+        process = subprocess.Popen([sys.executable, "-c", SERVE_SCRIPTS[server].format(db=db_path, port=port)],
+                                   cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            _wait_ready(port, process)
+            threads_idle = _process_stats(process.pid)[0]
+            start, results, samples = asyncio.run(
+                _load(port, process.pid, clients, slow, duration, interval, slow_delay))
+        finally:
+            process.terminate()
+            process.wait(10)
+
+    latencies = sorted(latency for _, latency, status in results if status)
+    errors = sum(1 for _, _, status in results if status == 0 or status >= 500)
+    # 구간별 p99 (처음 구간은 연결이 몰리는 시작 구간이라 제외)
+    windows = {}
+    for started, latency, status in results:
+        if status:
+            windows.setdefault(int((started - start) // window), []).append(latency)
+    window_p99 = [round(_percentile(sorted(values), 0.99) * 1000, 1)
+                  for index, values in sorted(windows.items()) if index > 0 and len(values) >= 20]
+    return {
+        "server": server,
+        "clients": clients,
+        "slow_clients": slow,
+        "duration_s": duration,
+        "requests": len(results),
+        "errors": errors,
+        "throughput_rps": round(len(results) / duration, 1),
+        "latency_p50_ms": round(_percentile(latencies, 0.5) * 1000, 2) if latencies else None,
+        "latency_p99_ms": round(_percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        "latency_max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+        f"window_p99_ms_per_{window}s": window_p99,
+        "p99_spread": round(max(window_p99) / min(window_p99), 2) if window_p99 else None,
+        "server_threads_idle": threads_idle,
+        "server_threads_max": max(threads for threads, _ in samples) if samples else None,
+        "server_rss_max_mb": round(max(rss for _, rss in samples), 1) if samples else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent kiosk load test")
+    parser.add_argument("--server", choices=sorted(SERVE_SCRIPTS), default="asgi")
+    parser.add_argument("--clients", type=int, default=500, help="keep-alive kiosk connections")
+    parser.add_argument("--slow", type=int, default=20, help="slow clients trickling requests")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--interval", type=float, default=5, help="seconds between requests per kiosk")
+    parser.add_argument("--slow-delay", type=float, default=0.2, help="seconds between bytes for slow clients")
+    parser.add_argument("--window", type=int, default=5, help="p99 window length in seconds")
+    args = parser.parse_args()
+    print(json.dumps(run(args.server, args.clients, args.slow, args.duration, args.interval,
+                         args.slow_delay, args.window), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/research_graphs.py
+"""
+정량 성과지표 패널: 프로젝트별 dcc.Graph(create_research_graphs) 와
+단일 서브플롯 Figure(create_research_figure) 의 빌드 시간과 JSON 페이로드 크기 비교.
+
+    python -m benchmarks.research_graphs [--counts 5,10,30,60] [--repeat 20]
+
+실제 DB의 프로젝트를 반복해서 원하는 개수만큼 만든다 (DB는 읽기만 함).
+"""
+import argparse
+import json
+import statistics
+import time
+
+import plotly
+from dash import dcc, html
+
+from database import get_projects
+from graphs import create_research_graphs, create_research_figure
+
+
+def _projects(count):
+    base = get_projects()
+    result = []
+    for i in range(count):
+        project = dict(base[i % len(base)])
+        project["name"] = f"{project['name']} {i + 1}"
+        result.append(project)
+    return result
+
+
+def _build_per_project(projects):
+    return create_research_graphs(projects)
+
+
+def _build_subplots(projects):
+    return html.Div(dcc.Graph(figure=create_research_figure(projects), style={"width": "100%"}))
+
+
+def _payload_size(component):
+    return len(json.dumps(component, cls=plotly.utils.PlotlyJSONEncoder).encode("utf-8"))
+
+
+def _median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return round(statistics.median(samples) * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--counts", default="5,10,30,60")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'projects':>8} | {'mode':<11} | {'build ms':>9} | {'payload KB':>10} | {'graphs':>6}")
+    for count in (int(c) for c in args.counts.split(",")):
+        projects = _projects(count)
+        for mode, build, graphs in (("per_project", _build_per_project, count),
+                                    ("subplots", _build_subplots, 1)):
+            build_ms = _median_ms(lambda: build(projects), args.repeat)
+            payload_kb = round(_payload_size(build(projects)) / 1024, 1)
+            print(f"{count:>8} | {mode:<11} | {build_ms:>9} | {payload_kb:>10} | {graphs:>6}")
+
+
+if __name__ == "__main__":
+    main()
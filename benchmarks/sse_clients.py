@@ -0,0 +1,103 @@
+# benchmarks/sse_clients.py
+"""
+SSE 허브(events.py) 로컬 클라이언트 하네스.
+
+허브를 임시 포트로 띄우고 유휴 연결 N개를 연 뒤, DB 쓰기(임시 DB 복사본)로 이벤트를 발행해
+모든 클라이언트가 받았는지, 전달 지연과 스레드 수를 확인한다.
+
+    python -m benchmarks.sse_clients [--clients 500] [--events 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+import database
+from events import EventHub
+
+
+async def _client(port, tables, expected, latencies, ready):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    query = f"?tables={tables}" if tables else ""
+    writer.write(f"GET /events{query} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    while (await reader.readline()) not in (b"\r\n", b""):
+        pass
+    ready.release()
+    received = 0
+    while received < expected:
+        line = await reader.readline()
+        if not line:
+            break
+        if line.startswith(b"data: "):
+            event = json.loads(line[6:])
+            latencies.append(time.time() - event["ts"])
+            received += 1
+    writer.close()
+    return received
+
+
+async def run(clients, events):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "projects.db")
+        shutil.copy(database.DB_NAME, db_path)
+        original_db = database.DB_NAME
+        database.DB_NAME = db_path
+        hub = EventHub("127.0.0.1", 0)
+        hub.start_in_thread()
+        database.add_change_listener(hub.publish)
+        try:
+            threads_before = threading.active_count()
+            latencies = []
+            ready = asyncio.Semaphore(0)
+            tasks = [asyncio.create_task(_client(hub.port, "milestones", events, latencies, ready))
+                     for _ in range(clients)]
+            for _ in range(clients):
+                await ready.acquire()
+            while hub.stats["connections"] < clients:
+                await asyncio.sleep(0.01)
+            threads_connected = threading.active_count()
+
+            milestone = database.get_milestones()[0]
+            start = time.perf_counter()
+            for i in range(events):
+                # 실제 쓰기 경로로 발행 (database → change listener → hub)
+                await asyncio.to_thread(
+                    database.update_milestone, milestone["id"], milestone["Milestone"], milestone["Start"],
+                    milestone["Finish"], milestone["Status"], milestone["세부 목표"], milestone["담당자"])
+            received = await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - start
+        finally:
+            database._change_listeners.remove(hub.publish)
+            database.close_pool()
+            database.DB_NAME = original_db
+
+    latencies.sort()
+    return {
+        "clients": clients,
+        "events": events,
+        "all_delivered": all(r == events for r in received),
+        "deliveries": len(latencies),
+        "threads_before_clients": threads_before,
+        "threads_with_clients": threads_connected,
+        "latency_p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "latency_p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+        "elapsed_s": round(elapsed, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SSE hub fan-out harness")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--events", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.clients, args.events)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
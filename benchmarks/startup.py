@@ -0,0 +1,164 @@
+# benchmarks/startup.py
+"""
+워커 콜드 스타트 측정: 새 프로세스에서 `import app` 까지 걸리는 시간과 패키지별 임포트 시간(-X importtime).
+
+pre-fork 워커마다 같은 비용을 치르므로, 무거운 모듈이 다시 시작 경로에 들어오면 실패(종료 코드 1)한다.
+- --forbid 에 적은 모듈(기본: pandas, plotly.express, fontTools)이 `import app` 중에 로드되면 실패
+- --max-seconds 를 주면 중앙값이 그보다 길면 실패
+- --compare 로 이전 결과(JSON)와 비교해 중앙값이 --max-ratio 배를 넘으면 실패
+- 첫 실행은 빈 빌드 폴더(dist/)로 시작하는 콜드 스타트(정적 파일 해시/미리 압축 포함)로 따로 재고,
+  나머지 실행(이미 빌드된 상태)의 중앙값보다 --max-cold-ratio 배 넘게 느리면 실패
+
+    python -m benchmarks.startup --output startup.json
+    python -m benchmarks.startup --compare startup.json --max-ratio 1.3
+
+앱 임포트는 마이그레이션을 실행하므로 --db(기본 projects.db)의 임시 복사본과 임시 빌드 폴더를 사용한다.
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import database
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_FORBIDDEN = ["pandas", "plotly.express", "fontTools"]
+
+# DB 경로와 빌드 폴더만 바꾸고 앱을 불러온다 (app.py 가 import 시점에 마이그레이션/초기화를 수행)
+IMPORT_SCRIPT = ("import database, assets; database.DB_NAME = {db!r}; assets.BUILD_DIR = {build_dir!r}; "
+                 "import app")
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 -> [(모듈, self_us, cumulative_us, depth)] (임포트된 순서)."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def package_times(modules):
+    """최상위 패키지별 self 시간 합계(ms), 큰 순."""
+    totals = {}
+    for name, self_us, _, _ in modules:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(((package, round(us / 1000, 1)) for package, us in totals.items()),
+                  key=lambda item: -item[1])
+
+
+def measure_startup(db_path, build_dir, repeat=5):
+    """
+    새 프로세스로 `import app` 을 실행한 결과 (마지막 실행의 임포트 내역 포함).
+    build_dir 가 비어 있는 첫 실행은 cold_s 로, 이후 repeat 번은 중앙값 등으로 집계한다.
+    """
+    env = dict(os.environ, DASHBOARD_FONT_BUILD="0", PYTHONPATH=ROOT_DIR, PYTHONDONTWRITEBYTECODE="")
+    samples = []
+    modules = []
+    for _ in range(repeat + 1):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                                 IMPORT_SCRIPT.format(db=db_path, build_dir=build_dir)],
+                                cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+        samples.append(time.perf_counter() - started)
+        if result.returncode != 0:
+            raise RuntimeError(f"import app failed:\n{result.stderr[-2000:]}")
+        modules = parse_importtime(result.stderr)
+    cold = samples.pop(0)
+    samples.sort()
+    imported = {name for name, _, _, _ in modules}
+    app_us = next((cumulative for name, _, cumulative, depth in modules if name == "app" and depth == 0), 0)
+    return {
+        "runs": len(samples),
+        "median_s": round(statistics.median(samples), 3),
+        "min_s": round(samples[0], 3),
+        "max_s": round(samples[-1], 3),
+        "cold_s": round(cold, 3),
+        "import_app_s": round(app_us / 1e6, 3),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+        "modules": len(modules),
+        "packages_ms": package_times(modules),
+        "_imported": imported,
+    }
+
+
+def check(result, forbidden, max_seconds=None, baseline=None, max_ratio=1.3, max_cold_ratio=2.5):
+    """가드 조건을 확인하고 실패 메시지 목록을 반환."""
+    failures = []
+    for name in forbidden:
+        if name in result["_imported"]:
+            failures.append(f"{name} is imported during `import app` (load it on first use instead)")
+    if max_seconds is not None and result["median_s"] > max_seconds:
+        failures.append(f"startup median {result['median_s']}s exceeds {max_seconds}s")
+    if result["cold_s"] > result["median_s"] * max_cold_ratio:
+        failures.append(f"cold start with an empty build dir {result['cold_s']}s is more than {max_cold_ratio}x "
+                        f"the warm median {result['median_s']}s (asset build/precompression on the start path?)")
+    if baseline is not None and result["median_s"] > baseline["median_s"] * max_ratio:
+        failures.append(f"startup median {result['median_s']}s is more than {max_ratio}x "
+                        f"the baseline {baseline['median_s']}s")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure and guard worker cold start (`import app`)")
+    parser.add_argument("--db", default=os.path.join(ROOT_DIR, database.DB_NAME),
+                        help="database to copy for the app import")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="number of packages to list")
+    parser.add_argument("--forbid", default=",".join(DEFAULT_FORBIDDEN),
+                        help="comma separated modules that must not be imported at startup")
+    parser.add_argument("--max-seconds", type=float, help="fail if the median startup time exceeds this")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--max-ratio", type=float, default=1.3, help="allowed slowdown against --compare")
+    parser.add_argument("--max-cold-ratio", type=float, default=2.5,
+                        help="allowed cold start (empty build dir) time as a multiple of the warm median")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="dashboard-startup-")
+    try:
+        db_path = os.path.join(work_dir, "startup.db")
+        shutil.copyfile(args.db, db_path)
+        result = measure_startup(db_path, os.path.join(work_dir, "dist"), args.repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"startup median {result['median_s']:.3f}s (min {result['min_s']:.3f}s, max {result['max_s']:.3f}s, "
+          f"{result['runs']} runs), cold {result['cold_s']:.3f}s, import app {result['import_app_s']:.3f}s, "
+          f"{result['modules']} modules, max RSS {result['max_rss_mb']} MB")
+    for package, ms in result["packages_ms"][:args.top]:
+        print(f"  {package:<28} {ms:>9.1f} ms")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"baseline median {baseline['median_s']:.3f}s -> {result['median_s']:.3f}s "
+              f"({result['median_s'] / baseline['median_s']:.2f}x)")
+
+    forbidden = [name for name in args.forbid.split(",") if name]
+    failures = check(result, forbidden, args.max_seconds, baseline, args.max_ratio, args.max_cold_ratio)
+
+    if args.output:
+        saved = {key: value for key, value in result.items() if not key.startswith("_")}
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(saved, f, ensure_ascii=False, indent=2)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# benchmarks/suite.py
+"""
+합성 DB(benchmarks.synthetic) 위에서 DB 조회, 그래프 생성, 레이아웃 생성/직렬화, Flask 라우트를
+측정하고 결과를 JSON 으로 저장한다. 커밋 사이의 결과를 --compare 로 비교할 수 있다.
+
+    python -m benchmarks.suite --projects 1000 --milestones 20000 --output before.json
+    python -m benchmarks.suite --projects 1000 --milestones 20000 --output after.json --compare before.json
+
+--db 로 기존 DB 파일을 지정하면 생성 없이 그 DB(의 복사본)를 사용한다.
+한 항목이 --max-seconds 를 넘으면 반복을 멈추므로 10k 규모에서도 전체 실행 시간이 제한된다.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import database
+from benchmarks.synthetic import generate_database
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(database.__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _cases(app_module):
+    """(이름, 실행 함수) 목록. 무거운 모듈은 DB 경로를 바꾼 뒤에 불러온다."""
+    from plotly.io.json import to_json_plotly
+
+    import dashboard
+    import graphs
+    import panels
+    from layout_cache import layout_cache
+    from utils import apply_progress
+
+    projects = apply_progress(database.get_projects())
+    milestones = database.get_milestones()
+    client = app_module.app.test_client()
+
+    pages = {page.name: page for page in dashboard.PAGES}
+
+    def layout_build(name):
+        def run():
+            layout_cache.invalidate(name)
+            return pages[name].layout()
+        return run
+
+    def layout_serialize(name):
+        layout = pages[name].layout()
+        return lambda: to_json_plotly(layout)
+
+    def get(url, cold_layout=None):
+        def run():
+            if cold_layout:
+                layout_cache.invalidate(cold_layout)
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+            return response.data
+        return run
+
+    def page_content(name, cold=False):
+        # 브라우저가 페이지를 열 때 dash pages 라우터 콜백으로 페이지 내용을 받는 요청
+        body = {
+            "output": ".._pages_content.children..._pages_store.data..",
+            "outputs": [{"id": "_pages_content", "property": "children"}, {"id": "_pages_store", "property": "data"}],
+            "inputs": [{"id": "_pages_location", "property": "pathname", "value": pages[name].path},
+                       {"id": "_pages_location", "property": "search", "value": ""}],
+            "changedPropIds": ["_pages_location.pathname"],
+            "state": [],
+        }
+
+        def run():
+            if cold:
+                layout_cache.invalidate(name)
+            response = client.post("/_dash-update-component", json=body)
+            assert response.status_code == 200, (name, response.status_code)
+            return response.data
+        return run
+
+    return [
+        ("db.get_projects", database.get_projects),
+        ("db.get_project_names", database.get_project_names),
+        ("db.get_project_schedules", database.get_project_schedules),
+        ("db.get_project_research", database.get_project_research),
+        ("db.get_project_budgets", database.get_project_budgets),
+        ("db.get_project_totals", database.get_project_totals),
+        ("db.get_milestones", database.get_milestones),
+        ("db.get_milestones_in_window", panels.load_milestones),
+        ("utils.apply_progress", lambda: apply_progress([dict(p) for p in projects])),
+        ("graphs.progress", lambda: graphs.create_progress_graph(projects)),
+        ("graphs.research_subplots", lambda: graphs.create_research_figure(projects)),
+        ("graphs.research_per_project", lambda: graphs.create_research_graphs(projects)),
+        ("graphs.budget_gauge", lambda: graphs.create_budget_graph(projects)),
+        ("graphs.budget_bullet", lambda: graphs.create_budget_bullet(projects)),
+        ("graphs.milestone", lambda: graphs.create_milestone_graph(milestones)),
+        ("layout.dashboard.build", layout_build("dashboard")),
+        ("layout.expense.build", layout_build("expense")),
+        ("layout.dashboard.serialize", layout_serialize("dashboard")),
+        ("layout.expense.serialize", layout_serialize("expense")),
+        ("route.update", get("/update")),
+        ("route.milestone", get("/milestone")),
+        ("route.dash_layout", get("/_dash-layout")),
+        ("route.dashboard_layout.cold", page_content("dashboard", cold=True)),
+        ("route.dashboard_layout.cached", page_content("dashboard")),
+        ("route.expense_layout.cold", page_content("expense", cold=True)),
+        ("route.expense_layout.cached", page_content("expense")),
+    ]
+
+
+def _measure(fn, repeat, warmup, max_seconds):
+    for _ in range(warmup):
+        t0 = time.perf_counter()
+        fn()
+        if time.perf_counter() - t0 > max_seconds:
+            break
+    samples = []
+    size = None
+    started = time.perf_counter()
+    while len(samples) < repeat:
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - t0)
+        if isinstance(result, (bytes, str)):
+            size = len(result)
+        if time.perf_counter() - started > max_seconds:
+            break
+    samples.sort()
+    stats = {
+        "runs": len(samples),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "min_ms": round(samples[0] * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3),
+        "p95_ms": round(samples[max(0, int(len(samples) * 0.95) - 1)] * 1000, 3),
+    }
+    if size is not None:
+        stats["bytes"] = size
+    return stats
+
+
+def _compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    print(f"\n{'case':<32} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["median_ms"], stats["median_ms"]
+        ratio = after / before if before else float("inf")
+        print(f"{name:<32} {before:>12.3f} {after:>12.3f} {ratio:>6.2f}x")
+
+
+def run_suite(db_path, repeat=5, warmup=1, max_seconds=30.0, patterns=None):
+    # app 을 불러오기 전에 DB 경로를 바꿔야 레이아웃/라우트가 합성 DB를 사용함
+    database.DB_NAME = db_path
+    os.environ["DASHBOARD_FONT_BUILD"] = "0"  # 합성 데이터의 글자로 서브셋 폰트를 만들지 않음
+    import app as app_module
+
+    results = {}
+    for name, fn in _cases(app_module):
+        if patterns and not any(fnmatch.fnmatch(name, p) for p in patterns):
+            continue
+        results[name] = _measure(fn, repeat, warmup, max_seconds)
+        print(f"{name:<32} {results[name]['median_ms']:>12.3f} ms  ({results[name]['runs']} runs)", flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard benchmark suite on a synthetic database")
+    parser.add_argument("--db", help="use a copy of this database instead of generating one")
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--milestones", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--max-seconds", type=float, default=30.0, help="time budget per case")
+    parser.add_argument("--cases", help="comma separated glob patterns, e.g. 'db.*,graphs.budget_*'")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="dashboard-bench-")
+    db_path = os.path.join(workdir, "bench.db")
+    try:
+        if args.db:
+            shutil.copy(args.db, db_path)
+        else:
+            generate_database(db_path, args.projects, args.milestones, args.seed)
+        patterns = args.cases.split(",") if args.cases else None
+        results = run_suite(db_path, args.repeat, args.warmup, args.max_seconds, patterns)
+    finally:
+        database.close_pool()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "db": args.db,
+            "projects": None if args.db else args.projects,
+            "milestones": None if args.db else args.milestones,
+            "seed": None if args.db else args.seed,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "max_seconds": args.max_seconds,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.compare:
+        _compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
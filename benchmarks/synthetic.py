@@ -0,0 +1,123 @@
+# benchmarks/synthetic.py
+"""
+벤치마크용 대규모 포트폴리오 DB 생성기.
+
+database.py 의 테이블 생성 함수를 그대로 사용하므로 실제 projects.db 와 같은 스키마이며,
+같은 seed 로 만들면 항상 같은 데이터가 나온다.
+
+    python -m benchmarks.synthetic --out /tmp/bench.db --projects 10000 --milestones 200000 [--seed 42]
+"""
+import argparse
+import datetime
+import os
+import random
+import sqlite3
+
+import database
+from migrations import migrate
+
+NAME_PREFIXES = ["차세대", "지능형", "초정밀", "고신뢰", "실시간", "저전력", "자율형", "융합형", "대규모", "분산형",
+                 "친환경", "초연결", "경량", "스마트", "디지털"]
+NAME_TOPICS = ["인공지능", "블록체인", "산불 감시", "홍수 예측", "산사태 탐지", "군중 밀집 분석", "블랙아이스 탐지",
+               "위성 영상", "협동 로봇", "자율주행", "디지털트윈", "스마트팜", "수자원 관리", "미세먼지 저감",
+               "양자 암호", "의료 영상", "배터리 진단", "해양 관측", "교통 신호 제어", "재난 대응"]
+NAME_SUFFIXES = ["플랫폼 개발", "핵심기술 연구", "실증 사업", "고도화", "기반 구축", "원천기술 개발",
+                 "시스템 구현", "표준화 연구"]
+SURNAMES = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임", "한", "오", "서", "신", "권"]
+GIVEN_NAME_SYLLABLES = ["민", "서", "지", "현", "준", "우", "연", "수", "영", "도", "하", "윤", "재", "성", "진",
+                        "혜", "경", "승", "태", "은"]
+MILESTONE_TASKS = ["요구사항 분석", "아키텍처 설계", "데이터 수집", "프로토타입 구현", "중간 평가", "성능 검증",
+                   "현장 실증", "논문 투고", "특허 출원", "최종 보고"]
+MILESTONE_STATUSES = ["달성", "미달성"]
+
+PERIOD_START = datetime.date(2022, 1, 1)
+PERIOD_DAYS = 365 * 5
+
+
+def _person(rng):
+    return rng.choice(SURNAMES) + "".join(rng.choice(GIVEN_NAME_SYLLABLES) for _ in range(2))
+
+
+def _project_names(rng, count):
+    names = []
+    seen = {}
+    for _ in range(count):
+        base = f"{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_TOPICS)} {rng.choice(NAME_SUFFIXES)}"
+        # 조합이 겹치면 실제 과제처럼 "2차", "3차" ... 를 붙임
+        seen[base] = seen.get(base, 0) + 1
+        names.append(base if seen[base] == 1 else f"{base} {seen[base]}차")
+    return names
+
+
+def _project_rows(rng, names):
+    for name in names:
+        start = PERIOD_START + datetime.timedelta(days=rng.randrange(PERIOD_DAYS))
+        end = start + datetime.timedelta(days=rng.randint(90, 1460))
+        total_cost = round(rng.uniform(0.5, 300), 2)
+        current_expenditure = round(total_cost * rng.uniform(0, 1.1), 2)
+        goals = [rng.randint(0, 10), rng.randint(0, 6), rng.randint(0, 4), rng.randint(0, 3)]
+        research = []
+        for goal in goals:
+            research += [goal, rng.randint(0, goal + 2)]
+        yield (name, _person(rng), start.isoformat(), end.isoformat(), total_cost, current_expenditure, *research)
+
+
+def _milestone_rows(rng, names, count):
+    for _ in range(count):
+        start = PERIOD_START + datetime.timedelta(days=rng.randrange(PERIOD_DAYS))
+        finish = start + datetime.timedelta(days=rng.randint(7, 120))
+        yield (rng.choice(names), start.isoformat(), finish.isoformat(), rng.choice(MILESTONE_STATUSES),
+               rng.choice(MILESTONE_TASKS), _person(rng))
+
+
+def generate_database(path, projects=10000, milestones=200000, seed=42):
+    """path 에 projects/milestones 개수만큼의 합성 데이터를 가진 DB를 새로 만든다."""
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    rng = random.Random(seed)
+    names = _project_names(rng, projects)
+
+    original_db = database.DB_NAME
+    database.DB_NAME = path
+    try:
+        database.create_database()
+        database.create_milestones_table()
+        migrate(path)
+    finally:
+        database.DB_NAME = original_db
+        database.close_pool()
+
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            conn.executemany('''
+                INSERT INTO projects
+                (name, manager, start_date, end_date, total_cost, current_expenditure,
+                 goal_papers, current_papers, goal_patents_filed, current_patents_filed,
+                 goal_patents_registered, current_patents_registered, goal_software, current_software)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', _project_rows(rng, names))
+            conn.executemany('''
+                INSERT INTO milestones (Milestone, Start, Finish, Status, "세부 목표", 담당자)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', _milestone_rows(rng, names or ["-"], milestones))
+    finally:
+        conn.close()
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic projects.db for benchmarks")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--milestones", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    generate_database(args.out, args.projects, args.milestones, args.seed)
+    print(f"Wrote {args.projects} projects and {args.milestones} milestones to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
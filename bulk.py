@@ -0,0 +1,417 @@
+# bulk.py
+"""
+연구과제/마일스톤 일괄 가져오기·내보내기 (CSV, XLSX, NDJSON).
+
+- 가져오기: 파일을 한 행씩 읽으며 검증하고, database.bulk_upsert 로 배치 단위 executemany upsert.
+  id 컬럼이 있는 행은 해당 id 를 덮어쓰고, 비어 있으면 새로 추가한다.
+  전체가 하나의 트랜잭션이며, 기본(strict)은 잘못된 행이 하나라도 있으면 아무것도 쓰지 않는다.
+  --skip-invalid 면 잘못된 행만 건너뛴다.
+- 내보내기: database.iter_table 로 나누어 읽으며 바로 내보내므로 전체 테이블을 메모리에 올리지 않는다.
+  컬럼 이름은 DB 컬럼 그대로라서 내보낸 파일을 수정해 다시 가져올 수 있다.
+
+XLSX 는 openpyxl 이 설치된 경우에만 지원한다.
+
+    python bulk.py import projects 2025Q3.csv [--skip-invalid]
+    python bulk.py export milestones milestones.ndjson
+"""
+import argparse
+import codecs
+import csv
+import datetime
+import io
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import zipfile
+import zlib
+
+from database import TABLE_FIELDS, bulk_upsert, iter_table
+
+try:
+    import openpyxl
+except ImportError:  # openpyxl 이 없으면 XLSX 가져오기/내보내기를 끈다
+    openpyxl = None
+
+FORMATS = ("csv", "xlsx", "ndjson")
+MIMETYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+MAX_REPORTED_ERRORS = 100   # 보고서에 담는 오류 행 수 (전체 개수는 invalid 로 셈)
+EXPORT_CHUNK_ROWS = 1000    # CSV/NDJSON 내보내기에서 한 번에 보내는 행 수
+MILESTONE_STATUSES = ("달성", "미달성")
+# 2025-03-01, 2025/03/01, 2025.03.01, 2025.3.1 등 (뒤의 시각은 무시)
+DATE_PATTERN = re.compile(r"(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})\.?(?:[ T].*)?")
+
+
+class BulkImportError(ValueError):
+    """가져오기 실패 (파일 형식 오류, strict 모드에서 잘못된 행). report 에 상세 내용."""
+
+    def __init__(self, message, report=None):
+        super().__init__(message)
+        self.report = report or {"error": message}
+
+
+# --- 값 변환 -------------------------------------------------------------------------
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _text(value):
+    if _blank(value):
+        raise ValueError("required")
+    return str(value).strip()
+
+
+def _optional_text(value):
+    return "" if _blank(value) else str(value).strip()
+
+
+def _date(value):
+    if _blank(value):
+        raise ValueError("required")
+    if isinstance(value, (datetime.date, datetime.datetime)):  # XLSX 날짜 셀
+        return value.isoformat()[:10]
+    value = str(value).strip()
+    if len(value) == 10:
+        try:  # 대부분의 파일(내보내기 결과 포함)은 ISO 형식
+            return datetime.date.fromisoformat(value).isoformat()
+        except ValueError:
+            pass
+    match = DATE_PATTERN.fullmatch(value)
+    if not match:
+        raise ValueError(f"invalid date {value!r}")
+    return datetime.date(*map(int, match.groups())).isoformat()
+
+
+def _float(value):
+    """숫자 또는 숫자 문자열("1,200" 허용) -> float. inf/nan 이나 float 범위를 넘는 값("1e400")은 ValueError."""
+    number = float(value) if isinstance(value, (int, float)) else float(str(value).replace(",", "").strip())
+    if not math.isfinite(number):
+        raise ValueError(f"not a finite number {value!r}")
+    return number
+
+
+def _number(value):
+    if _blank(value):
+        raise ValueError("required")
+    return _float(value)
+
+
+def _count(value):
+    if _blank(value):
+        return 0
+    number = _float(value)
+    if number < 0 or number != int(number):
+        raise ValueError(f"invalid count {value!r}")
+    return int(number)
+
+
+def _id(value):
+    if _blank(value):
+        return None
+    number = float(value) if not isinstance(value, str) else float(value.strip())
+    if not math.isfinite(number) or number <= 0 or number != int(number):
+        raise ValueError(f"invalid id {value!r}")
+    return int(number)
+
+
+def _status(value):
+    status = _text(value)
+    if status not in MILESTONE_STATUSES:
+        raise ValueError(f"must be one of {', '.join(MILESTONE_STATUSES)}")
+    return status
+
+
+# 테이블 -> {컬럼: 변환 함수}. 변환 함수는 잘못된 값이면 ValueError.
+FIELD_PARSERS = {
+    "projects": {
+        "id": _id,
+        "name": _text,
+        "manager": _text,
+        "start_date": _date,
+        "end_date": _date,
+        "total_cost": _number,
+        "current_expenditure": _number,
+        "goal_papers": _count,
+        "current_papers": _count,
+        "goal_patents_filed": _count,
+        "current_patents_filed": _count,
+        "goal_patents_registered": _count,
+        "current_patents_registered": _count,
+        "goal_software": _count,
+        "current_software": _count,
+    },
+    "milestones": {
+        "id": _id,
+        "Milestone": _text,
+        "Start": _date,
+        "Finish": _date,
+        "Status": _status,
+        "세부 목표": _optional_text,
+        "담당자": _optional_text,
+    },
+}
+# 행 전체 검사: (시작 컬럼, 끝 컬럼)
+DATE_ORDER = {"projects": ("start_date", "end_date"), "milestones": ("Start", "Finish")}
+# 파일에 반드시 있어야 하는 컬럼
+REQUIRED_COLUMNS = {
+    "projects": {"name", "manager", "start_date", "end_date", "total_cost", "current_expenditure"},
+    "milestones": {"Milestone", "Start", "Finish", "Status"},
+}
+
+
+def parse_row(table, raw):
+    """dict 한 행을 TABLE_FIELDS 순서의 튜플로 변환. 잘못된 값이면 ValueError."""
+    parsers = FIELD_PARSERS[table]
+    values = {}
+    problems = []
+    for field in TABLE_FIELDS[table]:
+        try:
+            values[field] = parsers[field](raw.get(field))
+        except (ValueError, TypeError, OverflowError) as e:
+            problems.append(f"{field}: {e}")
+    if problems:
+        raise ValueError("; ".join(problems))
+    start, end = DATE_ORDER[table]
+    if values[end] < values[start]:
+        raise ValueError(f"{end} is before {start}")
+    return tuple(values[field] for field in TABLE_FIELDS[table])
+
+
+# --- 읽기 ---------------------------------------------------------------------------
+
+def detect_format(filename, default=None):
+    ext = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    ext = {"jsonl": "ndjson", "json": "ndjson"}.get(ext, ext)
+    return ext if ext in FORMATS else default
+
+
+def _clean_header(name):
+    return str(name).strip().lstrip("﻿") if name is not None else ""
+
+
+# 깨진/잘린 XLSX 를 열거나 읽을 때 openpyxl(zipfile, XML 파서)이 내는 예외
+# (ElementTree 의 ParseError 는 SyntaxError 의 하위 클래스)
+XLSX_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError, KeyError, ValueError, SyntaxError)
+if openpyxl is not None:
+    from openpyxl.utils.exceptions import InvalidFileException
+    XLSX_ERRORS += (InvalidFileException,)
+
+
+def _decoded_lines(stream):
+    """바이너리 스트림 -> 텍스트 줄 (UTF-8, BOM 허용). UTF-8 이 아니면 줄 번호와 함께 BulkImportError."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    number = 0
+    try:
+        for number, line in enumerate(stream, start=1):
+            text = decoder.decode(line)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)  # 파일 끝에서 잘린 멀티바이트 문자
+    except UnicodeDecodeError as e:
+        raise BulkImportError(f"line {max(number, 1)}: not valid UTF-8 ({e.reason}); "
+                              f"save the file as UTF-8 (e.g. Excel 'CSV UTF-8'), not CP949/EUC-KR") from None
+    if tail:
+        yield tail
+
+
+def _read_xlsx(stream):
+    """XLSX 첫 시트의 (행 번호, 값 튜플). 파일이 깨졌으면 BulkImportError."""
+    try:
+        workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+    except XLSX_ERRORS as e:
+        raise BulkImportError(f"not a valid XLSX file: {e}") from None
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        number = 0
+        while True:
+            # 읽기 전용 모드는 시트를 읽어 가면서 압축을 풀기 때문에 잘린 파일은 중간에 실패할 수 있음
+            try:
+                values = next(rows, None)
+            except XLSX_ERRORS as e:
+                raise BulkImportError(f"row {number + 1}: cannot read XLSX file: {e}") from None
+            if values is None:
+                return
+            number += 1
+            yield number, values
+    finally:
+        workbook.close()
+
+
+def read_rows(stream, fmt):
+    """
+    바이너리 스트림에서 (행 번호, dict) 를 하나씩 읽는다.
+    행을 해석할 수 없으면 dict 대신 오류 메시지(str)를 낸다.
+    파일 자체를 읽을 수 없으면(UTF-8 이 아님, 깨진 CSV/XLSX) BulkImportError.
+    """
+    if fmt == "csv":
+        reader = csv.reader(_decoded_lines(stream))
+        try:
+            header = [_clean_header(h) for h in next(reader, [])]
+            for values in reader:
+                if any(v.strip() for v in values):
+                    yield reader.line_num, dict(zip(header, values))
+        except csv.Error as e:
+            raise BulkImportError(f"line {reader.line_num}: invalid CSV: {e}") from None
+    elif fmt == "ndjson":
+        for number, line in enumerate(_decoded_lines(stream), start=1):
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, f"invalid JSON: {e.msg}"
+                continue
+            yield number, obj if isinstance(obj, dict) else "expected a JSON object"
+    elif fmt == "xlsx":
+        if openpyxl is None:
+            raise BulkImportError("XLSX requires openpyxl (pip install openpyxl)")
+        rows = _read_xlsx(stream)
+        first = next(rows, None)
+        header = [_clean_header(h) for h in first[1]] if first else []
+        for number, values in rows:
+            if any(not _blank(v) for v in values):
+                yield number, dict(zip(header, values))
+    else:
+        raise BulkImportError(f"unsupported format {fmt!r} (use one of {', '.join(FORMATS)})")
+
+
+# --- 가져오기 -------------------------------------------------------------------------
+
+def import_file(table, stream, fmt, skip_invalid=False):
+    """
+    stream(바이너리)의 행을 검증해서 table 에 upsert 하고 보고서(dict)를 반환.
+    strict(skip_invalid=False)에서 잘못된 행이 있으면 아무것도 쓰지 않고 BulkImportError.
+    """
+    if table not in TABLE_FIELDS:
+        raise BulkImportError(f"unknown table {table!r}")
+    report = {"table": table, "format": fmt, "rows": 0, "inserted": 0, "updated": 0,
+              "invalid": 0, "errors": [], "ignored_columns": []}
+
+    def validated():
+        checked_header = False
+        for number, raw in read_rows(stream, fmt):
+            report["rows"] += 1
+            if isinstance(raw, dict) and not checked_header:
+                checked_header = True
+                missing = REQUIRED_COLUMNS[table] - set(raw)
+                if missing:
+                    raise BulkImportError(f"missing columns: {', '.join(sorted(missing))}")
+                report["ignored_columns"] = sorted(set(raw) - set(TABLE_FIELDS[table]))
+            try:
+                if not isinstance(raw, dict):
+                    raise ValueError(raw)
+                row = parse_row(table, raw)
+            except ValueError as e:
+                report["invalid"] += 1
+                if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                    report["errors"].append({"row": number, "error": str(e)})
+                continue
+            # strict 에서 오류가 나온 뒤에는 어차피 롤백되므로 검증만 계속함
+            if skip_invalid or not report["invalid"]:
+                yield row
+        if report["invalid"] and not skip_invalid:
+            # bulk_upsert 의 트랜잭션 안에서 발생 -> 이미 쓴 배치도 롤백
+            raise BulkImportError(f"{report['invalid']} invalid rows; nothing was imported", report)
+
+    try:
+        report["inserted"], report["updated"] = bulk_upsert(table, validated())
+    except BulkImportError as e:
+        if e.report is not report:
+            e.report = dict(report, error=str(e))
+        raise
+    return report
+
+
+# --- 내보내기 -------------------------------------------------------------------------
+
+def export_chunks(table, fmt):
+    """CSV / NDJSON 내보내기를 bytes 조각으로 내보내는 제너레이터 (스트리밍 응답용)."""
+    fields = TABLE_FIELDS[table]
+    buffer = io.StringIO()
+    if fmt == "csv":
+        writer = csv.writer(buffer, lineterminator="\n")
+        buffer.write("﻿")  # 엑셀에서 한글이 깨지지 않도록 BOM
+        writer.writerow(fields)
+    elif fmt != "ndjson":
+        raise ValueError(f"streaming export supports csv and ndjson, not {fmt!r}")
+
+    pending = 0
+    for row in iter_table(table):
+        if fmt == "csv":
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(dict(zip(fields, row)), ensure_ascii=False))
+            buffer.write("\n")
+        pending += 1
+        if pending >= EXPORT_CHUNK_ROWS:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def export_xlsx(table, path):
+    """write-only 워크북으로 행을 바로 기록 (셀 객체를 메모리에 쌓지 않음)."""
+    if openpyxl is None:
+        raise BulkImportError("XLSX requires openpyxl (pip install openpyxl)")
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(table)
+    sheet.append(TABLE_FIELDS[table])
+    for row in iter_table(table):
+        sheet.append(list(row))
+    workbook.save(path)
+    return path
+
+
+def export_xlsx_tempfile(table):
+    handle, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(handle)
+    return export_xlsx(table, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import/export projects and milestones")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import")
+    imp.add_argument("table", choices=sorted(TABLE_FIELDS))
+    imp.add_argument("path")
+    imp.add_argument("--format", choices=FORMATS)
+    imp.add_argument("--skip-invalid", action="store_true")
+    exp = sub.add_parser("export")
+    exp.add_argument("table", choices=sorted(TABLE_FIELDS))
+    exp.add_argument("path", help="output file, or - for stdout (csv/ndjson)")
+    exp.add_argument("--format", choices=FORMATS)
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path, "csv")
+    if args.command == "import":
+        with open(args.path, "rb") as f:
+            try:
+                report = import_file(args.table, f, fmt, args.skip_invalid)
+            except BulkImportError as e:
+                print(json.dumps(e.report, ensure_ascii=False, indent=2))
+                raise SystemExit(1)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    elif fmt == "xlsx":
+        export_xlsx(args.table, args.path)
+    else:
+        out = sys.stdout.buffer if args.path == "-" else open(args.path, "wb")
+        try:
+            for chunk in export_chunks(args.table, fmt):
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+
+
+if __name__ == "__main__":
+    main()
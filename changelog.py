@@ -0,0 +1,258 @@
+# changelog.py
+"""
+연구과제/마일스톤 변경 이력으로 특정 시점 복구 / 수정 하나 되돌리기.
+
+- migrations.py(버전 5)의 트리거가 모든 추가·수정·삭제 후의 행을 change_log 에 남긴다.
+- change_checkpoint 는 테이블 전체 상태의 스냅샷이다. 어떤 시점의 상태는
+  그 이전의 가장 최근 체크포인트 + 그 뒤의 로그로 만들므로, 복구 시간은 전체 이력이 아니라
+  마지막 체크포인트 이후의 로그 양에 비례한다.
+- compact() 는 필요하면 새 체크포인트를 만들고, 보관 기간(LOG_RETENTION_DAYS)보다 오래된
+  로그와 체크포인트를 지운다 (보관 기간 시작 시점으로는 계속 복구할 수 있음).
+  backupdb 의 매일 백업 작업에서 함께 실행되며, 그보다 오래된 시점은 백업 파일로 복구한다.
+- 복구/되돌리기도 일반 쓰기처럼 기록되므로 다시 되돌릴 수 있다.
+
+    python changelog.py log [--table projects] [--id 12] [--limit 50]
+    python changelog.py restore --at "2025-03-01 14:00" [--table projects] [--dry-run]
+    python changelog.py undo 1234 [--force]
+    python changelog.py compact [--days 30]
+"""
+import argparse
+import datetime
+import json
+import time
+
+import database
+
+LOG_RETENTION_DAYS = 30
+CHECKPOINT_MIN_ENTRIES = 10000      # 마지막 체크포인트 이후 로그가 이만큼 쌓이면 새 체크포인트
+CHECKPOINT_MAX_AGE_DAYS = 7         # 또는 마지막 체크포인트가 이보다 오래되었고 변경이 있으면
+
+# 트리거와 체크포인트에서 쓰는 현재 시각 (UTC unix 초, 밀리초 단위까지)
+NOW_SQL = "((julianday('now') - 2440587.5) * 86400.0)"
+OPS = {"I": "insert", "U": "update", "D": "delete"}
+
+
+class ChangeLogError(Exception):
+    pass
+
+
+def _columns(table):
+    return ", ".join(f'"{f}"' for f in database.TABLE_FIELDS[table])
+
+
+def write_checkpoint(conn, table):
+    """현재 table 전체를 체크포인트로 저장 (호출한 쪽의 트랜잭션 안에서)."""
+    conn.execute(f"""
+        INSERT INTO change_checkpoint (taken_at, upto_seq, tbl, data)
+        SELECT {NOW_SQL}, (SELECT COALESCE(MAX(seq), 0) FROM change_log), ?,
+               (SELECT json_group_array(json_array({_columns(table)})) FROM {table})
+    """, (table,))
+
+
+def _base_checkpoint(conn, table, timestamp):
+    row = conn.execute("""
+        SELECT upto_seq, data FROM change_checkpoint
+        WHERE tbl = ? AND taken_at <= ? ORDER BY id DESC LIMIT 1
+    """, (table, timestamp)).fetchone()
+    if row is None:
+        first = conn.execute("SELECT MIN(taken_at) FROM change_checkpoint WHERE tbl = ?", (table,)).fetchone()[0]
+        since = _format_time(first) if first is not None else "never"
+        raise ChangeLogError(f"{table}: no history before {_format_time(timestamp)} (history starts {since}); "
+                             "use a backup from backupdb.py instead")
+    return row
+
+
+def state_at(conn, table, timestamp):
+    """timestamp(UTC unix 초) 시점의 table 상태: {id: 행 튜플}."""
+    upto_seq, data = _base_checkpoint(conn, table, timestamp)
+    rows = {row[0]: tuple(row) for row in json.loads(data)}
+    for row_id, op, data in conn.execute("""
+        SELECT row_id, op, data FROM change_log
+        WHERE tbl = ? AND seq > ? AND changed_at <= ? ORDER BY seq
+    """, (table, upto_seq, timestamp)):
+        if op == "D":
+            rows.pop(row_id, None)
+        else:
+            rows[row_id] = tuple(json.loads(data))
+    return rows
+
+
+def _diff(conn, table, target):
+    """현재 상태를 target 으로 만들기 위한 (upsert 할 행, 삭제할 id)."""
+    current = {row[0]: tuple(row) for row in conn.execute(f"SELECT {_columns(table)} FROM {table}")}
+    upserts = [row for row_id, row in sorted(target.items()) if current.get(row_id) != row]
+    deletes = sorted(row_id for row_id in current if row_id not in target)
+    return upserts, deletes
+
+
+def restore(timestamp, tables=None, dry_run=False):
+    """
+    tables(기본: 전부)를 timestamp 시점의 상태로 되돌린다. 달라진 행만 쓴다.
+    {table: (바꾸는 행 수, 지우는 행 수)} 반환.
+    """
+    tables = tables or list(database.TABLE_FIELDS)
+    with database.pooled_connection() as conn:
+        # 상태 계산과 현재 값 비교를 같은 읽기 시점에서
+        with conn:
+            conn.execute("BEGIN")
+            changes = {table: _diff(conn, table, state_at(conn, table, timestamp)) for table in tables}
+    if not dry_run:
+        database.apply_changes(changes)
+    return {table: (len(upserts), len(deletes)) for table, (upserts, deletes) in changes.items()}
+
+
+def _row_before(conn, table, row_id, seq):
+    """seq 번 변경 직전의 행 (없던 행이면 None)."""
+    previous = conn.execute("""
+        SELECT op, data FROM change_log WHERE tbl = ? AND row_id = ? AND seq < ?
+        ORDER BY seq DESC LIMIT 1
+    """, (table, row_id, seq)).fetchone()
+    if previous is not None:
+        return None if previous[0] == "D" else tuple(json.loads(previous[1]))
+    checkpoint = conn.execute("""
+        SELECT id FROM change_checkpoint WHERE tbl = ? AND upto_seq < ? ORDER BY upto_seq DESC, id DESC LIMIT 1
+    """, (table, seq)).fetchone()
+    if checkpoint is None:
+        raise ChangeLogError(f"change {seq} is older than the kept history")
+    row = conn.execute("""
+        SELECT value FROM change_checkpoint, json_each(change_checkpoint.data)
+        WHERE change_checkpoint.id = ? AND json_extract(value, '$[0]') = ?
+    """, (checkpoint[0], row_id)).fetchone()
+    return tuple(json.loads(row[0])) if row is not None else None
+
+
+def undo(seq, force=False):
+    """
+    seq 번 변경 하나를 되돌린다 (그 변경 직전의 행으로).
+    그 뒤에 같은 행이 다시 바뀌었으면 force=True 일 때만 되돌린다 (이후 변경도 함께 사라짐).
+    """
+    with database.pooled_connection() as conn:
+        entry = conn.execute("SELECT tbl, row_id FROM change_log WHERE seq = ?", (seq,)).fetchone()
+        if entry is None:
+            raise ChangeLogError(f"change {seq} not found")
+        table, row_id = entry
+        later = conn.execute("SELECT COUNT(*) FROM change_log WHERE tbl = ? AND row_id = ? AND seq > ?",
+                             (table, row_id, seq)).fetchone()[0]
+        if later and not force:
+            raise ChangeLogError(f"{table} #{row_id} was changed {later} more time(s) after change {seq}; "
+                                 "use force to overwrite those changes too")
+        previous = _row_before(conn, table, row_id, seq)
+    if previous is None:
+        database.apply_changes({table: ([], [row_id])})
+    else:
+        database.apply_changes({table: ([previous], [])})
+    return table, row_id, previous
+
+
+def compact(retention_days=LOG_RETENTION_DAYS, now=None):
+    """
+    필요하면 새 체크포인트를 만들고 보관 기간이 지난 로그/체크포인트를 지운다.
+    {"checkpoints": 새로 만든 수, "log_deleted": 지운 로그 수, "checkpoints_deleted": 지운 체크포인트 수}
+    """
+    now = now or time.time()
+    cutoff = now - retention_days * 86400
+    stats = {"checkpoints": 0, "log_deleted": 0, "checkpoints_deleted": 0}
+    # 데이터 자체는 바뀌지 않으므로 transaction() 대신 (데이터 버전을 올리지 않음)
+    with database.pooled_connection() as conn:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for table in database.TABLE_FIELDS:
+                last = conn.execute("""
+                    SELECT upto_seq, taken_at FROM change_checkpoint WHERE tbl = ? ORDER BY id DESC LIMIT 1
+                """, (table,)).fetchone()
+                upto_seq, taken_at = last if last is not None else (0, 0.0)
+                pending = conn.execute("SELECT COUNT(*) FROM change_log WHERE tbl = ? AND seq > ?",
+                                       (table, upto_seq)).fetchone()[0]
+                if last is None or pending >= CHECKPOINT_MIN_ENTRIES or (
+                        pending and now - taken_at >= CHECKPOINT_MAX_AGE_DAYS * 86400):
+                    write_checkpoint(conn, table)
+                    stats["checkpoints"] += 1
+
+                # 보관 기간 시작 시점을 복구할 수 있도록 그 이전의 가장 최근 체크포인트는 남김
+                base = conn.execute("""
+                    SELECT id, upto_seq FROM change_checkpoint WHERE tbl = ? AND taken_at <= ?
+                    ORDER BY id DESC LIMIT 1
+                """, (table, cutoff)).fetchone()
+                if base is None:
+                    continue
+                stats["checkpoints_deleted"] += conn.execute(
+                    "DELETE FROM change_checkpoint WHERE tbl = ? AND id < ?", (table, base[0])).rowcount
+                stats["log_deleted"] += conn.execute(
+                    "DELETE FROM change_log WHERE tbl = ? AND seq <= ?", (table, base[1])).rowcount
+    return stats
+
+
+def history(table=None, row_id=None, limit=50):
+    """최근 변경 목록 (최신순): [{"seq", "changed_at", "table", "id", "op", "row"}]"""
+    conditions, params = [], []
+    if table:
+        conditions.append("tbl = ?")
+        params.append(table)
+    if row_id is not None:
+        conditions.append("row_id = ?")
+        params.append(row_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    with database.pooled_connection() as conn:
+        rows = conn.execute(f"""
+            SELECT seq, changed_at, tbl, row_id, op, data FROM change_log {where}
+            ORDER BY seq DESC LIMIT ?
+        """, params + [limit]).fetchall()
+    return [{"seq": seq, "changed_at": changed_at, "table": tbl, "id": rid, "op": OPS[op],
+             "row": dict(zip(database.TABLE_FIELDS[tbl], json.loads(data))) if data else None}
+            for seq, changed_at, tbl, rid, op, data in rows]
+
+
+def _format_time(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def parse_time(value):
+    """'2025-03-01 14:00' 등 (로컬 시각) -> UTC unix 초."""
+    try:
+        return datetime.datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ChangeLogError(f"invalid time {value!r}, use YYYY-MM-DD[ HH:MM[:SS]]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Change history, point-in-time restore and undo")
+    parser.add_argument("--db", default=database.DB_NAME)
+    sub = parser.add_subparsers(dest="command", required=True)
+    log = sub.add_parser("log")
+    log.add_argument("--table", choices=sorted(database.TABLE_FIELDS))
+    log.add_argument("--id", type=int)
+    log.add_argument("--limit", type=int, default=50)
+    rst = sub.add_parser("restore")
+    rst.add_argument("--at", required=True, help="local time, e.g. '2025-03-01 14:00'")
+    rst.add_argument("--table", action="append", choices=sorted(database.TABLE_FIELDS))
+    rst.add_argument("--dry-run", action="store_true")
+    und = sub.add_parser("undo")
+    und.add_argument("seq", type=int)
+    und.add_argument("--force", action="store_true")
+    cmp_ = sub.add_parser("compact")
+    cmp_.add_argument("--days", type=int, default=LOG_RETENTION_DAYS)
+    args = parser.parse_args()
+    database.DB_NAME = args.db
+
+    try:
+        if args.command == "log":
+            for entry in reversed(history(args.table, args.id, args.limit)):
+                row = json.dumps(entry["row"], ensure_ascii=False) if entry["row"] else ""
+                print(f"{entry['seq']:>8}  {_format_time(entry['changed_at'])}  {entry['op']:<6} "
+                      f"{entry['table']} #{entry['id']}  {row}")
+        elif args.command == "restore":
+            result = restore(parse_time(args.at), args.table, args.dry_run)
+            for table, (changed, deleted) in result.items():
+                print(f"{table}: {changed} rows restored, {deleted} rows deleted"
+                      + (" (dry run)" if args.dry_run else ""))
+        elif args.command == "undo":
+            table, row_id, previous = undo(args.seq, args.force)
+            print(f"{table} #{row_id}: " + ("deleted" if previous is None else "restored to previous values"))
+        else:
+            print(compact(args.days))
+    except ChangeLogError as e:
+        raise SystemExit(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,288 +1,247 @@
-import os
-from datetime import datetime
 import dash
-from dash import dcc, html
-import plotly.graph_objs as go
-from utils import get_status_color, calculate_progress
-from database import get_projects, get_milestones, DB_NAME
-from graphs import create_progress_graph, create_budget_graph, create_research_graphs, create_milestone_graph
+from dash import html
+from flask import request
+from panels import (PanelData, build_panels, budget_panel_name, register_budget_rotation, register_milestone_pan,
+                    research_panel_name)
+from live_refresh import EVENT_ID, LAST_UPDATE_ID, last_update_text, live_components, register_live_refresh
+from events import events_client_script
+from layout_cache import cached_layout
+from fonts import font_stylesheet_urls, register_stylesheets
 
-def init_dashboard(flask_app):
-    external_stylesheets = [
-        '/static/font/pretendard.css',
-        '/static/font/pretendard-subset.css'
-    ]
+FONT_FAMILY = "'Pretendard', sans-serif"
 
-    dash_app = dash.Dash(
-        __name__,
-        server=flask_app,
-        routes_pathname_prefix='/dashboard/',
-        external_stylesheets=external_stylesheets
+
+class Page:
+    """
+    대시보드 페이지. 모든 페이지는 같은 골격(KPI 카드, 진행률/정량 성과지표)을 쓰고
+    하단 영역(bottom_title, bottom_panel)만 다르다.
+    bottom_panel(budget_mode) 는 하단 패널 이름, register(dash_app) 는 그 패널의 콜백 등록 함수.
+    """
+
+    def __init__(self, name, path, bottom_title, bottom_panel, bottom_style=None, register=None):
+        self.name = name
+        self.path = path
+        self.bottom_title = bottom_title
+        self.bottom_panel = bottom_panel
+        self.bottom_style = bottom_style or {}
+        self.register = register
+        self.layout = None  # init_dashboard 에서 캐시된 레이아웃 함수로 설정
+
+    def panel_names(self, research_mode="per_project", budget_mode="auto"):
+        # 이 페이지에 표시되는 패널 (panels.PANELS 에 등록된 이름)
+        return ["kpi", "progress", research_panel_name(research_mode), self.bottom_panel(budget_mode)]
+
+
+# 페이지 목록. 여기에 추가하면 라우트, 레이아웃 캐시, 스냅샷(/snapshot/<이름>)이 함께 생긴다
+PAGES = [
+    Page("dashboard", "/dashboard/", "연구과제 마일스톤", lambda budget_mode: "milestone",
+         bottom_style={"height": "1080px"}, register=register_milestone_pan),
+    Page("expense", "/expense/", "연구과제비 사용 현황 (단위: 억원)", budget_panel_name,
+         register=register_budget_rotation),
+]
+
+INDEX_STRING = '''
+<!DOCTYPE html>
+<html>
+    <head>
+        {%metas%}
+        <title>{%title%}</title>
+        {%favicon%}
+        {%css%}
+        <style>
+            body {
+                background-color: #1E1E2E;
+            }
+        </style>
+    </head>
+    <body>
+        {%app_entry%}
+        <footer>
+            {%config%}
+            {%scripts%}
+            {%renderer%}
+        </footer>
+    </body>
+</html>
+'''
+
+
+def _section_title(text):
+    return html.P(
+        text,
+        style={
+            "textAlign": "left",
+            "fontFamily": FONT_FAMILY,
+            "fontSize": "40px",
+            "color": "white",
+            "marginBottom": "10px",
+            "marginTop": "0px",
+            "fontWeight": "bold",      # 볼드체 적용
+            "paddingLeft": "25px"
+        }
     )
-    
-    dash_app.index_string = '''
-    <!DOCTYPE html>
-    <html>
-        <head>
-            {%metas%}
-            <title>{%title%}</title>
-            {%favicon%}
-            {%css%}
-            <style>
-                body {
-                    background-color: #1E1E2E;
+
+
+def _card(children, **style):
+    return html.Div(
+        children=children,
+        style={
+            "backgroundColor": "#2E2E3E",
+            "padding": "15px",
+            "borderRadius": "30px",
+            # "boxShadow": "2px 2px 8px rgba(0,0,0,0.5)",
+            "textAlign": "center",
+            "fontFamily": FONT_FAMILY,
+            **style
+        }
+    )
+
+
+def page_frame(content):
+    """모든 페이지 공통 골격: DB 최종 수정 날짜, 제목 아래에 content (Dash 에서는 page_container)."""
+    return html.Div(
+        style={
+            "backgroundColor": "#1E1E2E",
+            "color": "white",
+            "padding": "20px",
+            "position": "relative",
+            "fontFamily": FONT_FAMILY
+        },
+        children=[
+            # 우측 상단에 DB 최종 수정 날짜 표시
+            html.Div(
+                last_update_text(),
+                id=LAST_UPDATE_ID,
+                style={
+                    "position": "absolute",
+                    "top": "10px",
+                    "right": "20px",
+                    "fontSize": "12px",
+                    "color": "white",
+                    "fontFamily": FONT_FAMILY
+                }
+            ),
+            html.H1(
+                "재난안전융합연구센터 연구과제 대시보드",
+                style={
+                    "textAlign": "center",
+                    "fontSize": "60px",
+                    "marginTop": "40px",
+                    "fontFamily": FONT_FAMILY
                 }
-            </style>
-        </head>
-        <body>
-            {%app_entry%}
-            <footer>
-                {%config%}
-                {%scripts%}
-                {%renderer%}
-            </footer>
-        </body>
-    </html>
-    '''
+            ),
+            content
+        ]
+    )
+
+
+def page_content(page, panel_names, live=False, live_refresh=0):
+    """page 의 내용 (KPI, 진행률/정량 성과지표, 하단 패널). 필요한 데이터만 DB에서 불러온다."""
+    data = PanelData()
+    panels = build_panels(panel_names, data)
+    kpi, progress, research, bottom = panel_names
 
-    def serve_layout():
-        # DB에서 최신 데이터를 불러오고 진행률 계산
-        projects = get_projects()
-        for project in projects:
-            project["progress"] = calculate_progress(project["start_date"], project["end_date"])
-        
-        # 주요 통계 값 계산
-        total_projects = len(projects)
-        avg_progress = sum(p["progress"] for p in projects) / total_projects if total_projects > 0 else 0
-        total_budget = sum(p["total_cost"] for p in projects)
-        
-        # 그래프 생성 (최신 데이터를 기반으로)
-        progress_graph = create_progress_graph(projects)
-        budget_graph = create_budget_graph(projects)
-        research_graphs = create_research_graphs(projects)
-        # DB에서 마일스톤 데이터 불러오기 및 그래프 생성
-        milestones_data = get_milestones()
-        milestone_graph = create_milestone_graph(milestones_data)
-        
-        # 데이터베이스 파일의 최종 수정 시간 가져오기
-        db_last_update = datetime.fromtimestamp(os.path.getmtime(DB_NAME)).strftime("%Y-%m-%d")
-        
-        return html.Div(
+    children = [
+        # 주요 통계 카드 (grid 레이아웃)
+        panels[kpi],
+        # 연구과제 그래프 및 정량 성과지표
+        html.Div(
             style={
-                "backgroundColor": "#1E1E2E",
-                "color": "white",
-                "padding": "20px",
-                "position": "relative",
-                "fontFamily": "'Pretendard', sans-serif"
+                "display": "grid",
+                "gridTemplateColumns": "repeat(2, 1fr)",
+                "marginTop": "40px",
+                "gap": "20px",
+                "fontFamily": FONT_FAMILY
             },
             children=[
-                # 우측 상단에 DB 최종 수정 날짜 표시
-                html.Div(
-                    f"마지막 업데이트: {db_last_update}",
-                    style={
-                        "position": "absolute",
-                        "top": "10px",
-                        "right": "20px",
-                        "fontSize": "12px",
-                        "color": "white",
-                        "fontFamily": "'Pretendard', sans-serif"
-                    }
-                ),
-                html.H1(
-                    "재난안전융합연구센터 연구과제 대시보드",
-                    style={
-                        "textAlign": "center",
-                        "fontSize": "60px",
-                        "marginTop": "40px",
-                        "fontFamily": "'Pretendard', sans-serif"
-                    }
-                ),
-                # 주요 통계 카드 (grid 레이아웃)
-                html.Div(
-                    style={
-                        "display": "grid",
-                        "gridTemplateColumns": "repeat(4, 1fr)",
-                        "gap": "15px",
-                        "marginBottom": "20px",
-                        "fontFamily": "'Pretendard', sans-serif"
-                    },
-                    children=[
-                        html.Div(
-                            style={
-                                "backgroundColor": "#2E2E3E",
-                                "borderRadius": "30px",
-                                # "boxShadow": "2px 2px 8px rgba(0,0,0,0.5)",
-                                "textAlign": "center",
-                                "fontFamily": "'Pretendard', sans-serif"
-                            },
-                            children=[
-                                html.P("총 연구과제", style={"fontFamily": "'Pretendard', sans-serif", "fontSize": "36px", "marginBottom": "0px", "color":"#ACACAC"}),
-                                html.H2(f"{total_projects}", style={"fontFamily": "'Pretendard', sans-serif", "fontSize": "120px","marginTop": "4px", "marginBottom": "30px"})
-                            ]
-                        ),
-                        html.Div(
-                            style={
-                                "backgroundColor": "#2E2E3E",
-                                "borderRadius": "30px",
-                                # "boxShadow": "2px 2px 8px rgba(0,0,0,0.5)",
-                                "textAlign": "center",
-                                "fontFamily": "'Pretendard', sans-serif"
-                            },
-                            children=[
-                                html.P("평균 진행률", style={"fontFamily": "'Pretendard', sans-serif", "fontSize": "36px", "marginBottom": "0px", "color":"#ACACAC"}),
-                                html.H2(f"{avg_progress:.1f}%", style={"fontFamily": "'Pretendard', sans-serif", "fontSize": "120px","marginTop": "4px", "marginBottom": "30px"})
-                            ]
-                        ),
-                        html.Div(
-                            style={
-                                "backgroundColor": "#2E2E3E",
-                                "borderRadius": "30px",
-                                # "boxShadow": "2px 2px 8px rgba(0,0,0,0.5)",
-                                "textAlign": "center",
-                                "fontFamily": "'Pretendard', sans-serif"
-                            },
-                            children=[
-                                html.P("총 예산", style={"fontFamily": "'Pretendard', sans-serif",  "fontSize": "36px", "marginBottom": "0px", "color":"#ACACAC"}),
-                                html.H2(
-                                        children=[
-                                            html.Span(f"{total_budget:.2f}", style={"fontSize": "120px"}),
-                                            html.Span(" 억원", style={"fontSize": "48px",})
-                                        ],
-                                        style={
-                                            "fontFamily": "'Pretendard', sans-serif",
-                                            "marginTop": "4px",
-                                            "marginBottom": "20px"
-                                        }
-                                    )
-                                # html.H2(f"{total_budget} 백만원", style={"fontFamily": "'Pretendard', sans-serif", "fontSize": "120px","marginTop": "4px", "marginBottom": "30px"})
-                            ]
-                        ),
-                        html.Div(
-                            style={
-                                "backgroundColor": "#2E2E3E",
-                                "borderRadius": "30px",
-                                # "boxShadow": "2px 2px 8px rgba(0,0,0,0.5)",
-                                "textAlign": "center",
-                                "fontFamily": "'Pretendard', sans-serif"
-                            },
-                            children=[
-                                html.P("전체 참여 인원", style={"fontFamily": "'Pretendard', sans-serif",  "fontSize": "36px", "marginBottom": "0px", "color":"#ACACAC"}),
-                                html.H2("15", style={"fontFamily": "'Pretendard', sans-serif", "fontSize": "120px","marginTop": "4px", "marginBottom": "30px"})
-                            ]
-                        )
-                    ]
-                ),
-                # 연구과제 그래프 및 정량 성과지표
-                html.Div(
-                    style={
-                        "display": "grid",
-                        "gridTemplateColumns": "repeat(2, 1fr)",
-                        "marginTop": "40px",
-                        "gap": "20px",
-                        "fontFamily": "'Pretendard', sans-serif"
-                    },
-                    children=[
-                        # 첫 번째 셀: "연구과제 진행률" 라벨과 progress_graph를 포함하는 카드
-                        html.Div(
-                            children=[
-                                html.P(
-                                    "연구과제 진행률",
-                                    style={
-                                        "textAlign": "left",
-                                        "fontFamily": "'Pretendard', sans-serif",
-                                        "fontSize": "40px",
-                                        "color": "white",
-                                        "marginBottom": "10px",
-                                        "marginTop": "0px",
-                                        "fontWeight": "bold",      # 볼드체 적용
-                                        "paddingLeft": "25px"                                         
-                                    }
-                                ),
-                                html.Div(
-                                    children=dcc.Graph(figure=progress_graph, style={"width": "100%"}),
-                                    style={
-                                        "backgroundColor": "#2E2E3E",
-                                        "padding": "15px",
-                                        "borderRadius": "30px",
-                                        # "boxShadow": "2px 2px 8px rgba(0,0,0,0.5)",
-                                        "textAlign": "center",
-                                        "fontFamily": "'Pretendard', sans-serif",
-                                    }
-                                )
-                            ]
-                        ),
-                        # 두 번째 셀: "정량 성과지표" 라벨과 research_graphs를 포함하는 카드
-                        html.Div(
-                            children=[
-                                html.P(
-                                    "정량 성과지표",
-                                    style={
-                                        "textAlign": "left",
-                                        "fontFamily": "'Pretendard', sans-serif",
-                                        "fontSize": "40px",
-                                        "color": "white",
-                                        "marginBottom": "10px",
-                                        "marginTop": "0px",
-                                        "fontWeight": "bold",      # 볼드체 적용
-                                        "paddingLeft": "25px"                                                                      
-                                    }
-                                ),
-                                html.Div(
-                                    children=html.Div(children=research_graphs, style={"width": "100%"}),
-                                    style={
-                                        "backgroundColor": "#2E2E3E",
-                                        "padding": "15px",
-                                        "borderRadius": "30px",                                        
-                                        # "boxShadow": "2px 2px 8px rgba(0,0,0,0.5)",
-                                        "textAlign": "center",
-                                        "fontFamily": "'Pretendard', sans-serif",
-                                    }
-                                )
-                            ]
-                        )
-                    ]
-                ),
-                # 마일스톤 그래프 영역 (단일 컬럼, 상단 여백 추가)
-                html.Div(
-                    style={
-                        "display": "grid",
-                        "gridTemplateColumns": "1fr",
-                        "marginTop": "45px",
-                        "fontFamily": "'Pretendard', sans-serif",
-                        "overflowX": "hidden"  # 부모 Div에 overflow 설정 추가
-                    },
-                    children=[
-                        html.P(
-                            "연구과제 마일스톤",
-                            style={
-                                "textAlign": "left",
-                                "fontFamily": "'Pretendard', sans-serif",
-                                "fontSize": "40px",
-                                "color": "white",
-                                "marginBottom": "10px",
-                                "marginTop": "0px",
-                                "fontWeight": "bold",      # 볼드체 적용
-                                "paddingLeft": "25px"                                         
-                            }
-                        ),
-                        html.Div(
-                            children=create_milestone_graph(milestones_data),  # milestone_graph을 dcc.Graph로 반환한 함수 호출
-                            style={
-                                "backgroundColor": "#2E2E3E",
-                                "padding": "15px",
-                                "borderRadius": "30px",
-                                # "boxShadow": "2px 2px 8px rgba(0,0,0,0.5)",
-                                "textAlign": "center",
-                                "fontFamily": "'Pretendard', sans-serif",
-                                "width": "100%",
-                                "height": "1080px",
-                                "overflowX": "hidden"  # 여기에도 overflow 설정 추가
-                            }
-                        )
-                    ]
-                )
+                html.Div(children=[_section_title("연구과제 진행률"), _card(panels[progress])]),
+                html.Div(children=[_section_title("정량 성과지표"), _card(panels[research])]),
             ]
-        )
-    
-    dash_app.layout = serve_layout
-    return dash_app
\ No newline at end of file
+        ),
+        # 하단 영역 (마일스톤 또는 예산, 단일 컬럼)
+        html.Div(
+            style={
+                "display": "grid",
+                "gridTemplateColumns": "1fr",
+                "marginTop": "45px",
+                "fontFamily": FONT_FAMILY,
+                "overflowX": "hidden"  # 부모 Div에 overflow 설정 추가
+            },
+            children=[
+                _section_title(page.bottom_title),
+                _card(panels[bottom], width="100%", overflowX="hidden", **page.bottom_style),
+            ]
+        ),
+    ]
+    if live:
+        children.extend(live_components(panel_names, data, live_refresh))
+    return html.Div(children=children)
+
+
+def _register_not_found(flask_app, dash_app):
+    """
+    dash pages 는 등록되지 않은 경로도 index 페이지(200)로 응답하므로, 페이지가 아닌 경로는 상태 코드만 404 로 바꾼다.
+    (본문은 dash 의 404 페이지 그대로라 브라우저에서는 같은 화면)
+    """
+    prefix = dash_app.config.routes_pathname_prefix
+    index_rules = {prefix, prefix + "<path:path>"}
+    page_paths = {page["path"].strip("/") for page in dash.page_registry.values()}
+
+    @flask_app.after_request
+    def unknown_page_not_found(response):
+        rule = request.url_rule
+        if (rule is not None and rule.rule in index_rules and response.status_code == 200
+                and request.path[len(prefix):].strip("/") not in page_paths):
+            response.status_code = 404
+        return response
+
+
+def init_dashboard(flask_app, live_refresh=0, events_port=0, research_mode="per_project", budget_mode="auto"):
+    """
+    PAGES 의 모든 페이지를 하나의 Dash 앱(dash pages)으로 등록한다.
+    렌더러 번들, 컴포넌트 레지스트리, 콜백 라우트를 페이지들이 공유하므로
+    다른 페이지로 이동해도 스크립트를 다시 받지 않는다.
+
+    live_refresh: 0보다 크면 해당 초 간격으로 변경된 패널만 부분 갱신하는 실시간 모드
+    events_port: SSE 허브(events.py) 포트. 지정하면 변경 알림을 받을 때 해당 패널만 갱신
+    research_mode: "subplots" 이면 정량 성과지표를 단일 Figure 로 렌더링
+    budget_mode: 예산 패널 렌더링 방식 ("auto", "gauge", "bullet")
+    """
+    live = live_refresh > 0 or events_port > 0
+
+    dash_app = dash.Dash(
+        __name__,
+        server=flask_app,
+        use_pages=True,
+        pages_folder="",
+        # 콜백 대상 id 가 일부 페이지에만 있으므로 검증을 끈다. 켜 두면 모든 페이지의 전체 레이아웃
+        # (figure 포함)이 validation_layout 으로 매 index 페이지의 config 에 실린다
+        suppress_callback_exceptions=True,
+        # 폰트 서브셋이 다시 생성되면 register_stylesheets 로 등록한 목록이 새 URL로 갱신됨
+        external_stylesheets=font_stylesheet_urls()
+    )
+    register_stylesheets(dash_app.config.external_stylesheets)
+    dash_app.index_string = INDEX_STRING
+
+    for i, page in enumerate(PAGES):
+        panel_names = page.panel_names(research_mode, budget_mode)
+
+        def serve_layout(page=page, panel_names=panel_names):
+            return page_content(page, panel_names, live, live_refresh)
+
+        # 데이터 버전/날짜가 바뀌지 않았다면 캐시된 레이아웃을 재사용
+        page.layout = cached_layout(page.name, serve_layout)
+        dash.register_page(page.name, path=page.path, name=page.name, order=i,
+                           # dash pages 는 경로 변수/쿼리 문자열을 인자로 넘긴다 (사용하지 않음)
+                           layout=lambda page=page, **_: page.layout())
+        if page.register is not None:
+            page.register(dash_app)
+
+    dash_app.layout = lambda: page_frame(dash.page_container)
+    _register_not_found(flask_app, dash_app)
+    if live:
+        register_live_refresh(dash_app)
+    if events_port > 0:
+        dash_app.index_string = dash_app.index_string.replace(
+            "{%renderer%}", "{%renderer%}" + events_client_script(events_port, EVENT_ID))
+    return dash_app
@@ -1,18 +1,217 @@
+import collections
+import datetime
+import os
+import queue
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from metrics import DB_CALL_SECONDS, DB_ERRORS_TOTAL, timed
 
 DB_NAME = "projects.db"
 
+# 연결 풀 설정
+POOL_SIZE = 8               # 풀에 보관할 유휴 연결 수 (초과분은 반환 시 닫음)
+STATEMENT_CACHE_SIZE = 256  # 연결별 prepared statement 캐시 크기
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",        # 읽기가 쓰기를 기다리지 않도록 WAL 사용
+    "PRAGMA synchronous=NORMAL",      # WAL 에서는 NORMAL 로도 커밋 손상 없음
+    "PRAGMA cache_size=-16000",       # 연결당 약 16MB 페이지 캐시
+    "PRAGMA mmap_size=134217728",     # 128MB 메모리 맵 읽기
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+# 비동기(ASGI) 모드에서 요청(라우트, Dash 레이아웃/콜백)을 실행할 스레드 수. 요청 전체가 이 스레드에서
+# 실행되므로 DB 작업만이 아니라 렌더링/직렬화 시간도 포함된다. 풀 크기와 같게 두어 동시에 쓰는 연결이
+# 풀을 넘지 않게 하고, 나머지 요청은 스레드를 잡지 않은 채 이벤트 루프에서 순서를 기다린다
+# (스트리밍 응답의 나머지 청크는 asgi.py 의 별도 스레드에서 만든다)
+DB_EXECUTOR_WORKERS = POOL_SIZE
+
+_pools = {}                 # (pid, db 경로) -> 유휴 연결 큐
+_pool_lock = threading.Lock()
+_executors = {}             # pid -> DB 작업용 ThreadPoolExecutor
+
+# 데이터 버전 관리 (레이아웃 캐시 등에서 변경 여부 판단용)
+_write_version = 0          # 이 프로세스의 쓰기 함수가 커밋할 때마다 증가
+_version_lock = threading.Lock()
+_version_conn = None        # PRAGMA data_version 조회 전용 연결 (쓰기에 사용하지 않음)
+_version_key = None
+
+# 쓰기 후 호출되는 변경 알림 함수들 (events.py 의 SSE 허브 등)
+_change_listeners = []
+
+# 이 프로세스의 트랜잭션이 남긴 change_log 구간 (시작 seq, 끝 seq] - 다른 프로세스의 쓰기와 구분용
+# (events.py 가 주기적으로 확인하므로 최근 것만 보관. 넘치면 다른 프로세스의 쓰기로 간주될 뿐)
+LOCAL_CHANGES_KEPT = 1000
+_local_changes = collections.deque(maxlen=LOCAL_CHANGES_KEPT)
+_local_changes_lock = threading.Lock()
+
+def _bump_version():
+    global _write_version
+    with _version_lock:
+        _write_version += 1
+
+def add_change_listener(listener):
+    """listener(table, action, ids) 를 쓰기 함수가 커밋한 뒤마다 호출하도록 등록."""
+    _change_listeners.append(listener)
+
+def _notify_change(table, action, ids):
+    for listener in _change_listeners:
+        listener(table, action, [int(i) for i in ids])
+
+# 함수별 실행 시간 / 오류 수를 기록하고 요청의 db 구간에 더함
+instrumented = timed(DB_CALL_SECONDS, "db", DB_ERRORS_TOTAL)
+
+
+@instrumented
+def get_data_version():
+    """
+    데이터가 바뀌었는지 비교하기 위한 버전 값을 반환.
+    (프로세스 내부 쓰기 카운터, PRAGMA data_version) 튜플이며,
+    data_version 은 다른 연결/프로세스가 커밋할 때마다 바뀌므로
+    다른 워커나 외부 도구에서 수정한 경우도 감지된다.
+    """
+    global _version_conn, _version_key
+    key = (os.getpid(), DB_NAME)
+    with _version_lock:
+        if _version_conn is None or _version_key != key:
+            # fork 된 워커는 부모의 연결을 건드리지 않고 새로 연다
+            if _version_conn is not None and _version_key[0] == key[0]:
+                _version_conn.close()
+            _version_conn = sqlite3.connect(DB_NAME, check_same_thread=False)
+            _version_key = key
+        data_version = _version_conn.execute("PRAGMA data_version").fetchone()[0]
+        return (_write_version, data_version)
+
+def _open_connection():
+    conn = sqlite3.connect(DB_NAME, check_same_thread=False,
+                           cached_statements=STATEMENT_CACHE_SIZE)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def _get_pool():
+    key = (os.getpid(), DB_NAME)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pool_lock:
+            pool = _pools.setdefault(key, queue.LifoQueue(maxsize=POOL_SIZE))
+    return pool
+
+@contextmanager
+def pooled_connection():
+    """
+    풀에서 연결을 빌려주고 사용 후 반환한다.
+    연결이 재사용되므로 PRAGMA 설정과 prepared statement 캐시도 함께 재사용된다.
+    """
+    pool = _get_pool()
+    try:
+        conn = pool.get_nowait()
+    except queue.Empty:
+        conn = _open_connection()
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+def db_executor():
+    """이 프로세스의 요청/DB 작업용 executor (최대 DB_EXECUTOR_WORKERS 스레드, fork 된 워커는 새로 만듦)."""
+    pid = os.getpid()
+    executor = _executors.get(pid)
+    if executor is None:
+        with _pool_lock:
+            executor = _executors.get(pid)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+                _executors[pid] = executor
+    return executor
+
+@contextmanager
+def transaction():
+    """쓰기용: 하나의 트랜잭션으로 커밋(예외 시 롤백)하고 데이터 버전을 올린다."""
+    with pooled_connection() as conn:
+        with conn:
+            # 쓰기 잠금을 먼저 잡아 두면 이 트랜잭션이 남긴 change_log 행이 (start, end] 로 연속된다
+            conn.execute("BEGIN IMMEDIATE")
+            start = _change_seq(conn)
+            yield conn
+            end = _change_seq(conn)
+        _bump_version()
+        if end > start:
+            with _local_changes_lock:
+                _local_changes.append((start, end))
+
+def local_change_count(after_seq, upto_seq):
+    """change_log 의 (after_seq, upto_seq] 구간 중 이 프로세스의 트랜잭션이 쓴 행 수."""
+    with _local_changes_lock:
+        ranges = list(_local_changes)
+    return sum(max(0, min(end, upto_seq) - max(start, after_seq)) for start, end in ranges)
+
+def close_pool():
+    """현재 프로세스의 유휴 연결을 모두 닫는다 (DB 파일 교체/복구 전 등)."""
+    global _version_conn
+    with _pool_lock:
+        for key in [k for k in _pools if k[0] == os.getpid()]:
+            pool = _pools.pop(key)
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+    with _version_lock:
+        if _version_conn is not None and _version_key[0] == os.getpid():
+            _version_conn.close()
+        _version_conn = None
+    # 교체/복구된 DB 에서는 같은 seq 가 다른 변경일 수 있음
+    with _local_changes_lock:
+        _local_changes.clear()
+
+@instrumented
+def get_last_modified():
+    """
+    연구과제/마일스톤의 마지막 변경 시각 (unix 초). 다른 워커나 외부 도구의 쓰기도 포함된다.
+    change_log(트리거가 기록)의 마지막 항목을 쓰고, 이력이 없으면 DB 파일과 -wal 파일 중 최근 수정 시각.
+    (WAL 모드에서는 커밋이 -wal 파일에 쌓이고 DB 파일은 체크포인트 때만 바뀌므로 DB 파일 시각만으로는 부족)
+    """
+    with pooled_connection() as conn:
+        try:
+            row = conn.execute("SELECT changed_at FROM change_log ORDER BY seq DESC LIMIT 1").fetchone()
+        except sqlite3.OperationalError:  # change_log 마이그레이션 전
+            row = None
+    if row is not None:
+        return row[0]
+    return max(os.path.getmtime(path) for path in (DB_NAME, DB_NAME + "-wal") if os.path.exists(path))
+
+@instrumented
+def get_change_seq():
+    """
+    마지막 변경의 change_log 번호. DB 파일에 저장된 값이므로 같은 데이터면 모든 워커와 재시작 후에도 같고,
+    AUTOINCREMENT 라 change_log 를 정리해도 줄어들지 않는다. change_log 마이그레이션 전이면 0.
+    """
+    with pooled_connection() as conn:
+        return _change_seq(conn)
+
+def _change_seq(conn):
+    try:
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    except sqlite3.OperationalError:  # AUTOINCREMENT 테이블이 아직 없음
+        row = None
+    return row[0] if row else 0
+
 def get_connection():
-    conn = sqlite3.connect(DB_NAME)
+    conn = _open_connection()
     conn.row_factory = sqlite3.Row
     return conn
 
-# 데이터베이스 초기화
-def create_database():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS projects (
+# 테이블 정의 (create_* 함수와 migrations.py 의 테이블 재생성에서 함께 사용)
+PROJECTS_COLUMNS = """
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL,
             manager TEXT NOT NULL,
@@ -28,16 +227,8 @@ def create_database():
             current_patents_registered INTEGER DEFAULT 0,
             goal_software INTEGER DEFAULT 0,
             current_software INTEGER DEFAULT 0
-        )
-    ''')
-    conn.commit()
-    conn.close()
-
-def create_milestones_table():
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS milestones (
+"""
+MILESTONES_COLUMNS = """
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             Milestone TEXT NOT NULL,
             Start TEXT NOT NULL,
@@ -45,8 +236,41 @@ def create_milestones_table():
             Status TEXT NOT NULL,
             "세부 목표" TEXT,
             담당자 TEXT
-        )
-    ''')
+"""
+
+# 조회할 컬럼 (migrations.py 가 추가하는 날짜 계산 컬럼 start_day 등은 제외)
+PROJECT_FIELDS = [
+    "id", "name", "manager", "start_date", "end_date", "total_cost", "current_expenditure",
+    "goal_papers", "current_papers", "goal_patents_filed", "current_patents_filed",
+    "goal_patents_registered", "current_patents_registered", "goal_software", "current_software",
+]
+# 행 버전 (migrations.py 버전 6). 가져오기/내보내기·변경 이력 형식에는 넣지 않으므로 따로 둠
+PROJECT_VERSION_FIELDS = PROJECT_FIELDS + ["row_version"]
+MILESTONE_FIELDS = ["id", "Milestone", "Start", "Finish", "Status", "세부 목표", "담당자"]
+MILESTONE_SELECT = 'SELECT id, Milestone, Start, Finish, Status, "세부 목표", 담당자 FROM milestones'
+TABLE_FIELDS = {"projects": PROJECT_FIELDS, "milestones": MILESTONE_FIELDS}
+
+# 일괄 가져오기/내보내기에서 한 번에 처리하는 행 수
+BULK_BATCH_SIZE = 5000
+
+# 날짜 <-> 일 번호 (1970-01-01 부터의 일수, migrations.py 의 *_day 컬럼과 같은 값)
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+def date_to_day(value):
+    return datetime.date.fromisoformat(str(value)[:10]).toordinal() - EPOCH_ORDINAL
+
+# 데이터베이스 초기화
+def create_database():
+    conn = sqlite3.connect(DB_NAME)
+    cursor = conn.cursor()
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS projects ({PROJECTS_COLUMNS})")
+    conn.commit()
+    conn.close()
+
+def create_milestones_table():
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS milestones ({MILESTONES_COLUMNS})")
     conn.commit()
     conn.close()
 
@@ -80,119 +304,315 @@ def insert_sample_data():
     conn.close()
 
 # 연구과제 불러오기
-def get_projects():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM projects")
-    projects = cursor.fetchall()
-    conn.close()
-    project_list = []
-    for project in projects:
-        project_list.append({
-            "id": project[0],
-            "name": project[1],
-            "manager": project[2],
-            "start_date": project[3],
-            "end_date": project[4],
-            "total_cost": project[5],
-            "current_expenditure": project[6],
-            "goal_papers": project[7],
-            "current_papers": project[8],
-            "goal_patents_filed": project[9],
-            "current_patents_filed": project[10],
-            "goal_patents_registered": project[11],
-            "current_patents_registered": project[12],
-            "goal_software": project[13],
-            "current_software": project[14],
-        })
-    return project_list
+@instrumented
+def get_projects(with_version=False):
+    # with_version: 일괄 수정 폼이 낙관적 동시성 검사에 쓰는 row_version 도 함께
+    fields = PROJECT_VERSION_FIELDS if with_version else PROJECT_FIELDS
+    with pooled_connection() as conn:
+        projects = conn.execute(f"SELECT {', '.join(fields)} FROM projects").fetchall()
+    return [dict(zip(fields, project)) for project in projects]
+
+# 화면별로 필요한 컬럼만 조회하는 함수들 (get_projects 는 전체 컬럼이 필요한 /update 와 API 용)
+PROJECT_SCHEDULE_FIELDS = ["id", "name", "start_date", "end_date"]
+PROJECT_RESEARCH_FIELDS = [
+    "id", "name", "goal_papers", "current_papers", "goal_patents_filed", "current_patents_filed",
+    "goal_patents_registered", "current_patents_registered", "goal_software", "current_software",
+]
+PROJECT_BUDGET_FIELDS = ["id", "name", "total_cost", "current_expenditure"]
+PROJECT_NAME_FIELDS = ["id", "name"]
+
+def _select_project_fields(fields):
+    with pooled_connection() as conn:
+        rows = conn.execute(f"SELECT {', '.join(fields)} FROM projects ORDER BY id").fetchall()
+    return [dict(zip(fields, row)) for row in rows]
+
+@instrumented
+def get_project_names():
+    """연구과제명 목록 (마일스톤 폼 드롭다운)."""
+    with pooled_connection() as conn:
+        # 정렬이 없으면 idx_projects_name 만 읽어 이름순이 되므로 다른 화면과 같은 id 순서로
+        return [row[0] for row in conn.execute("SELECT name FROM projects ORDER BY id")]
+
+@instrumented
+def get_project_ids():
+    """(id, name) 목록. 이름으로 연구과제를 가리키는 마일스톤에 연구과제별 색상을 맞출 때 사용."""
+    return _select_project_fields(PROJECT_NAME_FIELDS)
+
+@instrumented
+def get_project_schedules():
+    """진행률 계산/진행률 그래프용 (id, name, start_date, end_date)."""
+    return _select_project_fields(PROJECT_SCHEDULE_FIELDS)
+
+@instrumented
+def get_project_research():
+    """정량 성과지표(논문/특허/SW 목표·결과) 그래프용."""
+    return _select_project_fields(PROJECT_RESEARCH_FIELDS)
+
+@instrumented
+def get_project_budgets():
+    """예산 그래프용 (id, name, total_cost, current_expenditure)."""
+    return _select_project_fields(PROJECT_BUDGET_FIELDS)
+
+@instrumented
+def get_project_totals():
+    """과제 수와 총 예산/집행액 합계 (KPI 카드)."""
+    with pooled_connection() as conn:
+        count, total_cost, total_expenditure = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(total_cost), 0), COALESCE(SUM(current_expenditure), 0) FROM projects"
+        ).fetchone()
+    return {"count": count, "total_cost": total_cost, "total_expenditure": total_expenditure}
+
+class RowVersionConflict(Exception):
+    """일괄 수정 중 다른 곳에서 먼저 수정(또는 삭제)된 행이 있음. ids: 해당 연구과제 id 목록."""
+
+    def __init__(self, ids):
+        super().__init__(f"rows changed since they were loaded: {', '.join(map(str, ids))}")
+        self.ids = ids
+
+@instrumented
+def update_projects_batch(rows):
+    """
+    rows: [(PROJECT_FIELDS 순서의 튜플, 불러올 때의 row_version)] 을 하나의 트랜잭션으로 수정.
+    하나라도 버전이 다르면(그 사이 수정/삭제됨) 아무것도 쓰지 않고 RowVersionConflict.
+    수정된 행을 row_version 과 함께 반환. 같은 id 가 두 번 있으면 ValueError.
+    """
+    assignments = ", ".join(f"{f} = ?" for f in PROJECT_FIELDS if f != "id")
+    sql = f"UPDATE projects SET {assignments} WHERE id = ? AND row_version = ?"
+    ids = [values[0] for values, _ in rows]
+    if len(set(ids)) != len(ids):
+        raise ValueError("duplicate id in batch")
+    with transaction() as conn:
+        conflicts = []
+        for values, version in rows:
+            # row_version 은 projects_row_version 트리거가 올림
+            if conn.execute(sql, (*values[1:], values[0], version)).rowcount == 0:
+                conflicts.append(values[0])
+        if conflicts:
+            raise RowVersionConflict(conflicts)  # with 블록을 빠져나가며 롤백
+        updated = _select_projects(conn, ids, PROJECT_VERSION_FIELDS)
+    _notify_change("projects", "update", ids)
+    return updated
+
+def get_projects_by_id(ids, with_version=False):
+    with pooled_connection() as conn:
+        return _select_projects(conn, ids, PROJECT_VERSION_FIELDS if with_version else PROJECT_FIELDS)
+
+def _select_projects(conn, ids, fields):
+    if not ids:
+        return []
+    rows = conn.execute(f"SELECT {', '.join(fields)} FROM projects WHERE id IN ({', '.join('?' * len(ids))})"
+                        " ORDER BY id", list(ids)).fetchall()
+    return [dict(zip(fields, row)) for row in rows]
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+def _upsert_sql(table):
+    # TABLE_FIELDS[table] 순서의 값으로 추가하거나, 같은 id 가 있으면 덮어씀
+    fields = TABLE_FIELDS[table]
+    columns = ", ".join(_quote(f) for f in fields)
+    updates = ", ".join(f"{_quote(f)} = excluded.{_quote(f)}" for f in fields if f != "id")
+    return (f"INSERT INTO {table} ({columns}) VALUES ({', '.join('?' * len(fields))}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates}")
+
+@instrumented
+def bulk_upsert(table, rows, batch_size=BULK_BATCH_SIZE):
+    """
+    rows: TABLE_FIELDS[table] 순서의 튜플을 내보내는 iterable (id 가 None 이면 새로 추가, 있으면 덮어씀).
+    batch_size 개씩 executemany 로 쓰며 전체가 하나의 트랜잭션이다
+    (rows 를 읽는 도중 예외가 나면 이미 쓴 배치까지 모두 롤백). (추가 수, 갱신 수) 반환.
+    """
+    sql = _upsert_sql(table)
+    inserted = updated = 0
+    with transaction() as conn:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                existing = _count_existing(conn, table, batch)
+                conn.executemany(sql, batch)
+                updated += existing
+                inserted += len(batch) - existing
+                batch = []
+        if batch:
+            existing = _count_existing(conn, table, batch)
+            conn.executemany(sql, batch)
+            updated += existing
+            inserted += len(batch) - existing
+    _notify_change(table, "import", [])
+    return inserted, updated
+
+@instrumented
+def apply_changes(changes):
+    """
+    changes: {table: (upsert 할 행 목록, 삭제할 id 목록)} 을 하나의 트랜잭션으로 적용 (변경 이력 복구용).
+    행은 TABLE_FIELDS[table] 순서의 튜플이며 id 를 그대로 쓴다.
+    """
+    with transaction() as conn:
+        for table, (rows, delete_ids) in changes.items():
+            if delete_ids:
+                conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(i,) for i in delete_ids])
+            if rows:
+                conn.executemany(_upsert_sql(table), rows)
+    for table, (rows, delete_ids) in changes.items():
+        if rows or delete_ids:
+            _notify_change(table, "restore", [row[0] for row in rows] + list(delete_ids))
+
+def _count_existing(conn, table, batch):
+    ids = [row[0] for row in batch if row[0] is not None]
+    if not ids:
+        return 0
+    placeholders = ", ".join("?" * len(ids))
+    return conn.execute(f"SELECT COUNT(*) FROM {table} WHERE id IN ({placeholders})", ids).fetchone()[0]
+
+def iter_table(table, batch_size=BULK_BATCH_SIZE):
+    """
+    테이블 전체를 id 순서로 TABLE_FIELDS[table] 튜플로 내보낸다.
+    fetchmany 로 batch_size 개씩 읽으므로 전체를 메모리에 올리지 않으며,
+    한 읽기 트랜잭션 안에서 읽으므로 내보내는 도중의 쓰기는 반영되지 않는다 (WAL).
+    """
+    columns = ", ".join(_quote(f) for f in TABLE_FIELDS[table])
+    with pooled_connection() as conn:
+        cursor = conn.execute(f"SELECT {columns} FROM {table} ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
 
 # 연구과제 업데이트
+@instrumented
 def update_project(project_id, name, manager, start_date, end_date, total_cost, current_expenditure,
                    goal_papers, current_papers, goal_patents_filed, current_patents_filed,
                    goal_patents_registered, current_patents_registered, goal_software, current_software):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('''
-        UPDATE projects 
-        SET name=?, manager=?, start_date=?, end_date=?, total_cost=?, current_expenditure=?,
-            goal_papers=?, current_papers=?, goal_patents_filed=?, current_patents_filed=?,
-            goal_patents_registered=?, current_patents_registered=?, goal_software=?, current_software=?
-        WHERE id=?
-    ''', (name, manager, start_date, end_date, total_cost, current_expenditure,
-          goal_papers, current_papers, goal_patents_filed, current_patents_filed,
-          goal_patents_registered, current_patents_registered, goal_software, current_software,
-          project_id))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute('''
+            UPDATE projects 
+            SET name=?, manager=?, start_date=?, end_date=?, total_cost=?, current_expenditure=?,
+                goal_papers=?, current_papers=?, goal_patents_filed=?, current_patents_filed=?,
+                goal_patents_registered=?, current_patents_registered=?, goal_software=?, current_software=?
+            WHERE id=?
+        ''', (name, manager, start_date, end_date, total_cost, current_expenditure,
+              goal_papers, current_papers, goal_patents_filed, current_patents_filed,
+              goal_patents_registered, current_patents_registered, goal_software, current_software,
+              project_id))
+    _notify_change("projects", "update", [project_id])
 
 # 연구과제 삭제
+@instrumented
 def delete_project(project_id):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM projects WHERE id=?", (project_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("DELETE FROM projects WHERE id=?", (project_id,))
+    _notify_change("projects", "delete", [project_id])
 
 # 연구과제 추가
+@instrumented
 def add_project(name, manager, start_date, end_date, total_cost, current_expenditure,
                 goal_papers, current_papers, goal_patents_filed, current_patents_filed,
                 goal_patents_registered, current_patents_registered, goal_software, current_software):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO projects 
-        (name, manager, start_date, end_date, total_cost, current_expenditure,
-         goal_papers, current_papers, goal_patents_filed, current_patents_filed,
-         goal_patents_registered, current_patents_registered, goal_software, current_software)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (name, manager, start_date, end_date, total_cost, current_expenditure,
-          goal_papers, current_papers, goal_patents_filed, current_patents_filed,
-          goal_patents_registered, current_patents_registered, goal_software, current_software))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        cursor = conn.execute('''
+            INSERT INTO projects 
+            (name, manager, start_date, end_date, total_cost, current_expenditure,
+             goal_papers, current_papers, goal_patents_filed, current_patents_filed,
+             goal_patents_registered, current_patents_registered, goal_software, current_software)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (name, manager, start_date, end_date, total_cost, current_expenditure,
+              goal_papers, current_papers, goal_patents_filed, current_patents_filed,
+              goal_patents_registered, current_patents_registered, goal_software, current_software))
+    _notify_change("projects", "insert", [cursor.lastrowid])
 
+@instrumented
 def get_milestones():
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM milestones")
-    rows = cur.fetchall()
-    conn.close()
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        rows = cur.execute(MILESTONE_SELECT).fetchall()
     milestones = [dict(row) for row in rows]
     return milestones
 
+@instrumented
+def get_milestones_in_window(start, end):
+    """
+    [start, end] 기간(YYYY-MM-DD, 양 끝 포함)과 겹치는 마일스톤만 조회.
+    일 번호 인덱스(idx_milestones_days)로 이미 끝난 과거 마일스톤은 읽지 않는다.
+    """
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        # ORDER BY id 를 붙이면 인덱스 대신 전체 스캔을 하므로 정렬은 조회 후에 (get_milestones 와 같은 순서)
+        rows = cur.execute(
+            MILESTONE_SELECT + " WHERE finish_day >= ? AND start_day <= ?",
+            (date_to_day(start), date_to_day(end))
+        ).fetchall()
+    return sorted((dict(row) for row in rows), key=lambda m: m["id"])
+
+# query_page 의 필터 -> 테이블별 컬럼 (담당자, 연구과제명, 기간 일 번호 컬럼)
+QUERY_COLUMNS = {
+    "projects": {"manager": "manager", "project": "name", "days": ("start_day", "end_day")},
+    "milestones": {"manager": "담당자", "project": "Milestone", "status": "Status",
+                   "days": ("start_day", "finish_day")},
+}
+
+@instrumented
+def query_page(table, fields, after_id=0, limit=100, manager=None, project=None, status=None,
+               start=None, end=None):
+    """
+    id > after_id 인 행을 id 순서로 최대 limit 개, fields 컬럼만 조회 (커서 페이지용).
+    manager / project / status 는 일치 조건, start / end(YYYY-MM-DD)는 기간이 겹치는 행만.
+    커서로 쓰도록 id 는 항상 함께 읽어 (id, {field: 값}) 목록으로 반환한다.
+    """
+    columns = QUERY_COLUMNS[table]
+    conditions = ["id > ?"]
+    params = [after_id]
+    for key, value in (("manager", manager), ("project", project), ("status", status)):
+        if value is not None:
+            conditions.append(f"{_quote(columns[key])} = ?")
+            params.append(value)
+    start_day, end_day = columns["days"]
+    if start is not None:
+        conditions.append(f"{end_day} >= ?")
+        params.append(date_to_day(start))
+    if end is not None:
+        conditions.append(f"{start_day} <= ?")
+        params.append(date_to_day(end))
+    selected = ", ".join(["id"] + [_quote(f) for f in fields])
+    sql = f"SELECT {selected} FROM {table} WHERE {' AND '.join(conditions)} ORDER BY id LIMIT ?"
+    with pooled_connection() as conn:
+        rows = conn.execute(sql, params + [limit]).fetchall()
+    return [(row[0], dict(zip(fields, row[1:]))) for row in rows]
+
+@instrumented
 def update_milestone(milestone_id, milestone_text, start, finish, status, detail, manager):
-    conn = sqlite3.connect(DB_NAME)
-    cur = conn.cursor()
-    cur.execute("""
-        UPDATE milestones
-        SET Milestone = ?, Start = ?, Finish = ?, Status = ?, "세부 목표" = ?, 담당자 = ?
-        WHERE id = ?
-    """, (milestone_text, start, finish, status, detail, manager, milestone_id))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("""
+            UPDATE milestones
+            SET Milestone = ?, Start = ?, Finish = ?, Status = ?, "세부 목표" = ?, 담당자 = ?
+            WHERE id = ?
+        """, (milestone_text, start, finish, status, detail, manager, milestone_id))
+    _notify_change("milestones", "update", [milestone_id])
 
+@instrumented
 def delete_milestone(milestone_id):
-    conn = sqlite3.connect(DB_NAME)
-    cur = conn.cursor()
-    cur.execute("DELETE FROM milestones WHERE id = ?", (milestone_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("DELETE FROM milestones WHERE id = ?", (milestone_id,))
+    _notify_change("milestones", "delete", [milestone_id])
 
+@instrumented
 def add_milestone(milestone_text, start, finish, status, detail, manager):
-    conn = sqlite3.connect(DB_NAME)
-    cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO milestones (Milestone, Start, Finish, Status, "세부 목표", 담당자)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (milestone_text, start, finish, status, detail, manager))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        cursor = conn.execute("""
+            INSERT INTO milestones (Milestone, Start, Finish, Status, "세부 목표", 담당자)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (milestone_text, start, finish, status, detail, manager))
+    _notify_change("milestones", "insert", [cursor.lastrowid])
 
 if __name__ == "__main__":
     create_database()
     insert_sample_data()
     create_milestones_table()
+    # 스키마 버전 기록, 타입 수정, 날짜 컬럼/인덱스 추가
+    from migrations import migrate
+    migrate()
 
     print("Database initialized successfully!")
\ No newline at end of file
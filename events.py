@@ -0,0 +1,234 @@
+# events.py
+"""
+DB 변경 알림을 열려 있는 대시보드로 보내는 Server-Sent Events 허브.
+
+- database.py 의 쓰기 함수가 커밋 후 (table, action, ids) 를 알리면 모든 구독자에게 전달
+- 하나의 asyncio 이벤트 루프(전용 스레드 1개)가 모든 연결을 처리하므로
+  유휴 연결 수백 개가 있어도 연결당 스레드를 쓰지 않는다.
+- 다른 워커/프로세스에서 일어난 쓰기는 change_log 의 변경 번호를 주기적으로 확인해
+  table="*" 이벤트로 알린다.
+
+앱 안에서는 DASHBOARD_SSE_PORT 환경 변수로 켜고, 단독 실행도 가능하다.
+
+    python events.py --port 5002
+
+클라이언트: GET /events[?tables=projects,milestones]  (text/event-stream)
+"""
+import argparse
+import asyncio
+import collections
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from database import add_change_listener, get_change_seq, local_change_count
+
+HEARTBEAT_SECONDS = 15      # 프록시가 유휴 연결을 끊지 않도록 주석 줄 전송
+VERSION_POLL_SECONDS = 2    # 다른 프로세스의 쓰기 감지 주기
+CLIENT_QUEUE_SIZE = 100     # 느린 클라이언트는 큐가 차면 연결을 끊음 (재접속 시 따라잡음)
+HISTORY_SIZE = 200          # Last-Event-ID 재접속 시 다시 보낼 최근 이벤트 수
+
+
+class EventHub:
+    def __init__(self, host="0.0.0.0", port=5002):
+        self.host = host
+        self.port = port
+        self.loop = None
+        self._server = None
+        self._clients = set()               # (queue, tables) 튜플
+        self._history = collections.deque(maxlen=HISTORY_SIZE)
+        self._next_id = 1
+        self._ready = threading.Event()
+        # 변경 번호 확인 전용 스레드 (요청 처리용 database.db_executor 가 바빠도 주기가 밀리지 않음)
+        self._version_executor = None
+        self.stats = {"connections": 0, "published": 0, "delivered": 0, "dropped_clients": 0}
+
+    # --- 발행 (아무 스레드에서나 호출 가능) -------------------------------------------
+
+    def publish(self, table, action, ids):
+        event = {"table": table, "action": action, "ids": list(ids), "ts": time.time()}
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._fanout, event)
+
+    def _fanout(self, event):
+        event["id"] = self._next_id
+        self._next_id += 1
+        self._history.append(event)
+        self.stats["published"] += 1
+        for client in list(self._clients):
+            self._deliver(client, event)
+
+    def _deliver(self, client, event):
+        queue, tables = client
+        if tables and event["table"] != "*" and event["table"] not in tables:
+            return
+        try:
+            queue.put_nowait(event)
+            self.stats["delivered"] += 1
+        except asyncio.QueueFull:
+            # 따라오지 못하는 클라이언트는 끊음: EventSource 가 Last-Event-ID 로 재접속
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+            self._clients.discard(client)
+            self.stats["dropped_clients"] += 1
+
+    # --- HTTP 처리 -----------------------------------------------------------------
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip()
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) < 2 or parts[0] not in ("GET", "OPTIONS"):
+                await self._simple_response(writer, "405 Method Not Allowed")
+                return
+            url = urlsplit(parts[1])
+            if url.path != "/events":
+                await self._simple_response(writer, "404 Not Found")
+                return
+            if parts[0] == "OPTIONS":
+                await self._simple_response(writer, "204 No Content")
+                return
+            query = parse_qs(url.query)
+            tables = {t for value in query.get("tables", []) for t in value.split(",") if t}
+            await self._stream(writer, tables, headers.get("last-event-id"))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _simple_response(self, writer, status):
+        writer.write(f"HTTP/1.1 {status}\r\nAccess-Control-Allow-Origin: *\r\n"
+                     "Content-Length: 0\r\nConnection: close\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+
+    async def _stream(self, writer, tables, last_event_id):
+        writer.write(b"HTTP/1.1 200 OK\r\n"
+                     b"Content-Type: text/event-stream; charset=utf-8\r\n"
+                     b"Cache-Control: no-cache\r\n"
+                     b"Access-Control-Allow-Origin: *\r\n"
+                     b"Connection: keep-alive\r\n\r\n"
+                     b"retry: 3000\n\n")
+        queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        client = (queue, frozenset(tables))
+        # 재접속한 클라이언트에는 놓친 이벤트를 먼저 보냄 (기록에 없으면 전체 갱신 요청)
+        if last_event_id and last_event_id.isdigit():
+            missed = [e for e in self._history if e["id"] > int(last_event_id)]
+            if self._history and self._history[0]["id"] > int(last_event_id) + 1:
+                missed = [{"table": "*", "action": "resync", "ids": [], "id": self._next_id - 1}]
+            for event in missed:
+                self._deliver(client, event)
+        self._clients.add(client)
+        self.stats["connections"] += 1
+        try:
+            await writer.drain()
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    writer.write(b": ping\n\n")
+                    await writer.drain()
+                    continue
+                if event is None:
+                    break
+                payload = json.dumps(event, ensure_ascii=False)
+                writer.write(f"id: {event['id']}\ndata: {payload}\n\n".encode("utf-8"))
+                await writer.drain()
+        finally:
+            self._clients.discard(client)
+            self.stats["connections"] -= 1
+
+    # --- 다른 프로세스의 쓰기 감지 ----------------------------------------------------------
+
+    async def _watch_version(self, last):
+        # 그 사이 늘어난 change_log 행 중 이 프로세스의 트랜잭션이 쓴 것(이미 알림)보다 많으면 다른 프로세스의 쓰기
+        while True:
+            await asyncio.sleep(VERSION_POLL_SECONDS)
+            current = await self.loop.run_in_executor(self._version_executor, get_change_seq)
+            if current - last > local_change_count(last, current):
+                self._fanout({"table": "*", "action": "external", "ids": [], "ts": time.time()})
+            last = current
+
+    # --- 실행 ---------------------------------------------------------------------------
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._version_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sse-version")
+        # 시작 직후의 쓰기도 놓치지 않도록 기준 번호는 준비 완료 전에 읽음
+        self.loop.create_task(self._watch_version(get_change_seq()))
+        self._ready.set()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self):
+        """백그라운드 스레드에서 이벤트 루프를 돌리고, 바인딩이 끝날 때까지 기다린다."""
+        errors = []
+
+        def run():
+            try:
+                asyncio.run(self.serve())
+            except OSError as e:  # 포트 사용 중 (예: debug 리로더의 부모 프로세스)
+                errors.append(e)
+                self._ready.set()
+
+        thread = threading.Thread(target=run, name="sse-hub", daemon=True)
+        thread.start()
+        self._ready.wait()
+        if errors:
+            raise errors[0]
+        return thread
+
+
+_hub = None
+
+
+def start_event_hub(port, host="0.0.0.0"):
+    """SSE 허브를 시작하고 database 쓰기 알림을 연결한다. 이미 실행 중이면 그대로 반환."""
+    global _hub
+    if _hub is None:
+        hub = EventHub(host, port)
+        hub.start_in_thread()
+        add_change_listener(hub.publish)
+        _hub = hub
+    return _hub
+
+
+def events_client_script(port, element_id):
+    """
+    대시보드 페이지에 넣을 EventSource 스크립트.
+    이벤트를 받으면 element_id(dcc.Store) 의 data 를 바꿔서 서버 콜백을 실행시킨다.
+    """
+    return f"""
+    <script>
+    (function () {{
+        var url = window.location.protocol + "//" + window.location.hostname + ":{port}/events";
+        var source = new EventSource(url);
+        source.onmessage = function (e) {{
+            if (window.dash_clientside && window.dash_clientside.set_props) {{
+                window.dash_clientside.set_props("{element_id}", {{data: JSON.parse(e.data)}});
+            }}
+        }};
+    }})();
+    </script>
+    """
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SSE hub for dashboard change notifications")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5002)
+    args = parser.parse_args()
+    # 단독 실행 시에는 변경 번호(change_log) 감시로 다른 프로세스(앱 워커)의 쓰기를 알린다
+    asyncio.run(EventHub(args.host, args.port).serve())
@@ -0,0 +1,292 @@
+# fonts.py
+"""
+대시보드에서 실제로 쓰이는 글자만 담은 Pretendard 서브셋 폰트를 만든다.
+
+- 글자 수집: DB(연구과제명, 담당자, 마일스톤 내용 등) + 템플릿 + 레이아웃 코드의 문자열
+- 굵기별로 작은 woff2(brotli 가 없으면 woff) 를 static/font/generated/ 에 생성
+- pretendard-dynamic.css 는 서브셋에 포함된 글자만 unicode-range 로 지정하고,
+  나머지 글자는 전체 폰트 @font-face 로 넘겨서 새 글자가 나와도 깨지지 않는다.
+- 새 이름이 추가되어 글자 집합이 늘어나면 다시 생성한다.
+
+fontTools 가 설치되지 않은 환경에서는 기존 pretendard.css / pretendard-subset.css 를 그대로 사용한다.
+
+    python fonts.py
+"""
+import glob
+import importlib.util
+import io
+import os
+import threading
+import tokenize
+
+from database import pooled_connection
+import assets
+
+# fontTools 가 없으면 서브셋 생성 기능을 끈다.
+# 임포트에 수백 ms 가 걸리므로 설치 여부만 확인하고, 실제 서브셋을 만들 때 불러온다
+FONTTOOLS_AVAILABLE = importlib.util.find_spec("fontTools") is not None
+
+try:
+    import brotli  # noqa: F401  (fontTools 의 woff2 저장에 필요)
+    SUBSET_FLAVOR = "woff2"
+except ImportError:
+    SUBSET_FLAVOR = "woff"
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FONT_DIR = os.path.join(assets.STATIC_DIR, "font")
+GENERATED_DIR = os.path.join(FONT_DIR, "generated")
+GLYPHS_FILE = os.path.join(GENERATED_DIR, "glyphs.txt")
+DYNAMIC_CSS = "font/generated/pretendard-dynamic.css"
+DYNAMIC_CSS_PATH = os.path.join(GENERATED_DIR, "pretendard-dynamic.css")
+DEFAULT_STYLESHEETS = ["font/pretendard.css", "font/pretendard-subset.css"]
+
+# (파일 이름, font-weight)
+WEIGHTS = [
+    ("Black", 900), ("ExtraBold", 800), ("Bold", 700),
+    ("SemiBold", 600), ("Medium", 500), ("Regular", 400),
+    ("Light", 300), ("ExtraLight", 200), ("Thin", 100),
+]
+
+# 레이아웃/그래프 문자열을 수집할 파이썬 모듈 (dashboard.PAGES 의 모든 페이지는 dashboard.py/panels.py 에서 만들어짐)
+# dashboard 가 이 모듈을 import 하므로 PAGES 에서 끌어오지 않고 파일 이름으로 둔다
+LAYOUT_SOURCES = ["dashboard.py", "panels.py", "graphs.py", "live_refresh.py", "snapshot.py"]
+
+# 항상 포함할 글자: 출력 가능한 ASCII 전체 (숫자, 단위, 기호 등)
+BASE_GLYPHS = {chr(c) for c in range(0x20, 0x7F)}
+
+_LICENSE_HEADER = """/*
+Copyright (c) 2021 Kil Hyung-jin, with Reserved Font Name Pretendard.
+https://github.com/orioncactus/pretendard
+
+This Font Software is licensed under the SIL Open Font License, Version 1.1.
+This license is copied below, and is also available with a FAQ at:
+http://scripts.sil.org/OFL
+*/
+"""
+
+_build_lock = threading.Lock()
+# 폰트 CSS 가 바뀌었을 때 갱신할 Dash external_stylesheets 목록들
+_stylesheet_targets = []
+
+
+def _db_glyphs():
+    glyphs = set()
+    with pooled_connection() as conn:
+        for sql in ("SELECT name, manager FROM projects",
+                    'SELECT Milestone, Status, "세부 목표", 담당자 FROM milestones'):
+            for row in conn.execute(sql):
+                for value in row:
+                    if value is not None:
+                        glyphs.update(str(value))
+    return glyphs
+
+
+def _template_glyphs():
+    glyphs = set()
+    for path in glob.glob(os.path.join(BASE_DIR, "templates", "*.html")):
+        with open(path, encoding="utf-8") as f:
+            glyphs.update(f.read())
+    return glyphs
+
+
+def _layout_glyphs():
+    """레이아웃 모듈의 문자열 리터럴만 수집 (주석은 화면에 나오지 않으므로 제외)."""
+    glyphs = set()
+    for name in LAYOUT_SOURCES:
+        path = os.path.join(BASE_DIR, name)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        for token in tokenize.generate_tokens(io.StringIO(source).readline):
+            if token.type == tokenize.STRING:
+                glyphs.update(token.string)
+    return glyphs
+
+
+def collect_glyphs():
+    glyphs = BASE_GLYPHS | _db_glyphs() | _template_glyphs() | _layout_glyphs()
+    # 제어 문자, 공백류는 폰트와 무관
+    return {g for g in glyphs if g.isprintable() and (g == " " or not g.isspace())}
+
+
+def _read_saved_glyphs():
+    if not os.path.exists(GLYPHS_FILE):
+        return None
+    with open(GLYPHS_FILE, encoding="utf-8") as f:
+        return set(f.read())
+
+
+def _unicode_ranges(codepoints):
+    """정렬된 코드포인트 목록을 연속 구간 [(start, end), ...] 으로 묶는다."""
+    ranges = []
+    for cp in sorted(codepoints):
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return ranges
+
+
+def _complement_ranges(ranges, maximum=0x10FFFF):
+    result = []
+    next_start = 0
+    for start, end in ranges:
+        if start > next_start:
+            result.append([next_start, start - 1])
+        next_start = end + 1
+    if next_start <= maximum:
+        result.append([next_start, maximum])
+    return result
+
+
+def _format_ranges(ranges):
+    return ", ".join(f"U+{s:X}" if s == e else f"U+{s:X}-{e:X}" for s, e in ranges)
+
+
+def _subset_font(source_path, output_path, text):
+    from fontTools import subset as ft_subset  # 첫 생성 시에만 로드
+    from fontTools.ttLib import TTFont
+
+    options = ft_subset.Options()
+    options.flavor = SUBSET_FLAVOR
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+    font = TTFont(source_path)
+    subsetter = ft_subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    font.flavor = SUBSET_FLAVOR
+    tmp_path = output_path + ".tmp"
+    font.save(tmp_path)
+    os.replace(tmp_path, output_path)
+
+
+def _write_css(glyphs):
+    subset_ranges = _unicode_ranges(ord(g) for g in glyphs)
+    subset_range_text = _format_ranges(subset_ranges)
+    fallback_range_text = _format_ranges(_complement_ranges(subset_ranges))
+    blocks = [_LICENSE_HEADER]
+    for name, weight in WEIGHTS:
+        blocks.append(
+            "@font-face {\n"
+            "\tfont-family: 'Pretendard';\n"
+            f"\tfont-weight: {weight};\n"
+            "\tfont-display: swap;\n"
+            f"\tsrc: local('Pretendard {name}'), url(./Pretendard-{name}.dynamic.{SUBSET_FLAVOR}) format('{SUBSET_FLAVOR}');\n"
+            f"\tunicode-range: {subset_range_text};\n"
+            "}\n"
+        )
+        # 서브셋에 없는 글자는 전체 폰트에서 가져옴 (해당 글자가 화면에 나올 때만 다운로드)
+        blocks.append(
+            "@font-face {\n"
+            "\tfont-family: 'Pretendard';\n"
+            f"\tfont-weight: {weight};\n"
+            "\tfont-display: swap;\n"
+            f"\tsrc: local('Pretendard {name}'), url(../woff2/Pretendard-{name}.woff2) format('woff2'), "
+            f"url(../woff/Pretendard-{name}.woff) format('woff');\n"
+            f"\tunicode-range: {fallback_range_text};\n"
+            "}\n"
+        )
+    with open(DYNAMIC_CSS_PATH + ".tmp", "w", encoding="utf-8") as f:
+        f.write("\n".join(blocks))
+    os.replace(DYNAMIC_CSS_PATH + ".tmp", DYNAMIC_CSS_PATH)
+
+
+def build_font_subsets(glyphs):
+    """글자 집합으로 굵기별 서브셋 폰트와 pretendard-dynamic.css 를 생성."""
+    os.makedirs(GENERATED_DIR, exist_ok=True)
+    text = "".join(sorted(glyphs))
+    for name, _ in WEIGHTS:
+        _subset_font(os.path.join(FONT_DIR, "woff", f"Pretendard-{name}.woff"),
+                     os.path.join(GENERATED_DIR, f"Pretendard-{name}.dynamic.{SUBSET_FLAVOR}"),
+                     text)
+    _write_css(glyphs)
+    # glyphs.txt 는 마지막에 기록: 중간에 실패하면 다음 실행 때 다시 생성됨
+    with open(GLYPHS_FILE + ".tmp", "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(GLYPHS_FILE + ".tmp", GLYPHS_FILE)
+
+
+def _build_font_assets():
+    """
+    생성된 폰트 파일만 해시된 이름으로 다시 만든다 (다른 정적 파일은 그대로).
+    이전 서브셋은 캐시된 레이아웃/스냅샷, 다른 워커, 열린 페이지가 아직 참조하므로 바로 지우지 않고
+    assets.prune_stale 의 유예 시간이 지난 뒤 지운다.
+    """
+    paths = sorted(os.path.relpath(path, assets.STATIC_DIR).replace(os.sep, "/")
+                   for path in glob.glob(os.path.join(GENERATED_DIR, "*")))
+    assets.build_assets(paths=paths, clean=False)
+    assets.prune_stale()
+
+
+def ensure_font_subsets():
+    """
+    현재 필요한 글자가 이미 생성된 서브셋에 모두 포함되어 있는지 확인하고,
+    새 글자가 있으면 (기존 글자 + 새 글자) 로 다시 생성한다. 생성했으면 True.
+    """
+    if not FONTTOOLS_AVAILABLE:
+        return False
+    with _build_lock:
+        glyphs = collect_glyphs()
+        saved = _read_saved_glyphs()
+        if saved is not None and glyphs <= saved and os.path.exists(DYNAMIC_CSS_PATH):
+            return False
+        # 지워진 이름의 글자도 유지해서 사소한 변경마다 폰트 URL이 바뀌지 않게 함
+        build_font_subsets(glyphs | (saved or set()))
+        _build_font_assets()
+        _refresh_stylesheet_targets()
+        return True
+
+
+def ensure_font_subsets_async():
+    """쓰기 요청 후 호출: 응답을 막지 않도록 백그라운드 스레드에서 확인/생성."""
+    thread = threading.Thread(target=ensure_font_subsets, name="font-subset", daemon=True)
+    thread.start()
+    return thread
+
+
+def font_stylesheets():
+    """현재 사용할 폰트 CSS (static 기준 경로) 목록."""
+    if FONTTOOLS_AVAILABLE and os.path.exists(DYNAMIC_CSS_PATH):
+        return [DYNAMIC_CSS]
+    return list(DEFAULT_STYLESHEETS)
+
+
+def font_stylesheet_urls():
+    return [assets.asset_url(path) for path in font_stylesheets()]
+
+
+def register_stylesheets(stylesheets):
+    """
+    Dash 의 external_stylesheets 목록을 등록해 두면,
+    폰트가 다시 생성될 때 같은 리스트 객체를 새 URL로 갱신한다.
+    """
+    stylesheets[:] = font_stylesheet_urls()
+    _stylesheet_targets.append(stylesheets)
+    return stylesheets
+
+
+def _refresh_stylesheet_targets():
+    urls = font_stylesheet_urls()
+    for stylesheets in _stylesheet_targets:
+        stylesheets[:] = urls
+
+
+def init_fonts(flask_app, build=True):
+    """
+    템플릿 함수 font_stylesheet_urls 를 등록하고, 서브셋 폰트를 백그라운드에서 준비.
+    build=False 면 이미 생성된 서브셋(또는 기본 CSS)만 사용한다.
+    """
+    flask_app.jinja_env.globals["font_stylesheet_urls"] = font_stylesheet_urls
+    if build:
+        ensure_font_subsets_async()
+
+
+if __name__ == "__main__":
+    if not FONTTOOLS_AVAILABLE:
+        raise SystemExit("fontTools is required: pip install fonttools brotli")
+    glyph_set = collect_glyphs()
+    build_font_subsets(glyph_set)
+    _build_font_assets()
+    print(f"Built {len(WEIGHTS)} subset fonts ({SUBSET_FLAVOR}) for {len(glyph_set)} glyphs")
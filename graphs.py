@@ -1,12 +1,10 @@
 import math
-import pandas as pd
+import zlib
 from datetime import datetime, timedelta
 import plotly.graph_objs as go
-import plotly.express as px
 from dash import dcc, html
 
 from utils import get_status_color, calculate_progress
-from database import get_projects, get_milestones, DB_NAME
 
 # 미리 지정한 색상 리스트 (15개 이상)
 my_colors = [
@@ -17,33 +15,31 @@ my_colors = [
     "#FF8000", "#0048FF", "#00FF2F",
 ]
 
+def project_color(project_id=None, name=""):
+    """
+    연구과제 색상. 안정적인 식별자인 id 순서대로 my_colors 를 돌려 쓰므로
+    요청 순서, 워커, 재시작과 관계없이 항상 같은 색이고 이름을 바꿔도 유지되며 상태를 저장하지 않는다.
+    id 를 모르면(연구과제에 없는 마일스톤 이름, 예시 데이터) 이름의 crc32 로 고른다.
+    """
+    if project_id is not None:
+        return my_colors[(project_id - 1) % len(my_colors)]
+    return my_colors[zlib.crc32(name.strip().encode("utf-8")) % len(my_colors)]
+
 def get_color_mapping_from_projects(projects):
     """
-    projects: 연구과제 목록 (각 항목은 dict, "name" 키 포함)
-    각 프로젝트 이름에서 앞뒤 공백만 제거한 원본 문자열을 기준으로,
-    고유한 이름을 정렬하여 my_colors 리스트 순서대로 색상을 할당하는 사전을 반환.
+    projects: 연구과제 목록 (각 항목은 dict, "id", "name" 키 포함)
+    앞뒤 공백을 제거한 연구과제 이름 -> 색상 사전 (이름이 같은 과제가 있으면 먼저 나온 과제 기준).
+    마일스톤은 연구과제를 이름으로 가리키므로 타임라인 색상에 사용한다.
     """
-    cleaned_names = [p["name"].strip() for p in projects]
-    unique_names = sorted(set(cleaned_names))
-    mapping = {name: my_colors[i % len(my_colors)] for i, name in enumerate(unique_names)}
+    mapping = {}
+    for p in projects:
+        mapping.setdefault(p["name"].strip(), project_color(p.get("id"), p["name"]))
     return mapping
 
-# 전역 변수: COLOR_MAPPING (애플리케이션 초기 실행 시 업데이트)
-COLOR_MAPPING = {}
-
 def create_progress_graph(projects):
-    global COLOR_MAPPING
-    # 프로젝트 목록을 순회하면서, COLOR_MAPPING에 누락된 이름이 있으면 추가
-    for p in projects:
-        key = p["name"].strip()
-        if key not in COLOR_MAPPING:
-            # 기존 매핑 개수를 기준으로 새로운 색상 할당 (색상 리스트를 순환)
-            COLOR_MAPPING[key] = my_colors[len(COLOR_MAPPING) % len(my_colors)]
-    # print("Progress COLOR_MAPPING:", COLOR_MAPPING)
-    
     # 프로젝트 이름은 앞뒤 공백만 제거하여 사용
     project_names = [p["name"].strip() for p in projects]
-    colors = [COLOR_MAPPING[p["name"].strip()] for p in projects]
+    colors = [project_color(p.get("id"), p["name"]) for p in projects]
     
     fig = go.Figure()
     fig.add_trace(go.Bar(
@@ -187,14 +183,159 @@ def create_research_graphs(projects):
         }
     )
 
-def create_milestone_graph(milestones_data):
+# 서브플롯 가로 배치 비율 (플롯 7 : 간격 3, 기존 카드 사이 간격과 비슷하게)
+RESEARCH_PLOT_UNITS = 7
+RESEARCH_GAP_UNITS = 3
+# 서브플롯 하나의 최소 너비(px). 프로젝트가 많으면 그래프를 이보다 좁히지 않고 가로 스크롤
+RESEARCH_SUBPLOT_MIN_WIDTH = 260
+
+def research_domains(num_projects):
+    """
+    1행 N열 서브플롯의 x 도메인 목록 [(시작, 끝), ...].
+    정수 단위로 나눈 뒤 한 번만 나누므로 실수 오차가 쌓이지 않고, 끝값은 1.0 을 넘지 않는다
+    (Plotly 는 도메인이 [0, 1] 을 벗어나면 ValueError).
+    """
+    step = RESEARCH_PLOT_UNITS + RESEARCH_GAP_UNITS
+    total = max(num_projects * step - RESEARCH_GAP_UNITS, 1)
+    return [(min(1.0, i * step / total), min(1.0, (i * step + RESEARCH_PLOT_UNITS) / total))
+            for i in range(num_projects)]
+
+def create_research_figure(projects):
+    """
+    create_research_graphs 의 단일 Figure 버전.
+    프로젝트별 Figure/dcc.Graph 를 따로 만들지 않고, 1행 N열 서브플롯 하나에 모든 프로젝트를 그린다.
+    (템플릿/레이아웃이 한 번만 직렬화되고 브라우저의 Plotly 인스턴스도 하나)
+    """
+    category_colors = {
+        "논문": "#ECECEC",
+        "특허": "#8A8A8A",
+        "SW": "#5E5E5E"
+    }
+    categories = list(category_colors.keys())
+    domains = research_domains(len(projects))
+
+    traces = []
+    layout = {}
+    annotations = []
+    for i, (project, (start, end)) in enumerate(zip(projects, domains)):
+        suffix = "" if i == 0 else str(i + 1)
+        final_results = [
+            project.get("goal_papers", 0),
+            project.get("goal_patents_filed", 0) + project.get("goal_patents_registered", 0),
+            project.get("goal_software", 0)
+        ]
+        current_results = [
+            project.get("current_papers", 0),
+            project.get("current_patents_filed", 0) + project.get("current_patents_registered", 0),
+            project.get("current_software", 0)
+        ]
+        current_values = [min(c, f) for c, f in zip(current_results, final_results)]
+        remaining_values = [max(f - c, 0) for c, f in zip(current_results, final_results)]
+
+        traces.append(go.Bar(
+            name="현재 달성", x=categories, y=current_values,
+            marker=dict(color=[category_colors[cat] for cat in categories]),
+            xaxis="x" + suffix, yaxis="y" + suffix
+        ))
+        traces.append(go.Bar(
+            name="남은 목표", x=categories, y=remaining_values,
+            marker=dict(color="#3C3C49"),
+            xaxis="x" + suffix, yaxis="y" + suffix
+        ))
+
+        layout["xaxis" + suffix] = dict(
+            domain=[start, end], anchor="y" + suffix,
+            showticklabels=False, linecolor="white", linewidth=2, side="bottom"
+        )
+        layout["yaxis" + suffix] = dict(
+            anchor="x" + suffix, tickmode="linear", dtick=1,
+            showgrid=True, gridcolor="#545464", gridwidth=1, tickson="boundaries",
+            tickfont=dict(family="Pretendard", size=20, color="white")
+        )
+        annotations.append(dict(
+            text=project["name"].strip(),
+            x=(start + end) / 2,
+            y=-0.20,
+            xref="paper",
+            yref="paper",
+            showarrow=False,
+            font=dict(family="Pretendard", size=36, color="white")
+        ))
+
+    # 레이아웃을 생성자에 한 번에 넘겨서 검증도 한 번만 수행
+    layout.update(
+        template="plotly_dark",
+        barmode="stack",
+        height=400,
+        margin=dict(l=40, r=20, t=40, b=70),
+        showlegend=False,
+        paper_bgcolor="#2E2E3E",
+        plot_bgcolor="#2E2E3E",
+        annotations=annotations
+    )
+    return go.Figure(data=traces, layout=layout)
+
+# 마일스톤 타임라인에 기본으로 보이는 기간 (오늘부터 21일)
+MILESTONE_VIEW_DAYS = 21
+
+
+def milestone_view_range(now=None):
+    now = now or datetime.now()
+    return [now, now + timedelta(days=MILESTONE_VIEW_DAYS)]
+
+
+def _parse_datetime(value):
+    return datetime.fromisoformat(str(value))
+
+
+def _timeline_traces(milestones, colors):
+    """
+    plotly.express.timeline(x_start="Start", x_end="Finish", y="Milestone", color="Milestone") 과 같은
+    Gantt 트레이스를 pandas 없이 만든다: 연구과제(Milestone)마다 가로 막대 트레이스 하나,
+    base 는 시작 시각, x 는 기간(ms). colors 에 없는 이름은 project_color(name=...) 로.
+    """
+    groups = {}  # Milestone -> 막대 값들 (처음 나온 순서 유지)
+    for m in milestones:
+        # Milestone 값은 strip()만 적용 (원본 그대로 사용)
+        name = m["Milestone"].strip()
+        start, finish = _parse_datetime(m["Start"]), _parse_datetime(m["Finish"])
+        group = groups.setdefault(name, {"base": [], "x": [], "text": []})
+        group["base"].append(start.isoformat())
+        group["x"].append((finish - start) // timedelta(milliseconds=1))
+        # label: 세부 목표만 사용 (추가 공백 포함)
+        group["text"].append(f"{m['세부 목표']}    ")
+
+    return [
+        go.Bar(
+            name=name,
+            legendgroup=name,
+            showlegend=True,
+            orientation="h",
+            base=group["base"],
+            x=group["x"],
+            y=[name] * len(group["x"]),
+            text=group["text"],
+            marker=dict(color=colors.get(name) or project_color(name=name), pattern=dict(shape="")),
+            hovertemplate="Milestone=%{y}<br>Start=%{base}<br>Finish=%{x}<br>label=%{text}<extra></extra>",
+            textposition="inside",
+            textfont=dict(family="Pretendard", size=36, color="white"),
+            width=0.95,
+            xaxis="x",
+            yaxis="y",
+        )
+        for name, group in groups.items()
+    ]
+
+
+def create_milestone_figure(milestones_data, x_range=None, placeholder=True, projects=()):
     """
     milestones_data: DB에서 불러온 마일스톤 데이터 리스트 
       (각 항목은 딕셔너리이며, 키는 "Milestone", "Start", "Finish", "Status", "세부 목표", "담당자" 등을 포함)
+    x_range: 보이는 x 범위 (기본: milestone_view_range())
+    placeholder: 데이터가 없을 때 예시 데이터를 보여줄지 여부 (기간 조회 결과가 비었을 때는 False)
+    projects: (id, name) 연구과제 목록. 진행률/예산 그래프와 같은 색을 쓰기 위해 이름으로 id 를 찾는다
     """
-    df = pd.DataFrame(milestones_data)
-    
-    if df.empty:
+    if not milestones_data and placeholder:
         now = datetime.now()
         data = [
             {
@@ -278,47 +419,21 @@ def create_milestone_graph(milestones_data):
                 "세부 목표": "특허 등록"
             },
         ]
-        df = pd.DataFrame(data)
-    
-    if "담당자" not in df.columns:
-        df["담당자"] = ""
+        milestones_data = data
     
-    # label: 세부 목표만 사용 (추가 공백 포함)
-    df["label"] = df["세부 목표"].astype(str) + "    "
-    
-    # Milestone 값은 strip()만 적용 (원본 그대로 사용)
-    df["Milestone"] = df["Milestone"].str.strip()
-    unique_milestones = sorted(set(df["Milestone"]))
-    
-    global COLOR_MAPPING
-    # 전역 COLOR_MAPPING에 누락된 Milestone 이름이 있으면 추가
-    for name in unique_milestones:
-        if name not in COLOR_MAPPING:
-            COLOR_MAPPING[name] = my_colors[len(COLOR_MAPPING) % len(my_colors)]
-    # print("COLOR_MAPPING:", COLOR_MAPPING)
-    
-    fig = px.timeline(
-        df,
-        x_start="Start",
-        x_end="Finish",
-        y="Milestone",
-        color="Milestone",
-        text="label",
-        color_discrete_map=COLOR_MAPPING
-    )
-    
-    fig.update_yaxes(autorange="reversed")
-    
-    for trace in fig.data:
-        trace.update(
-            textposition='inside',
-            textfont=dict(family="Pretendard", size=36, color="white"),
-            width=0.95,
-        )
-    
-    now = datetime.now()
-    two_weeks_later = now + timedelta(days=21)
-    fig.update_layout(xaxis_range=[now, two_weeks_later])
+    if not milestones_data:
+        # 보이는 기간에 마일스톤이 없음: 빈 타임라인 (축 스타일은 아래에서 동일하게 적용)
+        fig = go.Figure()
+        fig.update_xaxes(type="date")
+    else:
+        fig = go.Figure(data=_timeline_traces(milestones_data, get_color_mapping_from_projects(projects)))
+        # px.timeline 과 같은 축/범례 설정 (연구과제는 처음 나온 순서대로 위에서부터)
+        fig.update_layout(barmode="overlay", legend=dict(title_text="Milestone", tracegroupgap=0))
+        fig.update_xaxes(type="date")
+        fig.update_yaxes(categoryorder="array", categoryarray=[trace.name for trace in reversed(fig.data)],
+                         autorange="reversed")
+
+    fig.update_layout(xaxis_range=x_range or milestone_view_range())
     
     fig.update_layout(
         title=dict(
@@ -351,65 +466,90 @@ def create_milestone_graph(milestones_data):
     )
     fig.update_yaxes(tickfont=dict(family="Pretendard", size=36, color="white"))
     
+    return fig
+
+
+def create_milestone_graph(milestones_data, x_range=None, placeholder=True, projects=(), **graph_props):
     return dcc.Graph(
-        figure=fig,
+        figure=create_milestone_figure(milestones_data, x_range, placeholder, projects),
         style={
             "width": "100%",
             "maxWidth": "100%",
             "height": "100%",
             "overflowX": "hidden"
-        }
+        },
+        **graph_props
     )
 
-def create_budget_graph(projects):
-    fig = go.Figure()
+# 예산 게이지 배치: 한 행에 최대 BUDGET_MAX_COLUMNS 개, 넘으면 여러 행으로
+BUDGET_MAX_COLUMNS = 12
+BUDGET_ROW_HEIGHT = 350
+BUDGET_ROW_GAP = 0.25       # 행 사이 간격 (셀 높이 대비 비율, 아래 행 게이지와 제목이 겹치지 않도록)
 
-    # 각 프로젝트의 제목에 따른 색상 할당 (COLOR_MAPPING에 없는 경우 기본값 "#FFD700")
-    # (COLOR_MAPPING은 미리 정의되어 있다고 가정)
-    for p in projects:
-        bar_color = COLOR_MAPPING.get(p["name"].strip(), "#FFD700")
-        fig.add_trace(go.Indicator(
-            mode="gauge+number",
-            value=p["current_expenditure"],
-            # 기존 title 속성을 제거하여, 제목은 annotation으로 처리합니다.
-            gauge={
-                "axis": {
-                    "range": [0, p["total_cost"]],
-                    "tickfont": {"family": "Pretendard", "size": 18, "color": "white"},
-                    "showticklabels": True
-                },
-                "bar": {"color": bar_color},
-                "bordercolor": "#ECECEC",
-                "steps": [
-                    {"range": [0, p["total_cost"] * 0.5], "color": "#3C3C49"},
-                    {"range": [p["total_cost"] * 0.5, p["total_cost"]], "color": "#8A8A8A"}
-                ],
-                "threshold": {
-                    "line": {"color": "red", "width": 4},
-                    "thickness": 0.75,
-                    "value": p["total_cost"] * 0.9
-                }
+# bullet 차트: 한 행 높이(px)와 전체 최대 높이
+BULLET_ROW_HEIGHT = 26
+BULLET_MAX_HEIGHT = 1600
+
+
+def budget_grid(count, max_columns=BUDGET_MAX_COLUMNS):
+    """게이지 count 개를 놓을 (행, 열) 수."""
+    columns = max(1, min(count, max_columns))
+    rows = max(1, math.ceil(count / columns))
+    return rows, columns
+
+
+def _budget_gauge(p, bar_color, row, column):
+    return go.Indicator(
+        mode="gauge+number",
+        value=p["current_expenditure"],
+        # 기존 title 속성을 제거하여, 제목은 annotation으로 처리합니다.
+        gauge={
+            "axis": {
+                "range": [0, p["total_cost"]],
+                "tickfont": {"family": "Pretendard", "size": 18, "color": "white"},
+                "showticklabels": True
             },
-            domain={"row": 0, "column": projects.index(p)}
-        ))
-    
-    # grid 설정: 1행, n열
-    fig.update_layout(
-        template="plotly_dark",
-        grid={"rows": 1, "columns": len(projects)},
-        height=350,
-        margin=dict(l=40, r=20, t=50, b=80),  # 하단 여백을 늘려서 annotation 공간 확보
-        paper_bgcolor="#2E2E3E",
-        plot_bgcolor="#2E2E3E"
+            "bar": {"color": bar_color},
+            "bordercolor": "#ECECEC",
+            "steps": [
+                {"range": [0, p["total_cost"] * 0.5], "color": "#3C3C49"},
+                {"range": [p["total_cost"] * 0.5, p["total_cost"]], "color": "#8A8A8A"}
+            ],
+            "threshold": {
+                "line": {"color": "red", "width": 4},
+                "thickness": 0.75,
+                "value": p["total_cost"] * 0.9
+            }
+        },
+        domain={"row": row, "column": column}
     )
-    
-    # 각 게이지 아래에 연구과제 제목(annotation) 추가
-    num_projects = len(projects)
+
+
+def create_budget_graph(projects, max_columns=BUDGET_MAX_COLUMNS):
+    """
+    프로젝트별 예산 게이지를 행 x 열 grid 로 배치한 Figure.
+    (max_columns 이하면 기존과 같은 1행 배치)
+    """
+    rows, columns = budget_grid(len(projects), max_columns)
+    # plotly grid 와 같은 방식으로 행의 세로 위치를 계산해 제목을 각 행 아래에 둠
+    grid = {"rows": rows, "columns": columns}
+    row_gap = 0
+    if rows > 1:
+        row_gap = grid["ygap"] = BUDGET_ROW_GAP
+    row_step = 1 / (rows - row_gap)
+
+    # 각 프로젝트의 제목에 따른 색상 할당 (진행률/마일스톤 그래프와 같은 색)
+    traces = []
+    annotations = []
     for i, p in enumerate(projects):
-        # grid의 각 셀는 전체 width에서 (i/n ~ (i+1)/n)에 해당하므로 중앙은 (i+0.5)/n
-        fig.add_annotation(
-            x=(i + 0.48) / num_projects,
-            y=-0.05,  # y축 paper 좌표: 0보다 낮게 설정하여 게이지 아래에 위치
+        row, column = divmod(i, columns)
+        bar_color = project_color(p.get("id"), p["name"])
+        traces.append(_budget_gauge(p, bar_color, row, column))
+        # grid의 각 셀는 전체 width에서 (i/n ~ (i+1)/n)에 해당하므로 중앙은 (i+0.48)/n
+        row_bottom = row_step * (rows - 1 - row)
+        annotations.append(dict(
+            x=(column + 0.48) / columns,
+            y=row_bottom - 0.05 / rows,  # 게이지 아래에 위치 (1행이면 기존과 같은 -0.05)
             xref="paper",
             yref="paper",
             text=f"<b>{p['name']}</b>",
@@ -417,6 +557,74 @@ def create_budget_graph(projects):
             font={"family": "Pretendard", "size": 20, "color": "white"},
             xanchor="center",
             yanchor="top"
-        )
-    
-    return fig
\ No newline at end of file
+        ))
+
+    # 트레이스와 레이아웃을 한 번에 넘겨서 게이지 수에 비례하는 시간만 들도록 함
+    return go.Figure(data=traces, layout=dict(
+        template="plotly_dark",
+        grid=grid,
+        height=BUDGET_ROW_HEIGHT * rows,
+        margin=dict(l=40, r=20, t=50, b=80),  # 하단 여백을 늘려서 annotation 공간 확보
+        paper_bgcolor="#2E2E3E",
+        plot_bgcolor="#2E2E3E",
+        annotations=annotations
+    ))
+
+
+def create_budget_bullet(projects):
+    """
+    게이지 대신 가로 막대(bullet) 하나의 트레이스로 모든 프로젝트의 집행률을 표시.
+    프로젝트 수가 많아도 트레이스가 하나라서 수천 개까지 그릴 수 있다.
+    집행률(%) 기준이므로 배경 구간(50%)과 경고선(90%)은 모든 막대에 공통이다.
+    """
+    count = len(projects)
+    names = [p["name"].strip() for p in projects]
+    ratios = [
+        round(p["current_expenditure"] / p["total_cost"] * 100, 1) if p["total_cost"] else 0
+        for p in projects
+    ]
+    height = min(max(BUDGET_ROW_HEIGHT, BULLET_ROW_HEIGHT * count + 130), BULLET_MAX_HEIGHT)
+    # 행이 너무 좁아지면 이름 라벨은 숨기고 hover 로만 표시
+    show_labels = count and (height - 130) / count >= 20
+
+    trace = go.Bar(
+        orientation="h",
+        x=ratios,
+        # 같은 이름이 있어도 막대가 합쳐지지 않도록 y 는 순번으로 두고 라벨만 이름으로 표시
+        y=list(range(count)),
+        marker=dict(color=[project_color(p.get("id"), p["name"]) for p in projects]),
+        customdata=[[name, p["current_expenditure"], p["total_cost"]] for name, p in zip(names, projects)],
+        hovertemplate="<b>%{customdata[0]}</b><br>%{customdata[1]} / %{customdata[2]} 억원 (%{x}%)<extra></extra>",
+        width=0.6
+    )
+    return go.Figure(data=[trace], layout=dict(
+        template="plotly_dark",
+        height=height,
+        margin=dict(l=40, r=20, t=30, b=50),
+        paper_bgcolor="#2E2E3E",
+        plot_bgcolor="#2E2E3E",
+        showlegend=False,
+        xaxis=dict(
+            range=[0, max([100] + ratios) * 1.05],
+            ticksuffix="%",
+            tickfont=dict(family="Pretendard", size=18, color="white"),
+            showgrid=False
+        ),
+        yaxis=dict(
+            autorange="reversed",
+            tickmode="array",
+            tickvals=list(range(count)) if show_labels else [],
+            ticktext=names if show_labels else [],
+            tickfont=dict(family="Pretendard", size=18, color="white"),
+            automargin=True
+        ),
+        shapes=[
+            # 게이지의 steps / threshold 와 같은 색 구간
+            dict(type="rect", xref="x", yref="paper", x0=0, x1=50, y0=0, y1=1,
+                 fillcolor="#3C3C49", line_width=0, layer="below"),
+            dict(type="rect", xref="x", yref="paper", x0=50, x1=100, y0=0, y1=1,
+                 fillcolor="#8A8A8A", opacity=0.4, line_width=0, layer="below"),
+            dict(type="line", xref="x", yref="paper", x0=90, x1=90, y0=0, y1=1,
+                 line=dict(color="red", width=4))
+        ]
+    ))
\ No newline at end of file
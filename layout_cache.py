@@ -0,0 +1,79 @@
+# layout_cache.py
+import datetime
+import threading
+
+import metrics
+from database import get_data_version
+
+
+class LayoutCache:
+    """
+    Dash serve_layout 결과를 (데이터 버전, 오늘 날짜) 기준으로 캐시한다.
+    DB에 쓰기가 있었거나 날짜가 바뀐 경우에만 레이아웃을 다시 만든다.
+    여러 키오스크가 동시에 새로고침해도 같은 레이아웃은 한 번만 생성된다.
+    """
+
+    def __init__(self):
+        self._entries = {}      # name -> (token, layout)
+        self._build_locks = {}  # name -> Lock (동시 요청 중 한 요청만 빌드)
+        self._lock = threading.Lock()
+        self._stats = {}        # name -> {"hits", "misses"}
+
+    def _token(self):
+        return (get_data_version(), datetime.date.today())
+
+    def _count(self, name, key):
+        with self._lock:
+            stats = self._stats.setdefault(name, {"hits": 0, "misses": 0})
+            stats[key] += 1
+        if metrics.enabled():
+            metrics.LAYOUT_CACHE_TOTAL.inc(name, "hit" if key == "hits" else "miss")
+
+    def _build_lock(self, name):
+        with self._lock:
+            return self._build_locks.setdefault(name, threading.Lock())
+
+    def get(self, name, builder):
+        token = self._token()
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == token:
+            self._count(name, "hits")
+            return entry[1]
+
+        with self._build_lock(name):
+            # 락을 기다리는 동안 다른 요청이 이미 빌드했을 수 있음
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == token:
+                self._count(name, "hits")
+                return entry[1]
+            self._count(name, "misses")
+            # 빌드 전에 구한 토큰으로 저장: 빌드 중 쓰기가 들어오면 다음 요청에서 다시 빌드됨
+            layout = builder()
+            self._entries[name] = (token, layout)
+            return layout
+
+    def invalidate(self, name=None):
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+    def stats(self):
+        with self._lock:
+            result = {name: dict(s) for name, s in self._stats.items()}
+        for s in result.values():
+            total = s["hits"] + s["misses"]
+            s["hit_ratio"] = round(s["hits"] / total, 4) if total else 0.0
+        return result
+
+
+# 애플리케이션 전체에서 공유하는 캐시
+layout_cache = LayoutCache()
+
+
+def cached_layout(name, builder):
+    """dash_app.layout 에 지정할 수 있는 캐시된 레이아웃 함수를 반환."""
+    def serve_cached_layout():
+        return layout_cache.get(name, builder)
+    return serve_cached_layout
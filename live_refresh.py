@@ -0,0 +1,101 @@
+# live_refresh.py
+"""
+키오스크용 실시간 갱신 모드.
+
+페이지를 새로고침하지 않고 dcc.Interval 타이머(또는 events.py 의 SSE 알림)로 서버에 변경 여부를 묻는다.
+- 데이터 버전이 그대로면 아무것도 보내지 않음 (PreventUpdate → 204 응답)
+- 바뀌었으면 데이터가 실제로 달라진 패널의 figure / children 과 KPI 값만 부분 갱신
+- SSE 알림으로 호출된 경우 알림의 테이블을 사용하는 패널만 확인한다
+"""
+from datetime import datetime
+
+from dash import ALL, callback_context, dcc, no_update, Input, Output, State
+from dash.exceptions import PreventUpdate
+
+from database import get_change_seq, get_last_modified
+from panels import PANELS, PANEL_PROPS, PanelData, build_panels
+
+INTERVAL_ID = "live-refresh-interval"
+STATE_ID = "live-refresh-state"
+EVENT_ID = "live-refresh-event"     # SSE 로 받은 변경 알림 (클라이언트 스크립트가 data 를 설정)
+LAST_UPDATE_ID = "last-update"
+
+
+def _version_token():
+    # DB 에 저장된 마지막 변경 번호(change_log)와 날짜: 어느 워커가 응답해도 같은 데이터면 같은 토큰
+    return f"{get_change_seq()}:{datetime.now().date()}"
+
+
+def last_update_text():
+    # 데이터의 최종 수정 시간 (변경 이력 기준, WAL 에 쌓인 커밋도 반영)
+    db_last_update = datetime.fromtimestamp(get_last_modified()).strftime("%Y-%m-%d")
+    return f"마지막 업데이트: {db_last_update}"
+
+
+def live_state(panel_names, data):
+    """레이아웃에 심어 둘 현재 상태: 버전 토큰 + 패널별 데이터 지문."""
+    return {
+        "token": _version_token(),
+        "fingerprints": {name: data.fingerprint(name) for name in panel_names},
+    }
+
+
+def live_components(panel_names, data, interval_seconds):
+    """serve_layout 에 추가할 타이머와 상태 저장소 컴포넌트 (interval_seconds 가 0이면 SSE 알림만 사용)."""
+    return [
+        dcc.Interval(id=INTERVAL_ID, interval=max(interval_seconds, 1) * 1000, n_intervals=0,
+                     disabled=interval_seconds <= 0),
+        dcc.Store(id=STATE_ID, data=live_state(panel_names, data)),
+        dcc.Store(id=EVENT_ID),
+    ]
+
+
+def register_live_refresh(dash_app):
+    """
+    모든 페이지가 공유하는 갱신 콜백 하나를 등록한다.
+    패널 id 가 패턴 매칭 id 이므로 prop 별 ALL Output 이 현재 페이지에 있는 패널만 가리키고,
+    확인할 패널은 페이지에 심어 둔 상태(fingerprints)의 목록을 사용한다.
+    """
+    outputs = [Output({"panel": ALL, "prop": prop}, prop) for prop in PANEL_PROPS]
+    outputs += [Output(LAST_UPDATE_ID, "children"), Output(STATE_ID, "data")]
+
+    @dash_app.callback(outputs, Input(INTERVAL_ID, "n_intervals"), Input(EVENT_ID, "data"),
+                       State(STATE_ID, "data"))
+    def refresh(_, event, state):
+        state = state or {}
+        token = _version_token()
+        if state.get("token") == token:
+            raise PreventUpdate
+
+        # SSE 알림이면 해당 테이블을 쓰는 패널만 확인 ("*" 는 다른 프로세스의 쓰기 → 전체 확인)
+        fingerprints = dict(state.get("fingerprints", {}))
+        candidates = list(fingerprints)
+        if callback_context.triggered_id == EVENT_ID and event and event.get("table") != "*":
+            candidates = [name for name in candidates if event.get("table") in PANELS[name].tables]
+        narrowed = len(candidates) < len(fingerprints)
+
+        data = PanelData()
+        changed = []
+        for name in candidates:
+            fingerprint = data.fingerprint(name)
+            if fingerprints.get(name) != fingerprint:
+                changed.append(name)
+            fingerprints[name] = fingerprint
+        # 일부 패널만 확인했으면 토큰은 그대로 둔다: 같은 버전 변경에 섞인 다른 테이블의 쓰기나
+        # 놓친 "*" 알림이 있을 수 있으므로 다음 타이머/알림 때 모든 패널을 다시 확인한다
+        new_state = {"token": state.get("token") if narrowed else token, "fingerprints": fingerprints}
+        # prop 별로 현재 페이지에 있는 패널 이름 (ALL Output 의 순서)
+        present = [[output["id"]["panel"] for output in outputs_list]
+                   for outputs_list in callback_context.outputs_list[:len(PANEL_PROPS)]]
+        if not changed:
+            # 다른 워커의 토큰이거나 결과에 영향 없는 쓰기: 상태만 갱신
+            return [[no_update] * len(names) for names in present] + [no_update, new_state]
+
+        components = build_panels(changed, data)
+        values = [
+            [getattr(components[name], prop) if name in components else no_update for name in names]
+            for prop, names in zip(PANEL_PROPS, present)
+        ]
+        return values + [last_update_text(), new_state]
+
+    return refresh
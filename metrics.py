@@ -0,0 +1,252 @@
+# metrics.py
+"""
+요청 단위 성능 계측과 Prometheus 텍스트 형식(/metrics) 출력.
+
+- 히스토그램/카운터: 라우트별 응답 시간, database.py 함수별 실행 시간, 패널별 생성 시간 등
+- 요청 구간(phase): 한 요청의 시간을 db / layout(그래프 생성) / render(템플릿) 로 나누어 기록하고
+  나머지는 Dash 요청이면 serialize(JSON 직렬화), 그 외에는 other 로 기록한다.
+  구간은 중첩될 수 있으며 각 구간에는 자기 자신의 시간만 (하위 구간 제외) 더한다.
+
+DASHBOARD_METRICS=0 이면 꺼지며, 꺼진 상태의 비용은 함수 호출당 전역 플래그 확인 한 번이다.
+"""
+import bisect
+import functools
+import threading
+import time
+
+from flask import request, template_rendered, before_render_template
+
+# 초 단위 히스토그램 버킷 (SQLite 호출 ~ 큰 레이아웃 생성까지)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Dash 가 레이아웃/콜백 결과를 JSON 으로 직렬화하는 요청 (구간 나머지를 serialize 로 기록)
+SERIALIZE_SUFFIXES = ("/_dash-layout", "/_dash-update-component")
+
+_enabled = True
+_registry = {}      # 이름 -> Histogram / Counter (등록 순서대로 출력)
+_local = threading.local()
+
+
+def enabled():
+    return _enabled
+
+
+def set_enabled(flag):
+    global _enabled
+    _enabled = bool(flag)
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}   # labels -> [버킷별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            items = sorted((labels, list(state)) for labels, state in self._values.items())
+        for labels, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, [('le', repr(bound))])} {cumulative}"
+            yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, [('le', '+Inf')])} {state[-1]}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {state[-2]:.6f}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {state[-1]}"
+
+
+def counter(name, help_text, labelnames=()):
+    return _registry.setdefault(name, Counter(name, help_text, labelnames))
+
+
+def histogram(name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return _registry.setdefault(name, Histogram(name, help_text, labelnames, buckets))
+
+
+REQUEST_SECONDS = histogram("dashboard_http_request_duration_seconds", "HTTP request duration", ["endpoint", "method"])
+REQUESTS_TOTAL = counter("dashboard_http_requests_total", "HTTP requests", ["endpoint", "method", "status"])
+REQUEST_PHASE_SECONDS = histogram("dashboard_http_request_phase_seconds",
+                                  "Time spent per phase of a request (db, layout, render, serialize, other)",
+                                  ["endpoint", "phase"])
+DB_CALL_SECONDS = histogram("dashboard_db_call_seconds", "database.py function duration", ["function"])
+DB_ERRORS_TOTAL = counter("dashboard_db_errors_total", "database.py calls that raised", ["function"])
+PANEL_BUILD_SECONDS = histogram("dashboard_panel_build_seconds", "Dash panel build duration", ["panel"])
+LAYOUT_CACHE_TOTAL = counter("dashboard_layout_cache_requests_total", "Layout cache lookups", ["layout", "result"])
+
+
+# --- 요청 구간 -------------------------------------------------------------------------
+
+def begin_request():
+    _local.phases = {}
+    _local.stack = []
+    _local.start = time.perf_counter()
+
+
+def end_request(endpoint, method, status):
+    phases = getattr(_local, "phases", None)
+    if phases is None:
+        return
+    total = time.perf_counter() - _local.start
+    _local.phases = None
+    REQUEST_SECONDS.observe(total, endpoint, method)
+    REQUESTS_TOTAL.inc(endpoint, method, str(status))
+    for name, seconds in phases.items():
+        REQUEST_PHASE_SECONDS.observe(seconds, endpoint, name)
+    remainder = "serialize" if endpoint.endswith(SERIALIZE_SUFFIXES) else "other"
+    REQUEST_PHASE_SECONDS.observe(max(total - sum(phases.values()), 0.0), endpoint, remainder)
+
+
+def enter_phase(name):
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    # [구간 이름, 시작 시각, 하위 구간 시간]
+    stack.append([name, time.perf_counter(), 0.0])
+
+
+def exit_phase():
+    """현재 구간을 끝내고 전체 경과 시간을 반환 (요청 중이면 하위 구간을 뺀 시간을 구간에 더함)."""
+    stack = getattr(_local, "stack", None)
+    if not stack:
+        return 0.0
+    name, start, child = stack.pop()
+    elapsed = time.perf_counter() - start
+    if stack:
+        stack[-1][2] += elapsed
+    phases = getattr(_local, "phases", None)
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + elapsed - child
+    return elapsed
+
+
+class phase:
+    """with metrics.phase("layout"): ...  (꺼져 있으면 아무것도 하지 않음)"""
+
+    __slots__ = ("name", "active")
+
+    def __init__(self, name):
+        self.name = name
+        self.active = False
+
+    def __enter__(self):
+        if _enabled:
+            self.active = True
+            enter_phase(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        if self.active:
+            exit_phase()
+        return False
+
+
+def timed(metric, phase_name, errors=None):
+    """
+    함수 실행 시간을 metric{function=함수 이름} 에 기록하고 요청 구간 phase_name 에 더하는 데코레이터.
+    errors 카운터를 주면 예외가 난 호출 수도 센다.
+    """
+    def decorator(fn):
+        label = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            enter_phase(phase_name)
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                if errors is not None:
+                    errors.inc(label)
+                raise
+            finally:
+                metric.observe(exit_phase(), label)
+        return wrapper
+    return decorator
+
+
+# --- 출력 / Flask 연결 -------------------------------------------------------------------
+
+def render():
+    """등록된 모든 지표를 Prometheus 텍스트 형식으로 반환."""
+    lines = []
+    for metric in _registry.values():
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+def _before_request():
+    if _enabled:
+        begin_request()
+
+
+def _after_request(response):
+    if _enabled:
+        end_request(request.endpoint or "none", request.method, response.status_code)
+    return response
+
+
+def _before_template(sender, template, context, **extra):
+    if _enabled:
+        enter_phase("render")
+
+
+def _template_done(sender, template, context, **extra):
+    if _enabled:
+        exit_phase()
+
+
+def init_metrics(flask_app, enable=True):
+    """요청/템플릿 계측을 등록한다. enable=False 면 훅만 등록되고 기록은 하지 않는다."""
+    set_enabled(enable)
+    flask_app.before_request(_before_request)
+    flask_app.after_request(_after_request)
+    before_render_template.connect(_before_template, flask_app)
+    template_rendered.connect(_template_done, flask_app)
@@ -0,0 +1,253 @@
+# migrations.py
+"""
+projects.db 스키마 마이그레이션.
+
+schema_version 테이블에 적용된 버전을 기록하고, 앱 시작 시 migrate() 가
+아직 적용되지 않은 마이그레이션을 순서대로 실행한다.
+
+- 마이그레이션 하나는 BEGIN IMMEDIATE 트랜잭션 하나로 실행되므로 중간에 실패하면
+  해당 마이그레이션 전 상태로 돌아간다 (이전에 성공한 마이그레이션은 유지).
+- 트랜잭션 안에서 버전을 다시 확인하므로 여러 워커가 동시에 시작해도 한 번만 적용된다.
+- 기존 파일(마이그레이션 도입 전 DB)도 그대로 올릴 수 있도록 각 단계는 현재 스키마를 확인하고 진행한다.
+
+    python migrations.py [--db projects.db] [--status]
+"""
+import argparse
+import sqlite3
+import time
+
+import database
+
+# 날짜 TEXT(YYYY-MM-DD[ HH:MM...]) -> 1970-01-01 부터의 일수 (database.date_to_day 와 같은 값)
+# 잘못된 날짜 문자열이면 NULL
+_DAY_EXPR = "CAST(julianday({column}) - 2440587.5 AS INTEGER)"
+
+
+def _columns(conn, table):
+    # table_xinfo 는 생성(generated) 컬럼도 포함
+    return {row[1]: row[2].upper() for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+
+
+def _tables(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
+
+def _baseline(conn):
+    """마이그레이션 도입 전과 같은 테이블 (이미 있으면 그대로)."""
+    conn.execute(f"CREATE TABLE IF NOT EXISTS projects ({database.PROJECTS_COLUMNS})")
+    conn.execute(f"CREATE TABLE IF NOT EXISTS milestones ({database.MILESTONES_COLUMNS})")
+
+
+def _projects_real_costs(conn):
+    """
+    total_cost / current_expenditure 를 REAL 로 (기존 파일은 INTEGER 로 만들어져 있음).
+    SQLite 는 컬럼 타입 변경을 지원하지 않으므로 새 테이블로 복사 후 교체한다.
+    """
+    columns = _columns(conn, "projects")
+    if columns.get("total_cost") == "REAL" and columns.get("current_expenditure") == "REAL":
+        return
+    sequence = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'projects'").fetchone()
+    fields = ", ".join(database.PROJECT_FIELDS)
+    conn.execute(f"CREATE TABLE projects_new ({database.PROJECTS_COLUMNS})")
+    conn.execute(f"INSERT INTO projects_new ({fields}) SELECT {fields} FROM projects")
+    conn.execute("DROP TABLE projects")
+    conn.execute("ALTER TABLE projects_new RENAME TO projects")
+    # 삭제된 과제의 id 가 다시 쓰이지 않도록 AUTOINCREMENT 카운터 유지
+    if sequence is not None:
+        conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'projects'", (sequence[0],))
+
+
+def _date_day_columns(conn):
+    """
+    날짜 TEXT 옆에 정수 일 번호 컬럼을 가상 생성 컬럼으로 추가.
+    쓰기 코드는 그대로 TEXT 만 저장하면 SQLite 가 계산하며, 인덱스를 걸어 정수로 비교할 수 있다.
+    """
+    for table, pairs in (("projects", (("start_day", "start_date"), ("end_day", "end_date"))),
+                         ("milestones", (("start_day", "Start"), ("finish_day", "Finish")))):
+        existing = _columns(conn, table)
+        for column, source in pairs:
+            if column not in existing:
+                expression = _DAY_EXPR.format(column=f'"{source}"')
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER "
+                             f"GENERATED ALWAYS AS ({expression}) VIRTUAL")
+
+
+def _indexes(conn):
+    """대시보드/입력 폼의 조회 패턴용 인덱스."""
+    statements = [
+        # 연구과제: 이름/담당자 검색과 정렬, 기간(진행 중 과제) 조회
+        "CREATE INDEX IF NOT EXISTS idx_projects_name ON projects (name)",
+        "CREATE INDEX IF NOT EXISTS idx_projects_manager ON projects (manager)",
+        "CREATE INDEX IF NOT EXISTS idx_projects_days ON projects (end_day, start_day)",
+        # 마일스톤: 과제별 조회, 타임라인 기간 조회 (끝난 날 >= 시작 AND 시작한 날 <= 끝)
+        "CREATE INDEX IF NOT EXISTS idx_milestones_milestone ON milestones (Milestone)",
+        "CREATE INDEX IF NOT EXISTS idx_milestones_days ON milestones (finish_day, start_day)",
+        # TEXT 비교용 이전 인덱스는 idx_milestones_days 로 대체
+        "DROP INDEX IF EXISTS idx_milestones_finish_start",
+    ]
+    for statement in statements:
+        conn.execute(statement)
+
+
+def _change_log(conn):
+    """
+    연구과제/마일스톤 변경 이력 (changelog.py 의 시점 복구/되돌리기에서 사용).
+    트리거가 추가·수정·삭제 후의 행을 change_log 에 남기므로 쓰기 코드는 바꾸지 않아도 된다.
+    """
+    import changelog
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            changed_at REAL NOT NULL,   -- UTC unix 초
+            tbl TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL,           -- I / U / D
+            data TEXT                   -- 변경 후 행 (TABLE_FIELDS 순서의 JSON 배열), 삭제면 NULL
+        )
+    """)
+    # 행별 이력/되돌리기용. 시점 복구는 seq(기본 키) 순서로 읽으므로 시각 인덱스는 두지 않음 (쓰기 비용)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_change_log_row ON change_log (tbl, row_id, seq)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_checkpoint (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            taken_at REAL NOT NULL,
+            upto_seq INTEGER NOT NULL,  -- 이 seq 까지의 변경이 반영된 상태
+            tbl TEXT NOT NULL,
+            data TEXT NOT NULL          -- 테이블 전체 행의 JSON 배열
+        )
+    """)
+    now = changelog.NOW_SQL
+    for table, fields in database.TABLE_FIELDS.items():
+        new_row = "json_array(" + ", ".join(f'NEW."{f}"' for f in fields) + ")"
+        changed = " OR ".join(f'OLD."{f}" IS NOT NEW."{f}"' for f in fields)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS change_log_{table}_insert AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO change_log (changed_at, tbl, row_id, op, data)
+                VALUES ({now}, '{table}', NEW.id, 'I', {new_row});
+            END
+        """)
+        # 값이 그대로인 UPDATE(폼을 수정 없이 저장 등)는 기록하지 않음
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS change_log_{table}_update AFTER UPDATE ON {table}
+            WHEN {changed}
+            BEGIN
+                INSERT INTO change_log (changed_at, tbl, row_id, op, data)
+                VALUES ({now}, '{table}', NEW.id, 'U', {new_row});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS change_log_{table}_delete AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO change_log (changed_at, tbl, row_id, op, data)
+                VALUES ({now}, '{table}', OLD.id, 'D', NULL);
+            END
+        """)
+    # 이력이 시작되는 시점의 전체 상태 (복구의 출발점)
+    for table in database.TABLE_FIELDS:
+        changelog.write_checkpoint(conn, table)
+
+
+def _row_versions(conn):
+    """
+    연구과제 행 버전 (일괄 수정의 낙관적 동시성 검사용).
+    행이 수정될 때마다 트리거가 1씩 올리므로 폼 저장, 일괄 가져오기, 이력 복구, 외부 도구 등
+    어떤 경로로 수정해도 버전이 바뀐다.
+    """
+    if "row_version" not in _columns(conn, "projects"):
+        conn.execute("ALTER TABLE projects ADD COLUMN row_version INTEGER NOT NULL DEFAULT 1")
+    # 트리거 안의 UPDATE 는 이 트리거를 다시 실행하지 않음 (recursive_triggers 꺼짐)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS projects_row_version AFTER UPDATE ON projects
+        WHEN NEW.row_version IS OLD.row_version
+        BEGIN
+            UPDATE projects SET row_version = OLD.row_version + 1 WHERE id = NEW.id;
+        END
+    """)
+
+
+# (버전, 설명, 함수) - 순서대로 적용. 이미 배포된 항목은 수정하지 말고 새 버전을 추가할 것.
+MIGRATIONS = [
+    (1, "baseline tables", _baseline),
+    (2, "projects costs as REAL", _projects_real_costs),
+    (3, "integer day columns for dates", _date_day_columns),
+    (4, "indexes for dashboard and form queries", _indexes),
+    (5, "change log triggers and checkpoints", _change_log),
+    (6, "projects row versions", _row_versions),
+]
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(db_path or database.DB_NAME, isolation_level=None)  # 트랜잭션은 직접 관리
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+def _ensure_version_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+
+
+def _current_version(conn):
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def schema_version(db_path=None):
+    conn = _connect(db_path)
+    try:
+        if "schema_version" not in _tables(conn):
+            return 0
+        return _current_version(conn)
+    finally:
+        conn.close()
+
+
+def migrate(db_path=None):
+    """적용되지 않은 마이그레이션을 순서대로 실행하고 적용한 버전 목록을 반환."""
+    conn = _connect(db_path)
+    applied = []
+    try:
+        _ensure_version_table(conn)
+        latest = MIGRATIONS[-1][0]
+        if _current_version(conn) > latest:
+            # 더 새로운 코드가 올린 DB: 건드리지 않음
+            print(f"Database schema version {_current_version(conn)} is newer than this code ({latest})")
+            return applied
+        for version, description, apply in MIGRATIONS:
+            if version <= _current_version(conn):
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 잠금을 잡은 뒤 다시 확인 (다른 프로세스가 먼저 적용했을 수 있음)
+                if version <= _current_version(conn):
+                    conn.execute("COMMIT")
+                    continue
+                apply(conn)
+                conn.execute("INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                             (version, description, time.strftime("%Y-%m-%d %H:%M:%S")))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            applied.append(version)
+    finally:
+        conn.close()
+    return applied
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply projects.db schema migrations")
+    parser.add_argument("--db", default=database.DB_NAME)
+    parser.add_argument("--status", action="store_true", help="only print the current schema version")
+    args = parser.parse_args()
+    if args.status:
+        print(f"{args.db}: schema version {schema_version(args.db)} (latest {MIGRATIONS[-1][0]})")
+    else:
+        versions = migrate(args.db)
+        print(f"Applied migrations: {versions or 'none'} (schema version {schema_version(args.db)})")
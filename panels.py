@@ -0,0 +1,400 @@
+# panels.py
+"""
+대시보드 페이지들(dashboard.PAGES)이 공유하는 패널 레지스트리.
+
+각 패널은 필요한 데이터(requires)와 컴포넌트를 만드는 함수를 선언한다.
+build_panels() 는 페이지에 실제로 배치되는 패널만, 한 번씩만 만들고,
+패널이 요구하는 데이터만 DB에서 (요청당 한 번) 불러온다.
+패널별 생성 시간은 panel_stats() 로 확인할 수 있다.
+
+각 패널 컴포넌트에는 패턴 매칭 id {"panel": <이름>, "prop": <prop>} 가 붙고, prop 은 부분 갱신
+(live refresh) 시 교체할 속성이다 (그래프는 "figure", 나머지는 "children").
+"""
+import datetime
+import hashlib
+import threading
+import time
+
+from dash import Input, Output, State, dcc, html
+from dash.exceptions import PreventUpdate
+
+import metrics
+from database import (get_data_version, get_project_schedules, get_project_research, get_project_budgets,
+                      get_project_totals, get_project_ids, get_milestones_in_window)
+from utils import apply_progress
+from graphs import (create_progress_graph, create_budget_graph, create_budget_bullet,
+                    create_research_graphs, create_research_figure, create_milestone_graph,
+                    create_milestone_figure, MILESTONE_VIEW_DAYS, RESEARCH_SUBPLOT_MIN_WIDTH)
+
+# 예산 패널: 게이지가 BUDGET_PAGE_SIZE 개를 넘으면 여러 페이지로 나누어
+# BUDGET_ROTATE_SECONDS 마다 브라우저에서 돌려 보여준다 (키오스크용, 서버 요청 없음).
+# budget_mode="auto" 에서 프로젝트가 BUDGET_BULLET_THRESHOLD 개를 넘으면 bullet 차트로 전환.
+BUDGET_PAGE_SIZE = 24
+BUDGET_ROTATE_SECONDS = 15
+BUDGET_BULLET_THRESHOLD = 60
+
+BUDGET_GRAPH_ID = "budget-graph"
+BUDGET_PAGES_ID = "budget-pages"
+BUDGET_ROTATE_ID = "budget-rotate"
+
+# 마일스톤 타임라인: 보이는 기간의 앞뒤로 같은 길이만큼 더 불러와 두고,
+# 그 밖으로 이동(pan)하면 새 기간을 DB에서 조회한다.
+MILESTONE_GRAPH_ID = "milestone-graph"
+MILESTONE_WINDOW_ID = "milestone-window"
+
+
+def load_schedules():
+    # 기간만 불러와 진행률 계산 (같은 데이터 버전·날짜면 계산 결과 재사용)
+    # 버전을 먼저 읽어야 조회 도중 쓰기가 있어도 잘못된 버전으로 캐시되지 않음
+    version = get_data_version()
+    return apply_progress(get_project_schedules(), version)
+
+
+def milestone_window(view_start, view_end):
+    """보이는 기간 [view_start, view_end] (date) 에 앞뒤로 같은 길이를 더한 조회 기간 (YYYY-MM-DD)."""
+    width = max(view_end - view_start, datetime.timedelta(days=1))
+    return (view_start - width).isoformat(), (view_end + width).isoformat()
+
+
+def load_milestones():
+    # 타임라인 기본 화면(오늘부터 MILESTONE_VIEW_DAYS 일)과 겹치는 마일스톤만 조회
+    today = datetime.date.today()
+    return get_milestones_in_window(*milestone_window(today, today + datetime.timedelta(days=MILESTONE_VIEW_DAYS)))
+
+
+# 데이터 이름 -> 불러오는 함수 (패널마다 그리는 데 필요한 컬럼만 조회)
+DATA_LOADERS = {
+    "schedules": load_schedules,        # id, name, 기간, progress
+    "research": get_project_research,   # id, name, 논문/특허/SW 목표·결과
+    "budgets": get_project_budgets,     # id, name, 총 예산, 집행액
+    "totals": get_project_totals,       # 과제 수, 예산 합계
+    "project_ids": get_project_ids,     # id, name (마일스톤 색상)
+    "milestones": load_milestones,
+}
+# 데이터 이름 -> DB 테이블 (변경 알림이 어느 패널에 영향을 주는지 판단)
+DATA_TABLES = {
+    "schedules": "projects",
+    "research": "projects",
+    "budgets": "projects",
+    "totals": "projects",
+    "project_ids": "projects",
+    "milestones": "milestones",
+}
+
+# 패널 이름 -> Panel
+PANELS = {}
+
+_stats_lock = threading.Lock()
+_panel_stats = {}   # 패널 이름 -> {"builds", "total_ms", "max_ms", "last_ms"}
+
+
+class Panel:
+    def __init__(self, name, requires, build, prop="children"):
+        self.name = name
+        self.requires = tuple(requires)
+        self.tables = {DATA_TABLES[key] for key in self.requires}
+        self.build = build
+        self.prop = prop
+
+
+def panel(name, requires=(), prop="children"):
+    """패널 등록 데코레이터. 함수는 requires 에 적은 데이터를 같은 이름의 인자로 받는다."""
+    def decorator(build):
+        PANELS[name] = Panel(name, requires, build, prop)
+        return build
+    return decorator
+
+
+# 패널 prop 종류 (live refresh 콜백은 prop 마다 ALL Output 하나)
+PANEL_PROPS = ("children", "figure")
+
+
+def panel_id(name):
+    # 페이지마다 패널 구성이 달라도 콜백 하나가 현재 페이지의 패널만 갱신할 수 있도록 패턴 매칭 id
+    return {"panel": name, "prop": PANELS[name].prop}
+
+
+def research_panel_name(research_mode):
+    """정량 성과지표 렌더링 방식: "per_project"(기본, 프로젝트별 그래프) 또는 "subplots"(단일 Figure)."""
+    if research_mode == "subplots":
+        return "research_subplots"
+    return "research"
+
+
+def budget_panel_name(budget_mode):
+    """예산 패널 렌더링 방식: "auto"(기본), "gauge"(항상 게이지, 페이지 회전) 또는 "bullet"."""
+    if budget_mode == "gauge":
+        return "budget_gauge"
+    if budget_mode == "bullet":
+        return "budget_bullet"
+    return "budget"
+
+
+class PanelData:
+    """한 번의 레이아웃 생성 동안 데이터를 필요할 때 한 번만 불러온다."""
+
+    def __init__(self):
+        self._values = {}
+
+    def get(self, key):
+        if key not in self._values:
+            self._values[key] = DATA_LOADERS[key]()
+        return self._values[key]
+
+    def fingerprint(self, name):
+        """
+        패널이 사용하는 데이터의 지문 (워커/재시작과 무관하게 같은 데이터면 같은 값).
+        진행률처럼 날짜에 따라 바뀌는 값도 데이터에 포함되므로 함께 반영된다.
+        """
+        digest = hashlib.sha1()
+        for key in PANELS[name].requires:
+            digest.update(repr(self.get(key)).encode("utf-8"))
+        return digest.hexdigest()
+
+
+def _record(name, elapsed_ms):
+    with _stats_lock:
+        stats = _panel_stats.setdefault(name, {"builds": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0})
+        stats["builds"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        stats["last_ms"] = elapsed_ms
+
+
+def build_panels(names, data=None):
+    """
+    names 순서대로 패널을 만들어 {이름: 컴포넌트} 로 반환.
+    데이터 로딩 시간도 처음 사용하는 패널의 생성 시간에 포함된다.
+    """
+    if data is None:
+        data = PanelData()
+    components = {}
+    for name in names:
+        if name in components:
+            continue
+        target = PANELS[name]
+        start = time.perf_counter()
+        # 요청 구간 "layout" (데이터 로딩 중 DB 호출 시간은 db 구간으로 따로 집계됨)
+        with metrics.phase("layout"):
+            component = target.build(**{key: data.get(key) for key in target.requires})
+        component.id = panel_id(name)
+        components[name] = component
+        elapsed = time.perf_counter() - start
+        _record(name, elapsed * 1000)
+        if metrics.enabled():
+            metrics.PANEL_BUILD_SECONDS.observe(elapsed, name)
+    return components
+
+
+def panel_stats():
+    with _stats_lock:
+        result = {name: dict(s) for name, s in _panel_stats.items()}
+    for s in result.values():
+        s["avg_ms"] = round(s["total_ms"] / s["builds"], 3) if s["builds"] else 0.0
+        s["total_ms"] = round(s["total_ms"], 3)
+        s["max_ms"] = round(s["max_ms"], 3)
+        s["last_ms"] = round(s["last_ms"], 3)
+    return result
+
+
+@panel("kpi", requires=("schedules", "totals"))
+def kpi_panel(schedules, totals):
+    # 주요 통계 값 계산 (진행률은 날짜로 계산하므로 기간 데이터에서, 합계는 DB 집계로)
+    total_projects = totals["count"]
+    avg_progress = sum(p["progress"] for p in schedules) / total_projects if total_projects > 0 else 0
+    total_budget = totals["total_cost"]
+
+    # 주요 통계 카드 (grid 레이아웃)
+    return html.Div(
+        style={
+            "display": "grid",
+            "gridTemplateColumns": "repeat(4, 1fr)",
+            "gap": "15px",
+            "marginBottom": "20px",
+            "fontFamily": "'Pretendard', sans-serif"
+        },
+        children=[
+            html.Div(
+                style={
+                    "backgroundColor": "#2E2E3E",
+                    "borderRadius": "30px",
+                    # "boxShadow": "2px 2px 8px rgba(0,0,0,0.5)",
+                    "textAlign": "center",
+                    "fontFamily": "'Pretendard', sans-serif"
+                },
+                children=[
+                    html.P("총 연구과제", style={"fontFamily": "'Pretendard', sans-serif", "fontSize": "36px", "marginBottom": "0px", "color":"#ACACAC"}),
+                    html.H2(f"{total_projects}", style={"fontFamily": "'Pretendard', sans-serif", "fontSize": "120px","marginTop": "4px", "marginBottom": "30px"})
+                ]
+            ),
+            html.Div(
+                style={
+                    "backgroundColor": "#2E2E3E",
+                    "borderRadius": "30px",
+                    # "boxShadow": "2px 2px 8px rgba(0,0,0,0.5)",
+                    "textAlign": "center",
+                    "fontFamily": "'Pretendard', sans-serif"
+                },
+                children=[
+                    html.P("평균 진행률", style={"fontFamily": "'Pretendard', sans-serif", "fontSize": "36px", "marginBottom": "0px", "color":"#ACACAC"}),
+                    html.H2(f"{avg_progress:.1f}%", style={"fontFamily": "'Pretendard', sans-serif", "fontSize": "120px","marginTop": "4px", "marginBottom": "30px"})
+                ]
+            ),
+            html.Div(
+                style={
+                    "backgroundColor": "#2E2E3E",
+                    "borderRadius": "30px",
+                    # "boxShadow": "2px 2px 8px rgba(0,0,0,0.5)",
+                    "textAlign": "center",
+                    "fontFamily": "'Pretendard', sans-serif"
+                },
+                children=[
+                    html.P("총 예산", style={"fontFamily": "'Pretendard', sans-serif",  "fontSize": "36px", "marginBottom": "0px", "color":"#ACACAC"}),
+                    html.H2(
+                            children=[
+                                html.Span(f"{total_budget:.2f}", style={"fontSize": "120px"}),
+                                html.Span(" 억원", style={"fontSize": "48px",})
+                            ],
+                            style={
+                                "fontFamily": "'Pretendard', sans-serif",
+                                "marginTop": "4px",
+                                "marginBottom": "20px"
+                            }
+                        )
+                    # html.H2(f"{total_budget} 백만원", style={"fontFamily": "'Pretendard', sans-serif", "fontSize": "120px","marginTop": "4px", "marginBottom": "30px"})
+                ]
+            ),
+            html.Div(
+                style={
+                    "backgroundColor": "#2E2E3E",
+                    "borderRadius": "30px",
+                    # "boxShadow": "2px 2px 8px rgba(0,0,0,0.5)",
+                    "textAlign": "center",
+                    "fontFamily": "'Pretendard', sans-serif"
+                },
+                children=[
+                    html.P("전체 참여 인원", style={"fontFamily": "'Pretendard', sans-serif",  "fontSize": "36px", "marginBottom": "0px", "color":"#ACACAC"}),
+                    html.H2("15", style={"fontFamily": "'Pretendard', sans-serif", "fontSize": "120px","marginTop": "4px", "marginBottom": "30px"})
+                ]
+            )
+        ]
+    )
+
+
+@panel("progress", requires=("schedules",), prop="figure")
+def progress_panel(schedules):
+    return dcc.Graph(figure=create_progress_graph(schedules), style={"width": "100%"})
+
+
+@panel("research", requires=("research",))
+def research_panel(research):
+    return html.Div(children=create_research_graphs(research), style={"width": "100%"})
+
+
+@panel("research_subplots", requires=("research",))
+def research_subplots_panel(research):
+    # 정량 성과지표를 하나의 서브플롯 Figure 로 (research 패널의 대체, research_mode="subplots")
+    # 프로젝트가 많으면 서브플롯을 최소 너비 아래로 좁히지 않고 가로로 스크롤
+    min_width = len(research) * RESEARCH_SUBPLOT_MIN_WIDTH
+    return html.Div(
+        dcc.Graph(figure=create_research_figure(research), style={"width": "100%", "minWidth": f"{min_width}px"}),
+        style={"width": "100%", "overflowX": "auto"},
+    )
+
+
+def _budget_container(figures):
+    """
+    첫 페이지 그래프 + 전체 페이지 Store + 회전용 Interval.
+    페이지가 하나면 Store 는 비우고 Interval 은 끈다 (콜백 대상 id 는 항상 존재하도록 유지).
+    """
+    rotate = len(figures) > 1
+    return html.Div(children=[
+        dcc.Graph(id=BUDGET_GRAPH_ID, figure=figures[0]),
+        dcc.Store(id=BUDGET_PAGES_ID, data=figures if rotate else None),
+        dcc.Interval(id=BUDGET_ROTATE_ID, interval=BUDGET_ROTATE_SECONDS * 1000, disabled=not rotate),
+    ])
+
+
+def _budget_gauge_pages(projects):
+    pages = [projects[i:i + BUDGET_PAGE_SIZE] for i in range(0, len(projects), BUDGET_PAGE_SIZE)]
+    return [create_budget_graph(page) for page in pages or [[]]]
+
+
+@panel("budget", requires=("budgets",))
+def budget_panel(budgets):
+    if len(budgets) > BUDGET_BULLET_THRESHOLD:
+        return _budget_container([create_budget_bullet(budgets)])
+    return _budget_container(_budget_gauge_pages(budgets))
+
+
+@panel("budget_gauge", requires=("budgets",))
+def budget_gauge_panel(budgets):
+    return _budget_container(_budget_gauge_pages(budgets))
+
+
+@panel("budget_bullet", requires=("budgets",))
+def budget_bullet_panel(budgets):
+    return _budget_container([create_budget_bullet(budgets)])
+
+
+def register_budget_rotation(dash_app):
+    """예산 패널의 페이지 회전 (clientside 콜백이라 서버에는 요청이 가지 않음)."""
+    dash_app.clientside_callback(
+        """
+        function (n, pages) {
+            if (!pages || pages.length < 2) {
+                return window.dash_clientside.no_update;
+            }
+            return pages[(n || 0) % pages.length];
+        }
+        """,
+        Output(BUDGET_GRAPH_ID, "figure"),
+        Input(BUDGET_ROTATE_ID, "n_intervals"),
+        State(BUDGET_PAGES_ID, "data"),
+    )
+
+
+@panel("milestone", requires=("milestones", "project_ids"))
+def milestone_panel(milestones, project_ids):
+    today = datetime.date.today()
+    start, end = milestone_window(today, today + datetime.timedelta(days=MILESTONE_VIEW_DAYS))
+    return html.Div(children=[
+        # 기본 화면에 마일스톤이 없으면 예시 데이터 대신 빈 타임라인
+        create_milestone_graph(milestones, placeholder=False, projects=project_ids, id=MILESTONE_GRAPH_ID),
+        # 현재 불러와 둔 기간 (이 안에서의 이동은 DB 조회 없이 브라우저에서 처리)
+        dcc.Store(id=MILESTONE_WINDOW_ID, data={"start": start, "end": end}),
+    ])
+
+
+def _relayout_range(relayout):
+    """relayoutData 에서 x 범위를 (시작, 끝) 문자열로 꺼낸다. 범위 변경이 아니면 None."""
+    if not relayout:
+        return None
+    if "xaxis.range[0]" in relayout and "xaxis.range[1]" in relayout:
+        return relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]
+    if "xaxis.range" in relayout:
+        return tuple(relayout["xaxis.range"][:2])
+    return None
+
+
+def register_milestone_pan(dash_app):
+    """타임라인을 불러온 기간 밖으로 이동하면 인접 기간을 조회해서 그래프를 다시 그린다."""
+    @dash_app.callback(
+        Output(MILESTONE_GRAPH_ID, "figure"),
+        Output(MILESTONE_WINDOW_ID, "data"),
+        Input(MILESTONE_GRAPH_ID, "relayoutData"),
+        State(MILESTONE_WINDOW_ID, "data"),
+        prevent_initial_call=True,
+    )
+    def pan(relayout, window):
+        x_range = _relayout_range(relayout)
+        if x_range is None:
+            raise PreventUpdate
+        view_start = datetime.date.fromisoformat(str(x_range[0])[:10])
+        view_end = datetime.date.fromisoformat(str(x_range[1])[:10])
+        if window and window["start"] <= view_start.isoformat() and view_end.isoformat() <= window["end"]:
+            raise PreventUpdate
+        start, end = milestone_window(view_start, view_end)
+        figure = create_milestone_figure(get_milestones_in_window(start, end), x_range=list(x_range),
+                                         placeholder=False, projects=get_project_ids())
+        return figure, {"start": start, "end": end}
@@ -1,11 +1,24 @@
 # routes.py
 import datetime
-from flask import Blueprint, render_template, request, redirect
-from database import get_projects, update_project, delete_project, add_project, get_milestones, update_milestone, delete_milestone, add_milestone
-from utils import calculate_progress
+import hashlib
+import os
+import sqlite3
+import time
+from flask import Blueprint, Response, render_template, request, redirect, jsonify, send_file, stream_with_context, after_this_request
+import metrics
+from database import pooled_connection, get_data_version, get_change_seq, query_page, TABLE_FIELDS, RowVersionConflict, update_projects_batch, get_projects_by_id, get_projects, get_project_names, update_project, delete_project, add_project, get_milestones, update_milestone, delete_milestone, add_milestone
+from utils import apply_progress, calculate_progress_batch
+from layout_cache import layout_cache
+from panels import panel_stats
+from fonts import ensure_font_subsets_async
+import bulk
+from migrations import schema_version
 
 update_blueprint = Blueprint('update', __name__)
 milestone_blueprint = Blueprint('milestone', __name__)
+status_blueprint = Blueprint('status', __name__)
+bulk_blueprint = Blueprint('bulk', __name__)
+api_blueprint = Blueprint('api', __name__, url_prefix='/api')
 
 
 @update_blueprint.route('/update', methods=['GET', 'POST'])
@@ -45,13 +58,64 @@ def update():
                             goal_patents_filed, current_patents_filed,
                             goal_patents_registered, current_patents_registered,
                             goal_software, current_software)
+            # 새 연구과제명/담당자에 서브셋 폰트에 없는 글자가 있으면 폰트 재생성
+            ensure_font_subsets_async()
         return redirect('/update')
 
-    projects = get_projects()
-    # 진행률 업데이트
-    for project in projects:
-        project["progress"] = calculate_progress(project["start_date"], project["end_date"])
+    version = get_data_version()
+    projects = get_projects(with_version=True)
+    # 진행률 업데이트 (같은 데이터 버전·날짜면 계산 결과 재사용)
+    apply_progress(projects, version)
     return render_template('update.html', projects=projects)
+
+
+# 일괄 저장 한 번에 받는 최대 행 수
+BATCH_UPDATE_MAX_ROWS = 500
+
+
+@update_blueprint.route('/update/batch', methods=['POST'])
+def update_batch():
+    """
+    수정된 연구과제 여러 개를 한 요청/한 트랜잭션으로 저장.
+    {"rows": [{"id", "row_version", 필드...}]} -> 200 {"rows": 저장된 행}
+    불러온 뒤 다른 곳에서 수정된 행이 있으면 아무것도 저장하지 않고 409 {"conflicts", "rows": 현재 값}.
+    """
+    payload = request.get_json(silent=True)
+    rows = payload.get("rows") if isinstance(payload, dict) else None
+    if not isinstance(rows, list) or not rows:
+        return jsonify({"error": 'expected {"rows": [...]}'}), 400
+    if len(rows) > BATCH_UPDATE_MAX_ROWS:
+        return jsonify({"error": f"at most {BATCH_UPDATE_MAX_ROWS} rows per request"}), 400
+
+    updates = []
+    errors = []
+    for raw in rows:
+        try:
+            if not isinstance(raw, dict):
+                raise ValueError("expected an object")
+            values = bulk.parse_row("projects", raw)
+            if values[0] is None:
+                raise ValueError("id: required")
+            updates.append((values, int(raw["row_version"])))
+        except (KeyError, TypeError, ValueError, OverflowError) as e:
+            row_id = raw.get("id") if isinstance(raw, dict) else None
+            errors.append({"id": row_id, "error": "row_version: required" if isinstance(e, KeyError) else str(e)})
+    # 같은 id 가 두 번 오면 두 번째 UPDATE 가 첫 번째가 올린 row_version 과 맞지 않아 충돌(409)처럼 보이므로 미리 거부
+    seen = set()
+    for values, _ in updates:
+        if values[0] in seen:
+            errors.append({"id": values[0], "error": "duplicate id in batch"})
+        seen.add(values[0])
+    if errors:
+        return jsonify({"errors": errors}), 400
+
+    try:
+        updated = update_projects_batch(updates)
+    except RowVersionConflict as e:
+        # 삭제된 행은 rows 에 없음
+        return jsonify({"conflicts": e.ids, "rows": get_projects_by_id(e.ids, with_version=True)}), 409
+    ensure_font_subsets_async()
+    return jsonify({"rows": updated})
     
 @milestone_blueprint.route('/milestone', methods=['GET', 'POST'])
 def milestone():
@@ -74,8 +138,206 @@ def milestone():
                 delete_milestone(milestone_id)
             elif action == "add":
                 add_milestone(milestone_text, start, finish, status, detail, manager)
+            ensure_font_subsets_async()
         return redirect('/milestone')
     
     milestones = get_milestones()
-    projects = get_projects()  # 연구과제 목록을 함께 가져와서 드롭다운 옵션으로 사용
-    return render_template('milestone.html', milestones=milestones, projects=projects)
\ No newline at end of file
+    project_names = get_project_names()  # 드롭다운 옵션에는 연구과제명만 필요
+    return render_template('milestone.html', milestones=milestones, project_names=project_names)
+
+
+@status_blueprint.route('/cache-stats')
+def cache_stats():
+    # 레이아웃 캐시 적중/미스 횟수 (키오스크 새로고침이 실제로 몇 번 빌드를 유발했는지 확인용)
+    return jsonify(layout_cache.stats())
+
+
+@status_blueprint.route('/panel-stats')
+def panel_stats_view():
+    # 패널별 생성 횟수/시간 (어느 패널이 렌더링 지연을 차지하는지 확인용)
+    return jsonify(panel_stats())
+
+
+@status_blueprint.route('/metrics')
+def metrics_view():
+    # Prometheus 텍스트 형식 (라우트/DB 호출/패널 생성 시간 히스토그램, 요청 구간별 시간 등)
+    if not metrics.enabled():
+        return Response("# metrics disabled (DASHBOARD_METRICS=0)\n", mimetype="text/plain")
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@status_blueprint.route('/healthz')
+def healthz():
+    # DB 왕복 지연 시간 확인 (풀의 연결로 SELECT 1)
+    start = time.perf_counter()
+    try:
+        with pooled_connection() as conn:
+            conn.execute("SELECT 1").fetchone()
+    except sqlite3.Error as e:
+        return jsonify({"status": "error", "error": str(e)}), 503
+    latency_ms = (time.perf_counter() - start) * 1000
+    return jsonify({"status": "ok", "db_latency_ms": round(latency_ms, 3)})
+
+
+@bulk_blueprint.route('/import/<table>', methods=['POST'])
+def bulk_import(table):
+    # multipart 의 file 필드 또는 요청 본문 전체 (?format=csv|xlsx|ndjson, 없으면 파일 확장자로 판단)
+    if table not in bulk.TABLE_FIELDS:
+        return jsonify({"error": f"unknown table {table!r}"}), 404
+    upload = request.files.get("file")
+    stream = upload.stream if upload else request.stream
+    fmt = request.args.get("format") or bulk.detect_format(upload.filename if upload else None)
+    if fmt not in bulk.FORMATS:
+        return jsonify({"error": f"unknown format, use ?format= one of {', '.join(bulk.FORMATS)}"}), 400
+    skip_invalid = request.args.get("skip_invalid", "0") not in ("0", "", "false")
+    try:
+        report = bulk.import_file(table, stream, fmt, skip_invalid=skip_invalid)
+    except bulk.BulkImportError as e:
+        return jsonify(e.report), 400
+    ensure_font_subsets_async()
+    return jsonify(report)
+
+
+@bulk_blueprint.route('/export/<table>.<fmt>')
+def bulk_export(table, fmt):
+    if table not in bulk.TABLE_FIELDS or fmt not in bulk.FORMATS:
+        return jsonify({"error": "not found"}), 404
+    filename = f"{table}.{fmt}"
+    if fmt == "xlsx":
+        if bulk.openpyxl is None:
+            return jsonify({"error": "XLSX export requires openpyxl"}), 501
+        path = bulk.export_xlsx_tempfile(table)
+
+        @after_this_request
+        def remove_file(response):
+            response.call_on_close(lambda: os.remove(path))
+            return response
+        return send_file(path, mimetype=bulk.MIMETYPES[fmt], as_attachment=True, download_name=filename)
+    # 행을 읽는 대로 보내므로 테이블 크기와 관계없이 메모리 사용량이 일정
+    return Response(stream_with_context(bulk.export_chunks(table, fmt)), mimetype=bulk.MIMETYPES[fmt],
+                    headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+# --- 읽기 전용 JSON API ------------------------------------------------------------------
+API_DEFAULT_LIMIT = 100
+API_MAX_LIMIT = 1000
+# /api/progress 가 계산해서 돌려주는 값 (이 중 fields 로 고를 수 있음)
+PROGRESS_FIELDS = ["id", "name", "manager", "start_date", "end_date", "progress", "status_color", "budget_percent"]
+# ETag 에 넣는 스키마 버전 (시작 시 마이그레이션 후 바뀌지 않으므로 프로세스마다 한 번만 읽음)
+_api_schema_version = None
+
+
+class ApiError(Exception):
+    pass
+
+
+def _api_date(name):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return datetime.date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ApiError(f"{name} must be YYYY-MM-DD")
+
+
+def _api_int(name, default, minimum, maximum):
+    value = request.args.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ApiError(f"{name} must be an integer")
+    if not minimum <= number <= maximum:
+        raise ApiError(f"{name} must be between {minimum} and {maximum}")
+    return number
+
+
+def _api_fields(available):
+    value = request.args.get("fields")
+    if not value:
+        return list(available)
+    fields = [f.strip() for f in value.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in available]
+    if unknown:
+        raise ApiError(f"unknown fields: {', '.join(unknown)} (available: {', '.join(available)})")
+    return fields
+
+
+def _api_etag():
+    # 마지막 변경 번호가 같으면 같은 요청의 결과도 같음 (진행률은 날짜에 따라 바뀌므로 날짜 포함)
+    # DB 에 저장된 값만 쓰므로 다른 워커나 재시작 후에도 같은 ETag 가 나와 304 로 재검증된다
+    global _api_schema_version
+    if _api_schema_version is None:
+        _api_schema_version = schema_version()
+    token = f"{_api_schema_version}:{get_change_seq()}:{datetime.date.today()}:{request.full_path}"
+    return hashlib.sha1(token.encode("utf-8")).hexdigest()
+
+
+def _api_filters(names):
+    filters = {name: request.args.get(name) for name in names}
+    filters["start"] = _api_date("from")
+    filters["end"] = _api_date("to")
+    return filters
+
+
+def _api_response(fields, filter_names, load):
+    """
+    조건부 GET 처리 후 load(fields, cursor, limit, filters) 로 한 페이지를 만들어 JSON 으로 반환.
+    If-None-Match 가 현재 ETag 와 같으면 DB 를 읽지 않고 304.
+    """
+    try:
+        fields = _api_fields(fields)
+        filters = _api_filters(filter_names)
+        cursor = _api_int("cursor", 0, 0, 2 ** 63 - 1)
+        limit = _api_int("limit", API_DEFAULT_LIMIT, 1, API_MAX_LIMIT)
+    except ApiError as e:
+        return jsonify({"error": str(e)}), 400
+    etag = _api_etag()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        # 다음 페이지가 있는지 알기 위해 하나 더 읽음
+        rows = load(fields, cursor, limit + 1, filters)
+        next_cursor = str(rows[limit - 1][0]) if len(rows) > limit else None
+        response = jsonify({"data": [row for _, row in rows[:limit]], "next_cursor": next_cursor})
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+
+@api_blueprint.route('/projects')
+def api_projects():
+    # ?fields=id,name&manager=&project=&from=&to=&cursor=&limit=
+    def load(fields, cursor, limit, filters):
+        return query_page("projects", fields, cursor, limit, **filters)
+    return _api_response(TABLE_FIELDS["projects"], ("manager", "project"), load)
+
+
+@api_blueprint.route('/milestones')
+def api_milestones():
+    # ?fields=&manager=(담당자)&project=(연구과제명)&status=&from=&to=&cursor=&limit=
+    def load(fields, cursor, limit, filters):
+        return query_page("milestones", fields, cursor, limit, **filters)
+    return _api_response(TABLE_FIELDS["milestones"], ("manager", "project", "status"), load)
+
+
+@api_blueprint.route('/progress')
+def api_progress():
+    # 연구과제별 기간 진행률(%)과 상태 색상, 예산 집행률(%)
+    def load(fields, cursor, limit, filters):
+        rows = query_page("projects", ["name", "manager", "start_date", "end_date", "total_cost",
+                                       "current_expenditure"], cursor, limit, **filters)
+        if not rows:
+            return rows
+        progress, colors = calculate_progress_batch([r["start_date"] for _, r in rows],
+                                                    [r["end_date"] for _, r in rows])
+        page = []
+        for (project_id, row), value, color in zip(rows, progress, colors):
+            total = row["total_cost"]
+            derived = dict(row, id=project_id, progress=value, status_color=color,
+                           budget_percent=round(row["current_expenditure"] / total * 100, 1) if total else 0.0)
+            page.append((project_id, {f: derived[f] for f in fields}))
+        return page
+    return _api_response(PROGRESS_FIELDS, ("manager", "project"), load)
@@ -0,0 +1,324 @@
+# snapshot.py
+"""
+읽기 전용 벽면 디스플레이(키오스크)용 정적 스냅샷 페이지.
+
+/snapshot/<페이지 이름> (dashboard.PAGES) 은 각 페이지의 레이아웃을 서버에서 HTML 한 장으로 렌더링한다.
+Dash 렌더러 번들, _dash-layout 요청, 클라이언트 측 컴포넌트 생성 없이
+미리 직렬화한 figure 를 로컬에서 제공하는 plotly.js(/dist/vendor/)로 바로 그린다.
+
+- 스냅샷은 (데이터 버전, 오늘 날짜)가 바뀔 때만 백그라운드 스레드 하나가 다시 만든다.
+  다시 만드는 동안에는 이전 스냅샷을 그대로 보낸다 (처음 한 번만 요청 안에서 생성).
+- 내용 해시를 ETag 로 보내므로 바뀌지 않았으면 304, gzip 압축본은 미리 만들어 둔다.
+- 페이지는 SNAPSHOT_POLL_SECONDS 마다 /version 으로 ETag 만 확인해 바뀌었으면 새로고침한다.
+- 예산 페이지 회전은 페이지 안의 스크립트가 그대로 수행하고, 다른 dcc 컴포넌트(Interval 등)는 생략한다.
+- 클릭/키 입력/터치가 있으면 같은 화면의 라이브 Dash 앱으로 이동한다 (상호작용하는 사용자용).
+"""
+import datetime
+import gzip
+import hashlib
+import html
+import json
+import re
+import threading
+
+from dash.development.base_component import Component
+from flask import Blueprint, Response, abort, request
+from plotly.io.json import to_json_plotly
+
+import database
+from assets import asset_url
+from dashboard import page_frame
+from fonts import font_stylesheet_urls
+from panels import BUDGET_GRAPH_ID, BUDGET_PAGES_ID, BUDGET_ROTATE_ID
+
+SNAPSHOT_POLL_SECONDS = 30
+GRAPH_CONFIG = {"responsive": True, "displaylogo": False}
+
+# html 컴포넌트 속성 중 그대로 HTML 속성으로 옮기는 것 (Dash 속성명 -> HTML 속성명)
+HTML_ATTRIBUTES = {"id": "id", "className": "class", "title": "title", "href": "href", "src": "src",
+                   "alt": "alt", "target": "target", "colSpan": "colspan", "rowSpan": "rowspan"}
+# React 처럼 숫자에 px 를 붙이지 않는 CSS 속성
+UNITLESS_STYLES = {"opacity", "zIndex", "fontWeight", "lineHeight", "flex", "flexGrow", "flexShrink",
+                   "order", "zoom", "gridRow", "gridColumn"}
+VOID_TAGS = {"br", "hr", "img", "input", "meta", "link"}
+
+_CAMEL_RE = re.compile(r"([A-Z])")
+
+snapshot_blueprint = Blueprint("snapshot", __name__, url_prefix="/snapshot")
+
+
+def _dom_id(value):
+    # 패턴 매칭(dict) id 는 Dash 와 같은 방식(키 정렬 JSON)으로 문자열화
+    if isinstance(value, dict):
+        return json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return str(value)
+
+
+def _style(style):
+    parts = []
+    for key, value in style.items():
+        if value is None:
+            continue
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and key not in UNITLESS_STYLES:
+            value = f"{value}px"
+        parts.append(_CAMEL_RE.sub(r"-\1", key).lower() + f":{value}")
+    return ";".join(parts)
+
+
+class _Renderer:
+    """Dash 컴포넌트 트리를 HTML 로 변환하면서 그래프 figure, Store 데이터, Interval 설정을 모은다."""
+
+    def __init__(self):
+        self.parts = []
+        self.figures = {}
+        self.stores = {}
+        self.intervals = {}
+
+    def render(self, node):
+        if node is None or isinstance(node, bool):
+            return
+        if isinstance(node, (list, tuple)):
+            for child in node:
+                self.render(child)
+        elif isinstance(node, Component):
+            props = node.to_plotly_json()["props"]
+            if node._namespace == "dash_html_components":
+                self._element(node._type.lower(), props)
+            elif node._type == "Graph":
+                self._graph(props)
+            elif node._type == "Store":
+                if props.get("data") is not None:
+                    self.stores[props["id"]] = props["data"]
+            elif node._type == "Interval":
+                self.intervals[props["id"]] = {"interval": props.get("interval", 1000),
+                                               "disabled": bool(props.get("disabled"))}
+            # 그 밖의 컴포넌트는 정적 화면에 필요 없으므로 생략
+        else:
+            self.parts.append(html.escape(str(node), quote=False))
+
+    def _attributes(self, props):
+        attrs = []
+        for key, name in HTML_ATTRIBUTES.items():
+            if props.get(key) is not None:
+                value = _dom_id(props[key]) if key == "id" else str(props[key])
+                attrs.append(f' {name}="{html.escape(value)}"')
+        if props.get("style"):
+            attrs.append(f' style="{html.escape(_style(props["style"]))}"')
+        return "".join(attrs)
+
+    def _element(self, tag, props):
+        self.parts.append(f"<{tag}{self._attributes(props)}>")
+        if tag in VOID_TAGS:
+            return
+        self.render(props.get("children"))
+        self.parts.append(f"</{tag}>")
+
+    def _graph(self, props):
+        graph_id = _dom_id(props["id"]) if props.get("id") else f"snapshot-graph-{len(self.figures)}"
+        self.parts.append(f"<div{self._attributes(dict(props, id=graph_id))}></div>")
+        self.figures[graph_id] = props.get("figure") or {}
+
+    def html(self):
+        return "".join(self.parts)
+
+
+def _script_json(value):
+    # <script> 안에 넣으므로 </script> 가 끝 태그로 해석되지 않도록
+    return to_json_plotly(value).replace("</", "<\\/")
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+{stylesheets}
+<style>body {{ background-color: #1E1E2E; margin: 8px; }}</style>
+</head>
+<body>
+{body}
+<a href="{live_url}" style="position:fixed;bottom:8px;right:12px;font-size:12px;color:#8A8A8A">라이브 화면</a>
+<script src="{plotly_url}"></script>
+<script>
+(function () {{
+    var figures = {figures};
+    var stores = {stores};
+    var intervals = {intervals};
+    var config = {config};
+    Object.keys(figures).forEach(function (id) {{
+        Plotly.newPlot(id, figures[id].data || [], figures[id].layout || {{}}, config);
+    }});
+
+    // 예산 패널 페이지 회전 (라이브 앱의 clientside 콜백과 같은 동작)
+    var pages = stores["{budget_pages_id}"], rotate = intervals["{budget_rotate_id}"];
+    if (pages && pages.length > 1 && rotate && !rotate.disabled) {{
+        var page = 0;
+        setInterval(function () {{
+            page = (page + 1) % pages.length;
+            Plotly.react("{budget_graph_id}", pages[page].data, pages[page].layout, config);
+        }}, rotate.interval);
+    }}
+
+    // 데이터가 바뀌어 새 스냅샷이 만들어지면 새로고침
+    var etag = {etag};
+    setInterval(function () {{
+        fetch("{version_url}", {{cache: "no-store"}})
+            .then(function (r) {{ return r.ok ? r.text() : etag; }})
+            .then(function (current) {{ if (current !== etag) {{ location.reload(); }} }})
+            .catch(function () {{}});
+    }}, {poll_ms});
+
+    // 상호작용하는 사용자는 라이브 Dash 앱으로
+    ["click", "keydown", "touchstart"].forEach(function (type) {{
+        document.addEventListener(type, function () {{ location.href = "{live_url}"; }}, {{once: true}});
+    }});
+}})();
+</script>
+</body>
+</html>
+"""
+
+
+def render_snapshot(page, title, version_url, poll_seconds=SNAPSHOT_POLL_SECONDS):
+    """dashboard.Page 의 현재 (캐시된) 레이아웃을 공통 골격과 함께 정적 HTML 문자열로 렌더링."""
+    renderer = _Renderer()
+    renderer.render(page_frame(page.layout()))
+    body = renderer.html()
+    figures = _script_json(renderer.figures)
+    stores = _script_json(renderer.stores)
+    stylesheets = "\n".join(f'<link rel="stylesheet" href="{html.escape(url)}">' for url in font_stylesheet_urls())
+    plotly_url = asset_url("vendor/plotly.min.js")
+    # ETag 는 페이지 안에도 들어가므로 그 밖의 내용으로 계산
+    etag = hashlib.sha1("\0".join([body, figures, stores, stylesheets, plotly_url]).encode("utf-8")).hexdigest()
+    page = PAGE_TEMPLATE.format(
+        title=html.escape(title),
+        stylesheets=stylesheets,
+        body=body,
+        live_url=page.path,
+        plotly_url=plotly_url,
+        figures=figures,
+        stores=stores,
+        intervals=json.dumps(renderer.intervals),
+        config=json.dumps(GRAPH_CONFIG),
+        budget_pages_id=BUDGET_PAGES_ID,
+        budget_rotate_id=BUDGET_ROTATE_ID,
+        budget_graph_id=BUDGET_GRAPH_ID,
+        etag=json.dumps(etag),
+        version_url=version_url,
+        poll_ms=int(poll_seconds * 1000),
+    )
+    return page, etag
+
+
+class SnapshotCache:
+    """
+    이름별 스냅샷을 (데이터 버전, 오늘 날짜) 기준으로 보관한다.
+    오래된 스냅샷은 백그라운드에서 다시 만드는 동안 그대로 제공 (이름별 재생성 스레드는 최대 1개).
+    """
+
+    def __init__(self, poll_seconds=SNAPSHOT_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self.title = "Dash"
+        self._pages = {}
+        self._entries = {}      # name -> (token, etag, html bytes, gzip bytes)
+        self._building = set()
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def _token(self):
+        return (database.get_data_version(), datetime.date.today())
+
+    def register(self, page):
+        self._pages[page.name] = page
+
+    def _build(self, name):
+        token = self._token()
+        page, etag = render_snapshot(self._pages[name], self.title, f"/snapshot/{name}/version",
+                                     self.poll_seconds)
+        content = page.encode("utf-8")
+        entry = (token, etag, content, gzip.compress(content, compresslevel=6))
+        with self._lock:
+            self._entries[name] = entry
+        return entry
+
+    def _rebuild(self, name):
+        try:
+            # 빌드 중 쓰기가 들어왔으면 한 번 더 (스레드를 새로 띄우지 않음)
+            while True:
+                with self._build_lock:
+                    entry = self._build(name)
+                if entry[0] == self._token():
+                    break
+        finally:
+            with self._lock:
+                self._building.discard(name)
+
+    def refresh(self, name):
+        """백그라운드 재생성을 시작 (이미 진행 중이면 무시)."""
+        with self._lock:
+            if name in self._building:
+                return
+            self._building.add(name)
+        threading.Thread(target=self._rebuild, args=(name,), name=f"snapshot-{name}", daemon=True).start()
+
+    def refresh_all(self, *_):
+        for name in self._pages:
+            self.refresh(name)
+
+    def get(self, name):
+        entry = self._entries.get(name)
+        if entry is None:
+            with self._build_lock:
+                entry = self._entries.get(name) or self._build(name)
+        elif entry[0] != self._token():
+            self.refresh(name)
+        return entry
+
+
+snapshots = SnapshotCache()
+
+
+def _lookup(name):
+    if name not in snapshots._pages:
+        abort(404)
+    return snapshots.get(name)
+
+
+@snapshot_blueprint.route("/<name>")
+def snapshot_page(name):
+    _, etag, content, compressed = _lookup(name)
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    elif request.accept_encodings["gzip"]:
+        response = Response(compressed, mimetype="text/html")
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(content, mimetype="text/html")
+    response.set_etag(etag)
+    response.headers["Vary"] = "Accept-Encoding"
+    # 매번 ETag 로 재검증 (바뀌지 않았으면 304 로 본문 없이)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@snapshot_blueprint.route("/<name>/version")
+def snapshot_version(name):
+    # 오래된 스냅샷이면 여기서 재생성이 시작되고, 완료 후 요청부터 새 ETag 를 받는다
+    response = Response(_lookup(name)[1], mimetype="text/plain")
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def init_snapshots(flask_app, dash_app, pages, poll_seconds=SNAPSHOT_POLL_SECONDS):
+    """
+    pages(dashboard.PAGES) 각각의 스냅샷 라우트 /snapshot/<이름> 을 등록.
+    앱 안의 쓰기 직후에도 재생성을 시작해 두어 다음 폴링 때 바로 새 스냅샷을 받게 한다.
+    """
+    snapshots.poll_seconds = poll_seconds
+    snapshots.title = dash_app.title
+    for page in pages:
+        snapshots.register(page)
+    database.add_change_listener(snapshots.refresh_all)
+    flask_app.register_blueprint(snapshot_blueprint)
+    return snapshots
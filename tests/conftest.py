@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# 저장소 루트의 모듈(utils, graphs, bulk ...)을 그대로 임포트
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
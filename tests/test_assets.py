@@ -0,0 +1,52 @@
+# tests/test_assets.py
+import os
+
+import pytest
+from flask import Flask
+
+import assets
+
+
+@pytest.fixture
+def build(tmp_path, monkeypatch):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    (static_dir / "style.css").write_text("body { color: red; }", encoding="utf-8")
+    monkeypatch.setattr(assets, "BUILD_DIR", str(tmp_path / "dist"))
+    monkeypatch.setattr(assets, "_vendor_files", lambda: [])
+    app = Flask(__name__)
+    app.add_url_rule(assets.ASSET_URL_PREFIX + "<path:filename>", "dist_asset", assets.serve_asset)
+    yield static_dir, app.test_client()
+    assets._set_manifest({})
+
+
+def test_superseded_file_is_served_during_grace(build):
+    static_dir, client = build
+    old = assets.build_assets(str(static_dir))["style.css"]
+    (static_dir / "style.css").write_text("body { color: blue; }", encoding="utf-8")
+    new = assets.build_assets(str(static_dir))["style.css"]
+    assert old != new
+    assert client.get(assets.ASSET_URL_PREFIX + new).status_code == 200
+    response = client.get(assets.ASSET_URL_PREFIX + old)
+    assert response.status_code == 200
+    assert b"red" in response.data
+
+
+def test_manifest_rebuilt_by_another_worker_is_reloaded(build):
+    static_dir, client = build
+    assets.build_assets(str(static_dir))
+    (static_dir / "style.css").write_text("body { color: blue; }", encoding="utf-8")
+    new = assets.build_assets(str(static_dir))["style.css"]
+    # 이 워커는 아직 이전 manifest 를 들고 있음
+    assets._set_manifest({"style.css": "style.0000000000.css"}, mtime=0)
+    assert client.get(assets.ASSET_URL_PREFIX + new).status_code == 200
+    assert assets.asset_url("style.css") == assets.ASSET_URL_PREFIX + new
+
+
+def test_unknown_file_is_not_found(build):
+    static_dir, client = build
+    assets.build_assets(str(static_dir))
+    with open(os.path.join(assets.BUILD_DIR, "secret.txt"), "w") as f:
+        f.write("x")
+    assert client.get(assets.ASSET_URL_PREFIX + "secret.txt").status_code == 404
+    assert client.get(assets.ASSET_URL_PREFIX + assets.MANIFEST_NAME).status_code == 404
@@ -0,0 +1,92 @@
+# tests/test_bulk.py
+import csv
+import io
+
+import pytest
+
+from bulk import BulkImportError, parse_row, read_rows
+from database import TABLE_FIELDS
+
+HEADER = "name,manager,start_date,end_date,total_cost,current_expenditure\n"
+
+
+def test_csv_rows_and_line_numbers():
+    data = (HEADER + "과제 A,홍길동,2025-01-01,2025-12-31,100,10\n\n"
+            + "과제 B,김철수,2025-02-01,2025-12-31,200,20\n").encode("utf-8-sig")
+    rows = list(read_rows(io.BytesIO(data), "csv"))
+    assert [number for number, _ in rows] == [2, 4]
+    assert rows[0][1]["name"] == "과제 A"
+
+
+def test_non_utf8_csv_is_an_import_error():
+    # 엑셀의 기본 "CSV" 저장 형식(CP949)
+    data = (HEADER + "Project,Kim,2025-01-01,2025-12-31,100,10\n"
+            + "과제 B,김철수,2025-02-01,2025-12-31,200,20\n").encode("cp949")
+    with pytest.raises(BulkImportError, match="line 3: not valid UTF-8"):
+        list(read_rows(io.BytesIO(data), "csv"))
+
+
+def test_non_utf8_ndjson_is_an_import_error():
+    data = '{"name": "과제"}\n'.encode("euc-kr")
+    with pytest.raises(BulkImportError, match="line 1"):
+        list(read_rows(io.BytesIO(data), "ndjson"))
+
+
+def _xlsx_bytes(rows):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def test_xlsx_rows():
+    data = _xlsx_bytes([HEADER.strip().split(","), ["과제 A", "홍길동", "2025-01-01", "2025-12-31", 100, 10]])
+    rows = list(read_rows(io.BytesIO(data), "xlsx"))
+    assert rows == [(2, dict(zip(HEADER.strip().split(","), ["과제 A", "홍길동", "2025-01-01", "2025-12-31", 100, 10])))]
+
+
+@pytest.mark.parametrize("keep", [0.3, 0.6, 0.9])
+def test_truncated_xlsx_is_an_import_error(keep):
+    data = _xlsx_bytes([HEADER.strip().split(",")] + [[f"과제 {i}", "홍길동", "2025-01-01", "2025-12-31", i, 0]
+                                                      for i in range(2000)])
+    with pytest.raises(BulkImportError):
+        list(read_rows(io.BytesIO(data[:int(len(data) * keep)]), "xlsx"))
+
+
+def test_not_an_xlsx_file():
+    pytest.importorskip("openpyxl")
+    with pytest.raises(BulkImportError, match="not a valid XLSX"):
+        list(read_rows(io.BytesIO(b"name,manager\n"), "xlsx"))
+
+
+def test_invalid_csv_is_an_import_error():
+    limit = csv.field_size_limit(50)
+    try:
+        data = (HEADER + "A,B,2025-01-01,2025-12-31,1,0\n" + "x" * 100 + ",B,2025-01-01,2025-12-31,1,0\n").encode()
+        with pytest.raises(BulkImportError, match="line 3: invalid CSV"):
+            list(read_rows(io.BytesIO(data), "csv"))
+    finally:
+        csv.field_size_limit(limit)
+
+
+def _project(**values):
+    row = {"name": "과제", "manager": "홍길동", "start_date": "2025-01-01", "end_date": "2025-12-31",
+           "total_cost": "100", "current_expenditure": "10"}
+    row.update(values)
+    return row
+
+
+@pytest.mark.parametrize("field", ["id", "total_cost", "current_expenditure", "goal_papers"])
+@pytest.mark.parametrize("value", ["inf", "-inf", "1e400", "nan", float("inf"), float("nan"), 10 ** 400])
+def test_non_finite_numbers_are_row_errors(field, value):
+    with pytest.raises(ValueError, match=field):
+        parse_row("projects", _project(**{field: value}))
+
+
+def test_finite_numbers_still_parse():
+    values = parse_row("projects", _project(id="3", total_cost="1,200.5", goal_papers=2.0))
+    row = dict(zip(TABLE_FIELDS["projects"], values))
+    assert (row["id"], row["total_cost"], row["goal_papers"]) == (3, 1200.5, 2)
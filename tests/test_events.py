@@ -0,0 +1,70 @@
+# tests/test_events.py
+import shutil
+import sqlite3
+import time
+
+import pytest
+
+import database
+import events
+import migrations
+
+# 테스트가 끝날 때 서버를 닫으면 허브 스레드의 serve_forever 가 CancelledError 로 끝남
+pytestmark = pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+
+
+@pytest.fixture
+def hub(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "projects.db")
+    shutil.copyfile(database.DB_NAME, db_path)
+    monkeypatch.setattr(database, "DB_NAME", db_path)
+    migrations.migrate(db_path)
+    monkeypatch.setattr(events, "VERSION_POLL_SECONDS", 0.3)
+    hub = events.EventHub("127.0.0.1", 0)
+    thread = hub.start_in_thread()
+    database.add_change_listener(hub.publish)
+    yield hub
+    database._change_listeners.remove(hub.publish)
+    # DB_NAME 이 원래 값으로 돌아가기 전에 허브의 주기 확인을 멈춤
+    hub.loop.call_soon_threadsafe(hub._server.close)
+    thread.join(5)
+    database.close_pool()
+
+
+def _local_write():
+    project = database.get_projects(with_version=True)[0]
+    fields = [f for f in database.PROJECT_FIELDS if f != "id"]
+    values = dict((f, project[f]) for f in fields)
+    values["total_cost"] += 1
+    database.update_project(project["id"], *(values[f] for f in fields))
+
+
+def _external_write():
+    # 다른 워커/도구의 쓰기 (이 프로세스의 알림 없이 트리거만 change_log 에 기록)
+    conn = sqlite3.connect(database.DB_NAME)
+    with conn:
+        conn.execute("UPDATE milestones SET 담당자 = 담당자 || 'x' WHERE id = (SELECT MIN(id) FROM milestones)")
+    conn.close()
+
+
+def _external_events(hub, wait=1.0):
+    time.sleep(wait)
+    return [event for event in list(hub._history) if event["table"] == "*"]
+
+
+def test_local_write_is_not_announced_again(hub):
+    _local_write()
+    assert _external_events(hub) == []
+    assert [event["table"] for event in hub._history] == ["projects"]
+
+
+def test_external_write_in_the_same_window_as_a_local_one(hub):
+    _local_write()
+    _external_write()
+    _local_write()
+    assert len(_external_events(hub)) == 1
+
+
+def test_external_write(hub):
+    _external_write()
+    assert len(_external_events(hub)) == 1
@@ -0,0 +1,18 @@
+# tests/test_fonts.py
+import os
+
+import fonts
+
+
+def test_layout_sources_exist():
+    # 없는 파일은 _layout_glyphs 가 건너뛰므로 목록이 낡아도 조용히 글자가 빠진다
+    missing = [name for name in fonts.LAYOUT_SOURCES if not os.path.exists(os.path.join(fonts.BASE_DIR, name))]
+    assert missing == []
+
+
+def test_page_titles_are_collected():
+    import dashboard
+
+    glyphs = fonts._layout_glyphs()
+    for page in dashboard.PAGES:
+        assert set(page.bottom_title) <= glyphs
@@ -0,0 +1,30 @@
+# tests/test_graphs.py
+import plotly.graph_objects as go
+import pytest
+
+from graphs import create_research_figure, research_domains
+
+
+def _project(i):
+    return {"name": f"과제 {i}", "goal_papers": 3, "current_papers": 1, "goal_patents_filed": 2,
+            "current_patents_filed": 1, "goal_patents_registered": 1, "current_patents_registered": 0,
+            "goal_software": 1, "current_software": 1}
+
+
+@pytest.mark.parametrize("num_projects", range(1, 401))
+def test_research_domains_stay_in_range(num_projects):
+    domains = research_domains(num_projects)
+    assert len(domains) == num_projects
+    assert domains[0][0] == 0 and domains[-1][1] == 1.0
+    previous_end = 0
+    for start, end in domains:
+        assert previous_end <= start < end <= 1.0
+        previous_end = end
+        go.layout.XAxis(domain=[start, end])  # Plotly 검증 (범위를 벗어나면 ValueError)
+
+
+@pytest.mark.parametrize("num_projects", [0, 1, 8, 34])
+def test_research_figure_builds(num_projects):
+    figure = create_research_figure([_project(i) for i in range(num_projects)])
+    assert len(figure.data) == 2 * num_projects
+    assert len(figure.layout.annotations) == num_projects
@@ -0,0 +1,57 @@
+# tests/test_routes.py
+import shutil
+
+import pytest
+from flask import Flask
+
+import database
+import migrations
+from routes import update_blueprint
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "projects.db")
+    shutil.copyfile(database.DB_NAME, db_path)
+    monkeypatch.setattr(database, "DB_NAME", db_path)
+    migrations.migrate(db_path)
+    app = Flask(__name__)
+    app.register_blueprint(update_blueprint)
+    yield app.test_client()
+    database.close_pool()
+
+
+def _batch_row():
+    project = database.get_projects(with_version=True)[0]
+    return {field: project[field] for field in database.PROJECT_FIELDS + ["row_version"]}
+
+
+@pytest.mark.parametrize("field, value", [
+    ("total_cost", "nan"), ("current_expenditure", "inf"), ("goal_papers", "1e400"), ("id", "1e400"),
+])
+def test_batch_update_rejects_non_finite_numbers(client, field, value):
+    row = _batch_row()
+    project_id = row["id"]
+    before = database.get_projects_by_id([project_id], with_version=True)
+    row[field] = value
+    response = client.post("/update/batch", json={"rows": [row]})
+    assert response.status_code == 400
+    assert field in response.get_json()["errors"][0]["error"]
+    assert database.get_projects_by_id([project_id], with_version=True) == before
+
+
+@pytest.mark.parametrize("literal", ["NaN", "Infinity", "1e400"])
+def test_batch_update_rejects_non_finite_json_numbers(client, literal):
+    # json.loads 는 NaN/Infinity 리터럴을 받고 1e400 은 inf 가 됨
+    row = _batch_row()
+    body = '{"rows": [{"id": %d, "row_version": %s, "total_cost": %s}]}' % (row["id"], literal, literal)
+    response = client.post("/update/batch", data=body, content_type="application/json")
+    assert response.status_code == 400
+
+
+def test_batch_update_accepts_finite_numbers(client):
+    row = _batch_row()
+    row["total_cost"] = "1,234"
+    response = client.post("/update/batch", json={"rows": [row]})
+    assert response.status_code == 200
+    assert response.get_json()["rows"][0]["total_cost"] == 1234
@@ -0,0 +1,43 @@
+# tests/test_utils.py
+import datetime
+
+import pytest
+
+from utils import calculate_progress, calculate_progress_batch, get_status_color
+
+
+def test_batch_matches_scalar_every_day():
+    # 1000일짜리 과제를 하루씩 진행: 39.9 / 40.0 / 79.9 / 80.0 같은 경계값을 모두 지나감
+    start = datetime.date(2024, 1, 1)
+    end = start + datetime.timedelta(days=1000)
+    for offset in range(-2, 1003):
+        today = start + datetime.timedelta(days=offset)
+        progress, colors = calculate_progress_batch([start.isoformat()], [end.isoformat()], today)
+        expected = calculate_progress(start.isoformat(), end.isoformat(), today)
+        assert progress == [expected]
+        assert colors == [get_status_color(expected)]
+
+
+@pytest.mark.parametrize("value, color", [
+    (0, "#FF4500"), (39.9, "#FF4500"), (40, "#FFA500"), (79.9, "#FFA500"), (80, "#32CD32"), (100, "#32CD32"),
+])
+def test_status_color_boundaries(value, color):
+    assert get_status_color(value) == color
+
+
+@pytest.mark.parametrize("start, end", [
+    ("", "2025-12-31"), ("2025-01-01", ""), (None, "2025-12-31"), ("2025-01", "2025-12-31"),
+    ("2025-01-01T09", "2025-12-31"), ("abc", "2025-12-31"),
+])
+def test_batch_rejects_dates_like_scalar(start, end):
+    with pytest.raises((ValueError, TypeError)) as scalar_error:
+        calculate_progress(start, end)
+    with pytest.raises(scalar_error.type):
+        calculate_progress_batch(["2025-01-01", start], ["2025-12-31", end])
+
+
+def test_batch_accepts_what_scalar_accepts():
+    # strptime 은 0 을 채우지 않은 월/일도 받음
+    today = datetime.date(2025, 3, 1)
+    assert calculate_progress_batch(["2025-1-5"], ["2025-12-31"], today)[0] == \
+        [calculate_progress("2025-1-5", "2025-12-31", today)]
@@ -1,10 +1,10 @@
 # utils.py
 import datetime
+import threading
 
-# 현재 날짜 가져오기
-today = datetime.date.today()
-
-def calculate_progress(start_date, end_date):
+def calculate_progress(start_date, end_date, today=None):
+    # 오늘 날짜는 호출 시점 기준 (장시간 실행되는 워커에서도 자정이 지나면 반영)
+    today = today or datetime.date.today()
     start = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
     end = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
 
@@ -17,10 +17,88 @@ def calculate_progress(start_date, end_date):
         return 100  # 완료됨
     return round((elapsed_days / total_days) * 100, 1)
 
+# 진행률 상태 색상: (이상이면 적용되는 진행률, 색상), 높은 기준부터. 어느 것에도 해당하지 않으면 STATUS_DEFAULT_COLOR
+# get_status_color 와 calculate_progress_batch 가 함께 쓰므로 기준은 여기서만 바꾼다
+STATUS_THRESHOLDS = (
+    (80, "#32CD32"),  # Green (완료)
+    (40, "#FFA500"),  # Orange (진행 중)
+)
+STATUS_DEFAULT_COLOR = "#FF4500"  # Red (지연)
+
 def get_status_color(progress):
-    if progress >= 80:
-        return "#32CD32"  # Green (완료)
-    elif progress >= 40:
-        return "#FFA500"  # Orange (진행 중)
+    for threshold, color in STATUS_THRESHOLDS:
+        if progress >= threshold:
+            return color
+    return STATUS_DEFAULT_COLOR
+
+def _parse_dates(np, values):
+    """
+    "%Y-%m-%d" 문자열 목록 -> datetime64[D] 배열.
+    numpy 는 빈 값을 NaT 로, "2024-01" 같은 다른 형식도 날짜로 받아들이므로 결과가 입력과 정확히 같지 않으면
+    calculate_progress 와 같은 strptime 으로 다시 파싱한다 (같은 값 또는 같은 오류).
+    """
+    values = list(values)
+    try:
+        dates = np.array(values, dtype="datetime64[D]")
+        if dates.astype(str).tolist() == values:
+            return dates
+    except (ValueError, TypeError):
+        pass
+    return np.array([datetime.datetime.strptime(v, "%Y-%m-%d").date() for v in values], dtype="datetime64[D]")
+
+def calculate_progress_batch(start_dates, end_dates, today=None):
+    """
+    calculate_progress / get_status_color 의 배열 버전.
+    날짜 파싱과 일수 계산을 numpy 로 한 번에 처리하고 (진행률 리스트, 상태 색상 리스트)를 반환.
+    진행률 값과 반올림 결과는 calculate_progress 와 동일하고, 잘못된 날짜면 같은 오류(ValueError/TypeError).
+    """
+    import numpy as np  # 첫 호출 시에만 로드
+
+    today = np.datetime64(today or datetime.date.today(), "D")
+    starts = _parse_dates(np, start_dates)
+    ends = _parse_dates(np, end_dates)
+
+    total_days = (ends - starts).astype(np.int64)
+    elapsed_days = (today - starts).astype(np.int64)
+
+    not_started = elapsed_days <= 0
+    finished = ~not_started & (elapsed_days >= total_days)
+    in_progress = ~(not_started | finished)
+    ratio = np.divide(elapsed_days, total_days, out=np.zeros(len(starts)), where=in_progress) * 100
+
+    # 반올림만 파이썬 round 사용 (numpy 반올림은 경계값에서 결과가 다를 수 있음)
+    progress = [
+        round(r, 1) if p else (0 if n else 100)
+        for r, p, n in zip(ratio.tolist(), in_progress.tolist(), not_started.tolist())
+    ]
+    values = np.array(progress, dtype=float)
+    colors = np.select([values >= threshold for threshold, _ in STATUS_THRESHOLDS],
+                       [color for _, color in STATUS_THRESHOLDS], default=STATUS_DEFAULT_COLOR).tolist()
+    return progress, colors
+
+# (데이터 버전, 날짜) -> (프로젝트 id 목록, 진행률, 색상)
+_progress_cache = {}
+_progress_lock = threading.Lock()
+
+def apply_progress(projects, version=None):
+    """
+    projects 의 각 항목에 "progress" 를 채운다.
+    version(데이터 버전)을 주면 같은 버전·같은 날짜에 대해서는 계산 결과를 재사용한다.
+    """
+    today = datetime.date.today()
+    ids = tuple(p["id"] for p in projects)
+    key = (version, today)
+    cached = _progress_cache.get(key) if version is not None else None
+    if cached is not None and cached[0] == ids:
+        progress = cached[1]
     else:
-        return "#FF4500"  # Red (지연)
\ No newline at end of file
+        progress, colors = calculate_progress_batch(
+            [p["start_date"] for p in projects], [p["end_date"] for p in projects], today)
+        if version is not None:
+            with _progress_lock:
+                # 이전 버전/날짜의 결과는 더 이상 쓰이지 않으므로 비움
+                _progress_cache.clear()
+                _progress_cache[key] = (ids, progress, colors)
+    for project, value in zip(projects, progress):
+        project["progress"] = value
+    return projects